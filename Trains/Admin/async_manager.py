@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import time
+from typing import Any, Callable, List
+
+sys.path.append('../../')
+from Trains.Player.player import PlayerInterface
+from Trains.Admin.manager import Manager
+from Trains.Admin.async_referee import AsyncReferee
+from Trains.Admin.coroutines import await_player_method
+from Trains.Other.Types.trains_types import GameAssignment, TournmentResult
+
+
+class AsyncManager(Manager):
+    """
+    A tournament Manager whose player calls are awaited. Every game of a tournament round is
+    played concurrently on the running event loop by an AsyncReferee, so a slow player only holds
+    up their own game. The tournament is the Manager's (see Manager.run_tournament_async); only
+    calling players and playing rounds differ. Await run_tournament_async instead of calling
+    run_tournament.
+    """
+
+    def run_tournament(self) -> TournmentResult:
+        """
+        An AsyncManager's players are awaited, so its tournament cannot be run without an event loop.
+            Throws:
+                RuntimeError always: await run_tournament_async instead
+        """
+        raise RuntimeError("An AsyncManager's tournament must be awaited (see run_tournament_async).")
+
+    async def run_tournament_round_async(self, game_assignments: List[GameAssignment]) -> None:
+        """
+        Plays the games of a round concurrently and applies their results in the order of the
+        game assignments.
+            Parameters:
+                game_assigments (list(list(Player))): list of a lists of players where each inner
+                                              list represents the 2-8 players in a game of trains
+        """
+        referees = []
+        for game_index, assignment in enumerate(game_assignments):
+            referees.append(AsyncReferee(self.tournament_map, assignment, self.deck, rng=self.get_game_rng(game_index),
+                                         metrics=self.metrics))
+        game_results = await asyncio.gather(*[referee.play_game_async() for referee in referees])
+        self.apply_round_results(game_results)
+
+    async def call_players_method_async(self, players: List[PlayerInterface], method_name: str, *args) -> List[Any]:
+        """
+        Calls the method of the given name of every player concurrently.
+            Returns:
+                The result of each player's method, in the order of the players
+        """
+        return list(await asyncio.gather(*[self.call_player_method_async(player, getattr(player, method_name), *args)
+                                           for player in players]))
+
+    async def call_player_method_async(self, player: PlayerInterface, player_method: Callable, *args) -> Any:
+        """
+        Awaits a player method (see await_player_method). Players that raise an error or do not respond
+        in time are booted.
+            Parameters:
+                player (PlayerInterface): The player executing the method
+                player_method (Callable): The player method to execute
+                *args: The arguments for the given method
+            Returns:
+                The result of the given player method
+        """
+        try:
+            if self.metrics is None:
+                return await await_player_method(player, player_method, *args)
+            call_start = time.perf_counter()
+            try:
+                return await await_player_method(player, player_method, *args)
+            finally:
+                self.record_player_call_time(player, player_method.__name__, call_start)
+        except Exception as e:
+            self.boot_player_for_logic_error(player, e)
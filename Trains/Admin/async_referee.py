@@ -0,0 +1,54 @@
+import sys
+import time
+from typing import Any, Callable
+
+sys.path.append('../../')
+from Trains.Admin.coroutines import await_player_method
+from Trains.Admin.referee import Referee
+from Trains.Other.Types.trains_types import GameResult
+
+
+class AsyncReferee(Referee):
+    """
+    A Referee whose player calls are awaited, so that many games can be played concurrently on
+    one event loop and a slow player only holds up their own game. The game is the Referee's
+    (see Referee.play_game_async); only calling players differs. Await play_game_async instead of
+    calling play_game.
+    """
+
+    def play_game(self) -> GameResult:
+        """
+        An AsyncReferee's players are awaited, so its game cannot be played without an event loop.
+            Throws:
+                RuntimeError always: await play_game_async instead
+        """
+        raise RuntimeError("An AsyncReferee's game must be awaited (see play_game_async).")
+
+    async def call_player_method_async(self, player_index: int, player_method: Callable, *args) -> Any:
+        """
+        Awaits a player method (see await_player_method). Players that raise an error or do not respond
+        in time (see RemotePlayerProxy.TIMEOUT) are booted.
+            Parameters:
+                player_index (int): The index of the player executing the method
+                player_method (Callable): The player method to execute
+                *args: The arguments for the given method
+            Returns:
+                The result of the given player method
+        """
+        try:
+            if self.metrics is None:
+                return await await_player_method(self.players[player_index], player_method, *args)
+            return await self.call_timed_player_method_async(player_index, player_method, *args)
+        except Exception:
+            self.boot_player_for_logic_error(player_index)
+
+    async def call_timed_player_method_async(self, player_index: int, player_method: Callable, *args) -> Any:
+        """
+        Coroutine version of Referee.call_timed_player_method. The recorded latency includes time spent
+        waiting for the event loop while other games run.
+        """
+        call_start = time.perf_counter()
+        try:
+            return await await_player_method(self.players[player_index], player_method, *args)
+        finally:
+            self.record_player_call_time(player_index, player_method.__name__, call_start)
@@ -0,0 +1,47 @@
+import sys
+from typing import Any, Callable, Coroutine
+
+sys.path.append('../../')
+from Trains.Player.player import PlayerInterface
+
+ASYNC_METHOD_SUFFIX = "_async"
+
+
+def run_without_event_loop(coroutine: Coroutine) -> Any:
+    """
+    Runs a coroutine that never waits on the event loop to completion in the calling thread, and returns
+    its result. The Referee and Manager implement games and tournaments once, as coroutines; their
+    synchronous methods run those coroutines with this when every player call is synchronous. No event
+    loop is started, so players that block on their own event loop (e.g. RemotePlayerProxy) still can.
+        Parameters:
+            coroutine (Coroutine): The coroutine to run
+        Returns:
+            The result of the coroutine
+        Throws:
+            RuntimeError if the coroutine waits on the event loop (it must be awaited on one instead)
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coroutine.close()
+    raise RuntimeError("A coroutine run without an event loop waited on the event loop.")
+
+
+async def await_player_method(player: PlayerInterface, player_method: Callable, *args) -> Any:
+    """
+    Calls a player method without blocking the event loop. Players that talk over the network
+    (e.g. RemotePlayerProxy) provide a coroutine version of each method named <method>_async, which
+    is awaited. Other (in-process) players have their method called directly.
+        Parameters:
+            player (PlayerInterface): The player executing the method
+            player_method (Callable): The player method to execute
+            *args: The arguments for the given method
+        Returns:
+            The result of the given player method
+    """
+    async_method = getattr(player, player_method.__name__ + ASYNC_METHOD_SUFFIX, None)
+    if async_method is not None:
+        return await async_method(*args)
+    method = getattr(player, player_method.__name__)
+    return method(*args)
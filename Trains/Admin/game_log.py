@@ -0,0 +1,135 @@
+import json
+import sys
+from typing import Dict, Iterable, Iterator, List, TextIO
+
+sys.path.append('../../')
+from Trains.Common.cards import Deck, Hand
+from Trains.Common.map import Color, Connection, Destination, Map
+
+# Bytes buffered before a game log file is written to.
+GAME_LOG_BUFFER_SIZE = 1 << 16
+
+# Event types, the value of the "type" key of each event:
+#   {"type": "setup", "map": Map, "players": [name, ...], "rails": int, "hands": [Card*, ...], "deck": Card+}
+#       The map, the players in turn order, and their rails and hands once every player is set up. The deck is
+#       what is left of it after dealing the hands, from the bottom card to the top card.
+#   {"type": "pick", "player": index, "destinations": [[name, name], ...]}
+#       The destinations a player chose (by city names).
+#   {"type": "draw", "player": index, "cards": [color, ...]}
+#       The cards a player drew, in the order they were drawn.
+#   {"type": "acquire", "player": index, "connection": index}
+#       A connection a player acquired, by its index in Map.get_sorted_connections().
+#   {"type": "boot", "player": index, "reason": str}
+#       A player was booted (possibly before the setup event, if their setup failed).
+#   {"type": "scores", "scores": [int, ...]}
+#       The final score of each player in turn order (see Referee.score_game).
+SETUP_EVENT = "setup"
+PICK_EVENT = "pick"
+DRAW_EVENT = "draw"
+ACQUIRE_EVENT = "acquire"
+BOOT_EVENT = "boot"
+SCORES_EVENT = "scores"
+
+
+class GameEventLog:
+    """
+    An append-only log of the events of games of Trains, written as JSON lines. A referee given a log
+    records its game's setup, picks, moves, boots and scores as they happen, so the game can be replayed
+    without its players (see Trains/Admin/game_replayer.py). Several games can be written to one log:
+    each game starts with its setup event.
+
+    Events are written to a buffered stream, so recording a game does not make a system call per event.
+    Connections are recorded by their index in the map's sorted connections to keep events small.
+    """
+
+    def __init__(self, output: TextIO):
+        """
+        Constructor for a GameEventLog.
+            Parameters:
+                output (TextIO): The stream to write events to, e.g. a file opened with open_game_log
+        """
+        self.output = output
+        self.connection_indices: Dict[Connection, int] = {}
+
+    def __enter__(self) -> "GameEventLog":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+    def write_event(self, event: dict) -> None:
+        """
+        Appends an event to the log as a line of compact JSON.
+        """
+        self.output.write(json.dumps(event, separators=(",", ":")))
+        self.output.write("\n")
+
+    def log_setup(self, game_map: Map, player_names: List[str], rails: int, hands: List[Hand], deck: Deck) -> None:
+        """
+        Records the start of a game (see SETUP_EVENT), and indexes the connections of its map.
+        """
+        self.connection_indices = \
+            {connection: index for index, connection in enumerate(game_map.get_sorted_connections())}
+        self.write_event({"type": SETUP_EVENT, "map": game_map.get_as_json(), "players": player_names,
+                          "rails": rails, "hands": [hand.get_as_json() for hand in hands], "deck": deck.get_as_json()})
+
+    def log_pick(self, player_index: int, destinations: Iterable[Destination]) -> None:
+        """
+        Records the destinations a player chose.
+        """
+        self.write_event({"type": PICK_EVENT, "player": player_index,
+                          "destinations": sorted(list(destination.sort_key) for destination in destinations)})
+
+    def log_draw(self, player_index: int, cards: List[Color]) -> None:
+        """
+        Records the cards a player drew.
+        """
+        self.write_event({"type": DRAW_EVENT, "player": player_index, "cards": [str(card) for card in cards]})
+
+    def log_acquire(self, player_index: int, connection: Connection) -> None:
+        """
+        Records a connection a player acquired.
+        """
+        self.write_event({"type": ACQUIRE_EVENT, "player": player_index,
+                          "connection": self.connection_indices[connection]})
+
+    def log_boot(self, player_index: int, reason: str) -> None:
+        """
+        Records that a player was booted.
+        """
+        self.write_event({"type": BOOT_EVENT, "player": player_index, "reason": reason})
+
+    def log_scores(self, scores: List[int]) -> None:
+        """
+        Records the final scores of a game.
+        """
+        self.write_event({"type": SCORES_EVENT, "scores": scores})
+
+    def flush(self) -> None:
+        self.output.flush()
+
+    def close(self) -> None:
+        """
+        Writes any buffered events and closes the log's stream.
+        """
+        self.output.close()
+
+
+def open_game_log(path: str, append: bool = False) -> GameEventLog:
+    """
+    Opens a game log file for writing with a large write buffer.
+        Parameters:
+            path (str): The path of the log file
+            append (bool): Whether to add games to the end of an existing log instead of replacing it
+    """
+    return GameEventLog(open(path, "a" if append else "w", buffering=GAME_LOG_BUFFER_SIZE))
+
+
+def read_game_log(path: str) -> Iterator[dict]:
+    """
+    Reads the events of a game log file, in order.
+    """
+    with open(path) as log_file:
+        for line in log_file:
+            if line.strip() != "":
+                yield json.loads(line)
@@ -0,0 +1,57 @@
+import random
+import sys
+from typing import Union
+
+sys.path.append('../../')
+
+# Where a referee, manager or server gets its randomness from:
+#   None: the random module's shared, unseeded generator (games are not reproducible)
+#   int: a seed, so identical seeds give identical games
+#   random.Random: a generator owned by the caller
+RandomSource = Union[None, int, random.Random]
+
+
+def create_rng(random_source: RandomSource) -> random.Random:
+    """
+    Returns the generator to draw random numbers from for a RandomSource.
+        Parameters:
+            random_source (RandomSource): None, a seed, or a generator
+        Returns:
+            The given generator, a new generator seeded with the given seed, or the random module
+            itself (whose functions share one generator) if random_source is None
+    """
+    if random_source is None:
+        return random
+    if isinstance(random_source, random.Random):
+        return random_source
+    return random.Random(random_source)
+
+
+def get_seed(random_source: RandomSource) -> Union[int, None]:
+    """
+    Returns the seed to derive independent streams from for a RandomSource. A seed is drawn from a
+    given generator, so a seeded generator still gives reproducible streams.
+        Parameters:
+            random_source (RandomSource): None, a seed, or a generator
+        Returns:
+            The seed, or None if random_source is None
+    """
+    if random_source is None or isinstance(random_source, int):
+        return random_source
+    return random_source.getrandbits(64)
+
+
+def get_stream_seed(seed: int, *stream_indices: int) -> str:
+    """
+    Returns the seed of an independent stream derived from a seed, e.g. the stream of game 3 of round 2
+    of a tournament is get_stream_seed(seed, 2, 3). String seeds are hashed with SHA-512 by
+    random.Random, so streams do not overlap and are the same on every platform and run.
+    """
+    return ":".join(str(part) for part in (seed,) + stream_indices)
+
+
+def derive_rng(seed: int, *stream_indices: int) -> random.Random:
+    """
+    Returns a generator for an independent stream derived from a seed (see get_stream_seed).
+    """
+    return random.Random(get_stream_seed(seed, *stream_indices))
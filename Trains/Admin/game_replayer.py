@@ -0,0 +1,184 @@
+import argparse
+import json
+import sys
+from typing import Iterable, Iterator, List
+
+sys.path.append('../../')
+from Trains.Admin.game_log import ACQUIRE_EVENT, BOOT_EVENT, DRAW_EVENT, PICK_EVENT, SCORES_EVENT, SETUP_EVENT, \
+    read_game_log
+from Trains.Admin.referee import Referee
+from Trains.Admin.referee_game_state import RefereeGameState
+from Trains.Common.map import Destination
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Other.Util.json_utils import convert_from_json_to_card_plus, convert_from_json_to_card_star, \
+    convert_from_json_to_deck, convert_json_map_to_data_map
+
+
+class ReplayMismatch(Exception):
+    """
+    Raised when replaying a game log does not reproduce the logged game, e.g. the deck gives different
+    cards than were logged, or a logged acquisition is not legal.
+    """
+    pass
+
+
+class GameReplayer(Referee):
+    """
+    Re-executes a game recorded in a game log (see Trains/Admin/game_log.py) against a RefereeGameState,
+    without any players: cards are drawn from the logged deck, connections are verified and acquired,
+    booted players' connections are released, and the game is scored with the Referee's scoring. The
+    replayed scores are checked against the logged scores.
+
+    Replaying reproduces slow games offline, profiles scoring on recorded games, and regression-tests
+    changes to the game state and scoring against recorded games.
+
+    A replayer does not play a game, so it is not constructed like a Referee: its players are the logged
+    names of the players, and its game state is created by the setup event.
+    """
+
+    def __init__(self):
+        """
+        Constructor for a GameReplayer with no game set up.
+        """
+        self.players: List[str] = []
+        self.banned_player_indices = set()
+        self.took_last_turn = set()
+        self.game_map = None
+        self.feasible_destinations = None
+        self.event_log = None
+        self.ref_game_state = None
+        self.scores: List[int] = []
+        # The map's connections by their logged index, and its cities by name. Set by the setup event.
+        self.sorted_connections = ()
+        self.cities_by_name = {}
+
+    def replay(self, events: Iterable[dict]) -> List[int]:
+        """
+        Replays the events of one game.
+            Parameters:
+                events (iterable(dict)): The game's events, starting with its setup event (or with the boot
+                    events of players whose setup failed)
+            Returns:
+                (list(int)) The replayed scores of the players in turn order
+            Throws:
+                ReplayMismatch if the events do not replay to the logged game
+        """
+        for event in events:
+            self.replay_event(event)
+        return self.scores
+
+    def replay_event(self, event: dict) -> None:
+        """
+        Replays one event of a game (see the event types in game_log).
+            Throws:
+                ReplayMismatch if the event cannot be replayed
+        """
+        event_type = event["type"]
+        if event_type == SETUP_EVENT:
+            self.replay_setup(event)
+        elif event_type == BOOT_EVENT:
+            self.banned_player_indices.add(event["player"])
+            if self.ref_game_state is not None:
+                self.ref_game_state.clear_player_connections(event["player"])
+        elif self.ref_game_state is None:
+            raise ReplayMismatch(f"A {event_type} event came before the game was set up")
+        elif event_type == PICK_EVENT:
+            self.replay_pick(event)
+        elif event_type == DRAW_EVENT:
+            self.replay_draw(event)
+        elif event_type == ACQUIRE_EVENT:
+            self.replay_acquire(event)
+        elif event_type == SCORES_EVENT:
+            self.replay_scores(event)
+        else:
+            raise ReplayMismatch(f"Unknown event type {event_type}")
+
+    def replay_setup(self, event: dict) -> None:
+        """
+        Creates the game state of the logged map, players, hands and deck.
+        """
+        self.game_map = convert_json_map_to_data_map(event["map"])
+        self.sorted_connections = self.game_map.get_sorted_connections()
+        self.cities_by_name = {city.name: city for city in self.game_map.cities}
+        self.players = event["players"]
+        player_game_states = [PlayerGameState(set(), convert_from_json_to_card_star(hand), event["rails"], set(),
+                                              dict(), list()) for hand in event["hands"]]
+        self.ref_game_state = RefereeGameState(self.game_map, convert_from_json_to_deck(event["deck"]),
+                                               player_game_states)
+
+    def replay_pick(self, event: dict) -> None:
+        """
+        Gives a player the destinations they chose.
+        """
+        destinations = {Destination({self.cities_by_name[name] for name in names})
+                        for names in event["destinations"]}
+        self.ref_game_state.give_player_destinations(event["player"], destinations)
+
+    def replay_draw(self, event: dict) -> None:
+        """
+        Draws cards from the deck for a player, checking they are the logged cards.
+        """
+        self.ref_game_state.turn = event["player"]
+        logged_cards = convert_from_json_to_card_plus(event["cards"])
+        cards = self.ref_game_state.get_cards_from_deck(len(logged_cards))
+        if cards != logged_cards:
+            raise ReplayMismatch(f"Drew {cards} instead of the logged {logged_cards}")
+        self.ref_game_state.give_cards_to_active_player(cards)
+
+    def replay_acquire(self, event: dict) -> None:
+        """
+        Verifies and acquires a connection for a player.
+        """
+        self.ref_game_state.turn = event["player"]
+        connection = self.sorted_connections[event["connection"]]
+        if not self.ref_game_state.verify_legal_connection(connection):
+            raise ReplayMismatch(f"Player {event['player']} cannot acquire {connection.get_as_acquired_json()}")
+        self.ref_game_state.add_connection_to_active_player(connection)
+
+    def replay_scores(self, event: dict) -> None:
+        """
+        Scores the game, checking the scores are the logged scores.
+        """
+        self.scores = self.score_game()
+        if self.scores != event["scores"]:
+            raise ReplayMismatch(f"Scored {self.scores} instead of the logged {event['scores']}")
+
+
+def split_games(events: Iterable[dict]) -> Iterator[List[dict]]:
+    """
+    Splits the events of a game log into the events of each game. A game's events start after the previous
+    game's scores event.
+    """
+    game_events = []
+    for event in events:
+        game_events.append(event)
+        if event["type"] == SCORES_EVENT:
+            yield game_events
+            game_events = []
+    if len(game_events) > 0:
+        yield game_events
+
+
+def replay_game_log(path: str) -> List[List[int]]:
+    """
+    Replays every game of a game log file.
+        Returns:
+            (list(list(int))) The replayed scores of each game
+        Throws:
+            ReplayMismatch if a game does not replay to the logged game
+    """
+    return [GameReplayer().replay(game_events) for game_events in split_games(read_game_log(path))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays the games of a game log and writes their scores as JSON.")
+    parser.add_argument("log", help="path of a game log file")
+    arguments = parser.parse_args()
+    try:
+        sys.stdout.write(json.dumps(replay_game_log(arguments.log)))
+    except ReplayMismatch as e:
+        sys.stdout.write(json.dumps(f"error: {e}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+from bisect import bisect_left
+import json
+import sys
+from typing import Dict, List
+
+sys.path.append('../../')
+
+# Metric names. Player call latencies are labeled by player name, referee metrics are not labeled.
+# The latency of each call to a player method, e.g. "player.play" (see get_player_method_metric)
+PLAYER_METHOD_METRIC_PREFIX = "player."
+# Building the game state given to the active player on their turn
+STATE_BUILD_METRIC = "referee.state_build"
+# Verifying a player's move
+VALIDATION_METRIC = "referee.validation"
+# Applying a player's move to the referee game state
+MUTATION_METRIC = "referee.mutation"
+# The time a referee spends on a turn outside of player calls
+TURN_OVERHEAD_METRIC = "referee.turn_overhead"
+# Scoring a game
+SCORING_METRIC = "referee.scoring"
+
+# Upper bounds in seconds of the buckets of a LatencyHistogram: powers of 2 from 1 microsecond to about
+# 2 minutes. Latencies above the last bound are counted in an overflow bucket.
+LATENCY_BUCKET_BOUNDS: List[float] = [0.000001 * 2 ** exponent for exponent in range(28)]
+
+
+def get_player_method_metric(method_name: str) -> str:
+    """
+    Returns the name of the metric of calls to a player method, e.g. "player.play" for play.
+    """
+    return PLAYER_METHOD_METRIC_PREFIX + method_name
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies with logarithmic buckets (see LATENCY_BUCKET_BOUNDS), so recording a latency
+    takes constant memory. Also keeps the count, total, minimum and maximum of the latencies recorded.
+    Percentiles are estimated by the upper bound of the bucket they fall in.
+    """
+    __slots__ = ("bucket_counts", "count", "total", "minimum", "maximum")
+
+    def __init__(self):
+        self.bucket_counts: List[int] = [0] * (len(LATENCY_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Records a latency in seconds.
+        """
+        self.bucket_counts[bisect_left(LATENCY_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.minimum:
+            self.minimum = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Adds the latencies recorded by another histogram to this one.
+        """
+        for bucket_index, bucket_count in enumerate(other.bucket_counts):
+            self.bucket_counts[bucket_index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def get_mean(self) -> float:
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def get_percentile(self, percentile: float) -> float:
+        """
+        Estimates a percentile of the latencies recorded.
+            Parameters:
+                percentile (float): The percentile, in [0, 100]
+            Returns:
+                The upper bound of the bucket the percentile falls in (at most the maximum latency),
+                or 0 if no latencies were recorded
+        """
+        if self.count == 0:
+            return 0.0
+        rank = percentile / 100 * self.count
+        seen = 0
+        for bucket_index, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count > 0:
+                if bucket_index == len(LATENCY_BUCKET_BOUNDS):
+                    return self.maximum
+                return min(LATENCY_BUCKET_BOUNDS[bucket_index], self.maximum)
+        return self.maximum
+
+    def get_as_json(self) -> dict:
+        """
+        Returns the histogram as a JSON object: its summary statistics (in seconds) and the count of each
+        non-empty bucket, keyed by the bucket's upper bound ("inf" for the overflow bucket).
+        """
+        bounds = [str(bound) for bound in LATENCY_BUCKET_BOUNDS] + ["inf"]
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.get_mean(),
+            "min": self.minimum if self.count > 0 else 0.0,
+            "max": self.maximum,
+            "p50": self.get_percentile(50),
+            "p90": self.get_percentile(90),
+            "p99": self.get_percentile(99),
+            "buckets": {bound: count for bound, count in zip(bounds, self.bucket_counts) if count > 0}
+        }
+
+
+class MetricsRegistry:
+    """
+    An in-process registry of latency histograms, keyed by metric name and label (e.g. the latency of
+    "player.play" for the player "Alice"). Referees and managers given a registry record the latency of
+    every player call and the time spent on referee bookkeeping and scoring in it; ones that are not
+    given one only check that they have none, so instrumentation costs next to nothing when disabled.
+
+    Share one registry between a manager and its referees to see whether slow games come from players
+    or from the referee.
+    """
+
+    def __init__(self):
+        """
+        Constructor for an empty MetricsRegistry.
+        """
+        self.histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def get_histogram(self, metric: str, label: str = "") -> LatencyHistogram:
+        """
+        Returns the histogram of a metric and label, creating it if it does not exist.
+        """
+        labeled_histograms = self.histograms.setdefault(metric, {})
+        histogram = labeled_histograms.get(label)
+        if histogram is None:
+            histogram = labeled_histograms[label] = LatencyHistogram()
+        return histogram
+
+    def record(self, metric: str, seconds: float, label: str = "") -> None:
+        """
+        Records a latency in seconds for a metric and label.
+        """
+        self.get_histogram(metric, label).record(seconds)
+
+    def get_combined_histogram(self, metric: str) -> LatencyHistogram:
+        """
+        Returns a histogram of every latency recorded for a metric, whatever its label (e.g. the latency of
+        "player.play" for every player).
+        """
+        combined_histogram = LatencyHistogram()
+        for histogram in self.histograms.get(metric, {}).values():
+            combined_histogram.merge(histogram)
+        return combined_histogram
+
+    def get_as_json(self) -> dict:
+        """
+        Returns every histogram as a JSON object: {metric: {label: histogram JSON}} (see LatencyHistogram.get_as_json).
+        """
+        return {metric: {label: histogram.get_as_json() for label, histogram in labeled_histograms.items()}
+                for metric, labeled_histograms in self.histograms.items()}
+
+    def dump(self, path: str) -> None:
+        """
+        Writes every histogram to a JSON file (see get_as_json).
+        """
+        with open(path, "w") as metrics_file:
+            json.dump(self.get_as_json(), metrics_file, indent=2)
+
+    def reset(self) -> None:
+        """
+        Removes every histogram.
+        """
+        self.histograms = {}
+
+
+# A registry to share across a process, e.g. between a server's manager and referees.
+metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Returns the process's shared MetricsRegistry.
+    """
+    return metrics_registry
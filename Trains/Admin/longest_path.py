@@ -0,0 +1,131 @@
+import sys
+from typing import Dict, List, Set
+
+sys.path.append('../../')
+from Trains.Common.map import City, Connection
+
+# A weighted adjacency map with parallel connections collapsed: city -> {neighbor: max connection length}
+WeightedAdjacency = Dict[City, Dict[City, int]]
+
+
+def find_longest_path_length(connections: Set[Connection]) -> int:
+    """
+    Finds the length (sum of connection lengths) of the longest continuous path that can be made
+    with the given connections. A continuous path may not visit the same city twice, and when two
+    cities are joined by more than one connection only the longest of them can contribute.
+
+    Each connected component is searched independently with a depth first search that abandons
+    any partial path that cannot beat the best path found so far.
+        Parameters:
+            connections (set(Connection)): The connections a player owns
+        Returns:
+            (int) Length of the longest continuous path, 0 if there are no connections
+    """
+    adjacency = build_weighted_adjacency(connections)
+    longest = 0
+    for component in get_connected_components(adjacency):
+        if get_component_weight(adjacency, component) <= longest:
+            continue
+        longest = search_component(adjacency, component, longest)
+    return longest
+
+
+def build_weighted_adjacency(connections: Set[Connection]) -> WeightedAdjacency:
+    """
+    Builds an adjacency map from the given connections, collapsing parallel connections between
+    the same two cities into a single edge weighted by the longest of them.
+        Parameters:
+            connections (set(Connection)): The connections to build the adjacency map from
+        Returns:
+            (dict) Mapping of each city to a dictionary of its neighbors and the edge weight to them
+    """
+    adjacency = {}
+    for connection in connections:
+        city1, city2 = connection.cities
+        weight = max(connection.length, adjacency.get(city1, {}).get(city2, 0))
+        adjacency.setdefault(city1, {})[city2] = weight
+        adjacency.setdefault(city2, {})[city1] = weight
+    return adjacency
+
+
+def get_connected_components(adjacency: WeightedAdjacency) -> List[Set[City]]:
+    """
+    Splits the cities of an adjacency map into their connected components.
+        Parameters:
+            adjacency (dict): Weighted adjacency map (see build_weighted_adjacency)
+        Returns:
+            (list(set(City))) The connected components of the adjacency map
+    """
+    components = []
+    seen = set()
+    for start in adjacency:
+        if start in seen:
+            continue
+        component = {start}
+        stack = [start]
+        while stack:
+            city = stack.pop()
+            for neighbor in adjacency[city]:
+                if neighbor not in component:
+                    component.add(neighbor)
+                    stack.append(neighbor)
+        seen |= component
+        components.append(component)
+    return components
+
+
+def get_component_weight(adjacency: WeightedAdjacency, component: Set[City]) -> int:
+    """
+    Gets the total weight of all (collapsed) edges in a connected component. No path in the
+    component can be longer than this.
+        Parameters:
+            adjacency (dict): Weighted adjacency map (see build_weighted_adjacency)
+            component (set(City)): A connected component of the adjacency map
+        Returns:
+            (int) The sum of the component's edge weights
+    """
+    return sum(sum(adjacency[city].values()) for city in component) // 2
+
+
+def search_component(adjacency: WeightedAdjacency, component: Set[City], best: int) -> int:
+    """
+    Searches a connected component for a path longer than the given best path length.
+
+    Every step of a path enters one new city through one of that city's edges, so a partial path
+    can grow by at most the sum of the heaviest edge of every city it has not yet visited. Partial
+    paths whose length plus this bound does not exceed the best length found are pruned.
+        Parameters:
+            adjacency (dict): Weighted adjacency map (see build_weighted_adjacency)
+            component (set(City)): A connected component of the adjacency map
+            best (int): Length of the longest path found so far (in any component)
+        Returns:
+            (int) The larger of best and the longest path in the component
+    """
+    heaviest_edge = {city: max(adjacency[city].values()) for city in component}
+    component_weight = get_component_weight(adjacency, component)
+    # Explore the heaviest edges first so long paths are found early and prune more
+    ordered_neighbors = {city: sorted(adjacency[city].items(), key=lambda item: item[1], reverse=True)
+                         for city in component}
+    visited = set()
+    longest = best
+
+    def extend(city: City, length: int, remaining_bound: int) -> None:
+        nonlocal longest
+        if length > longest:
+            longest = length
+        if length + remaining_bound <= longest or longest == component_weight:
+            return
+        for neighbor, weight in ordered_neighbors[city]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                extend(neighbor, length + weight, remaining_bound - heaviest_edge[neighbor])
+                visited.remove(neighbor)
+
+    total_bound = sum(heaviest_edge.values())
+    for start in component:
+        if longest == component_weight:
+            break
+        visited.add(start)
+        extend(start, 0, total_bound - heaviest_edge[start])
+        visited.remove(start)
+    return longest
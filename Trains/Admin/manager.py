@@ -1,13 +1,20 @@
 import asyncio
 from copy import copy
-from typing import Any, Callable, Deque, List
+import random
+import time
+from typing import Any, Callable, Deque, List, Optional, Union
 import sys, json, os
 
 sys.path.append('../../')
-from Trains.Other.Types.trains_types import GameAssignment, GameRankings, TournmentResult
+from Trains.Other.Types.trains_types import GameAssignment, GameRankings, GameResult, TournmentResult
+from Trains.Common.cards import Deck
 from Trains.Common.map import Color, Map
 from Trains.Other.Util.json_utils import convert_json_map_to_data_map
 from Trains.Admin.referee import Referee, NotEnoughDestinations
+from Trains.Admin.coroutines import run_without_event_loop
+from Trains.Admin.parallel_round import ParallelRoundExecutor
+from Trains.Admin.game_random import RandomSource, derive_rng, get_seed
+from Trains.Admin.instrumentation import MetricsRegistry, get_player_method_metric
 from Trains.Player.player import PlayerInterface
 
 class Manager:
@@ -15,17 +22,37 @@ class Manager:
     Represents a tournament manager that sets up and runs a tournament for games of Trains.
     The active players list will represent the tournament winners at the end of the 
     tournament, since it is a knock-out elimination system.
+    The tournament is implemented once, as coroutines (run_tournament_async and the steps it awaits). The
+    synchronous methods run them without an event loop, calling players synchronously (see
+    call_player_method_async); an AsyncManager awaits its players and plays the games of a round concurrently.
     """
 
     MAXPLAYERS_IN_A_GAME = 8
 
-    def __init__(self, players: List[PlayerInterface], deck: Deque[Color] = None):
+    def __init__(self, players: List[PlayerInterface], deck: Union[Deck, Deque[Color]] = None,
+        round_executor: ParallelRoundExecutor = None, rng: RandomSource = None, metrics: MetricsRegistry = None,
+        metrics_path: str = None):
         """
         Constructor for the tournament manager that sets up a tournament with the given players.
         Players are notified of the start of the tournament upon Manager initialization.
         An initialized Manager can simply call 'run_tournament' to run a tournament.
             Parameters:
                 players (list): List of players to setup for a tournament
+                deck (Deck or deque): Deck every game is played with (each referee draws from its own copy), or None if
+                              each referee should create its own deck
+                round_executor (ParallelRoundExecutor): Optional executor that plays the games of a round
+                              in parallel. Only usable with in-process players. Games are played one after
+                              another when not given. Its worker processes are reused by every round and
+                              shut down at the end of run_tournament.
+                rng (RandomSource): Seed or random.Random the games are seeded from. Each game gets its own
+                              stream, derived from the seed, the round and its place in the round, so
+                              identical seeds give identical tournaments however the games are played.
+                              Defaults to the random module's shared generator.
+                metrics (MetricsRegistry): Registry to record the latency of the manager's player calls in, also
+                              given to every referee (see Referee), or None to not measure them. Games played
+                              by a round executor run in worker processes and are not measured.
+                metrics_path (str): Path of a JSON file to write the metrics to at the end of the tournament,
+                              or None to not write them
             Raises:
                 ValueError:
                 - The given players is not a list
@@ -43,8 +70,14 @@ class Manager:
         # Players who were eliminated for misbehaving.
         self.banned_players = []
 
-        self.deck = deck
+        self.deck = None if deck is None else Deck(deck)
         self.tournament_map = None
+        self.round_executor = round_executor
+        # Seed of the tournament's random streams, None to use the random module's shared generator.
+        self.seed = get_seed(rng)
+        self.round_index = 0
+        self.metrics = metrics
+        self.metrics_path = metrics_path
 
         self.num_active_players = len(self.active_players)
         self.prev_num_active_players = self.num_active_players
@@ -66,7 +99,13 @@ class Manager:
                 NotEnoughDestinations if none of the maps given by players are valid for
                 the maximum number of players a game assignment could get.            
         """
-        suggested_maps = self.get_player_maps()
+        return run_without_event_loop(self.set_up_tournament_async())
+
+    async def set_up_tournament_async(self) -> Map:
+        """
+        Coroutine version of set_up_tournament.
+        """
+        suggested_maps = await self.get_player_maps_async()
         max_players_in_game_assignment = min(len(self.active_players), self.MAXPLAYERS_IN_A_GAME)
         game_map = self.get_valid_map(max_players_in_game_assignment, suggested_maps)
         return game_map
@@ -96,9 +135,16 @@ class Manager:
 
             Returns: List of maps received from players.
         """
+        return run_without_event_loop(self.get_player_maps_async())
+
+    async def get_player_maps_async(self) -> List[Map]:
+        """
+        Coroutine version of get_player_maps. The maps are considered in the order of the players.
+        """
+        players = copy(self.active_players)
+        maps = await self.call_players_method_async(players, "start")
         suggested_maps = []
-        for player in self.active_players:
-            suggested_map = self.call_player_method(player, player.start)
+        for player, suggested_map in zip(players, maps):
             if suggested_map is not None and suggested_map not in suggested_maps:
                 suggested_maps.append(suggested_map)
             elif suggested_map is None and player not in self.banned_players:
@@ -117,7 +163,7 @@ class Manager:
         """
         num_destination_options = 5
         num_destination_per_player = 2
-        return len(game_map.get_feasible_destinations(game_map.get_all_connections())) \
+        return game_map.count_feasible_destinations(game_map.connections) \
             >= num_destination_options + (num_destination_per_player * (number_of_players - 1))
 
     ###################
@@ -132,8 +178,21 @@ class Manager:
                 tournament_winners (list): List of winners of the last game in the tournament (sorted by name),
                 banned_players (list): List of players that were caught misbehaving in games/tournament
         """
-        self.tournament_map = self.set_up_tournament()
-        self.main_tournament_loop()
+        return run_without_event_loop(self.run_tournament_async())
+
+    async def run_tournament_async(self) -> TournmentResult:
+        """
+        Coroutine version of run_tournament, which an AsyncManager awaits on the running event loop.
+            Returns:
+                tournament_winners (list): List of winners of the last game in the tournament (sorted by name),
+                banned_players (list): List of players that were caught misbehaving in games/tournament
+        """
+        self.tournament_map = await self.set_up_tournament_async()
+        try:
+            await self.main_tournament_loop_async()
+        finally:
+            if self.round_executor is not None:
+                self.round_executor.close()
 
         # Save winners and cheaters to local variable since
         # an error communicating with the winners does not
@@ -144,7 +203,8 @@ class Manager:
         misbehaved = copy(self.banned_players)
         misbehaved.sort(key=lambda player: player.name)
         
-        self.notify_players_with_results()
+        await self.notify_players_with_results_async()
+        self.dump_metrics()
         return self.active_players, self.banned_players
 
     def main_tournament_loop(self) -> None:
@@ -153,9 +213,16 @@ class Manager:
             Returns:
                 tournament_winners (list): list of winners of the last game in the tournament (sorted by name)
         """
+        run_without_event_loop(self.main_tournament_loop_async())
+
+    async def main_tournament_loop_async(self) -> None:
+        """
+        Coroutine version of main_tournament_loop.
+        """
         while True:
             game_assignments = self.assign_players_to_games()
-            self.run_tournament_round(game_assignments)
+            await self.run_tournament_round_async(game_assignments)
+            self.round_index += 1
             if len(game_assignments) <= 1 or self.no_change_in_winners():
                 break
 
@@ -169,9 +236,23 @@ class Manager:
                 game_assigments (list(list(Player))): list of a lists of players where each inner
                                               list represents the 2-8 players in a game of trains
         """
-        for assignment in game_assignments:
-            ref = Referee(self.tournament_map, assignment, self.deck)
-            game_rankings, cheaters = ref.play_game()
+        self.apply_round_results(self.play_round_games(game_assignments))
+
+    async def run_tournament_round_async(self, game_assignments: List[GameAssignment]) -> None:
+        """
+        The tournament's coroutines play rounds through this. A Manager plays them synchronously (see
+        run_tournament_round); an AsyncManager plays the games of a round concurrently.
+        """
+        self.run_tournament_round(game_assignments)
+
+    def apply_round_results(self, game_results: List[GameResult]) -> None:
+        """
+        Eliminates the losing players and banned players of each game in a round.
+            Parameters:
+                game_results (list(GameResult)): The rankings and cheaters of each game, in the order
+                                                 of the round's game assignments
+        """
+        for game_rankings, cheaters in game_results:
             # Eliminate losing players
             multiple_ranks = len(game_rankings) >= 2
             if multiple_ranks:
@@ -181,6 +262,38 @@ class Manager:
             self.banned_players.extend(cheaters)
             self.remove_banned_players_from_active()
 
+    def play_round_games(self, game_assignments: List[GameAssignment]) -> List[GameResult]:
+        """
+        Plays a game of Trains for each of the given game assignments, in parallel if this manager
+        has a round executor. Games in a round share nothing but the tournament map and deck, so
+        the results are the same either way.
+            Parameters:
+                game_assigments (list(list(Player))): list of a lists of players where each inner
+                                              list represents the 2-8 players in a game of trains
+            Returns:
+                The result (rankings and cheaters) of each game, in the order of the game assignments
+        """
+        game_rngs = [self.get_game_rng(game_index) for game_index in range(len(game_assignments))]
+        if self.round_executor is not None:
+            return self.round_executor.play_games(self.tournament_map, self.deck, game_assignments, game_rngs)
+        game_results = []
+        for assignment, game_rng in zip(game_assignments, game_rngs):
+            ref = Referee(self.tournament_map, assignment, self.deck, rng=game_rng, metrics=self.metrics)
+            game_results.append(ref.play_game())
+        return game_results
+
+    def get_game_rng(self, game_index: int) -> Optional[random.Random]:
+        """
+        Returns the random stream of a game of the current round.
+            Parameters:
+                game_index (int): The index of the game's assignment in the round
+            Returns:
+                The game's random.Random, or None if the tournament is not seeded
+        """
+        if self.seed is None:
+            return None
+        return derive_rng(self.seed, self.round_index, game_index)
+
     def assign_players_to_games(self) -> List[GameAssignment]:
         """
         Break up players list into smaller lists of 2-8 players to be given to a Referee
@@ -224,7 +337,7 @@ class Manager:
         """
         num_destination_options = 5
         num_destination_per_player = 2
-        return len(game_map.get_feasible_destinations(game_map.get_all_connections())) \
+        return game_map.count_feasible_destinations(game_map.connections) \
             >= num_destination_options + (num_destination_per_player * (number_of_players - 1))
 
     def eliminate_losing_players(self, losing_player_rankings: GameRankings) -> None:
@@ -269,9 +382,14 @@ class Manager:
         Notifies all remaining active players, who are the winners of the tournament,
         that the tournament has ended and that they have won.
         """
+        run_without_event_loop(self.notify_players_with_results_async())
+
+    async def notify_players_with_results_async(self) -> None:
+        """
+        Coroutine version of notify_players_with_results.
+        """
         # Notify winners
-        for player in self.active_players:
-            self.call_player_method(player, player.end, True)
+        await self.call_players_method_async(copy(self.active_players), "end", True)
 
     #################################
     # Useful Player-related Methods #
@@ -291,11 +409,57 @@ class Manager:
 
         try:
             method = getattr(player, player_method.__name__)
-            method_output = method(*args)
-            return method_output
+            if self.metrics is None:
+                return method(*args)
+            call_start = time.perf_counter()
+            try:
+                return method(*args)
+            finally:
+                self.record_player_call_time(player, method.__name__, call_start)
         except Exception as e:
-            print(e)
-            self.boot_player(player, "Tournament held up due to a logic error. Player booted.")
+            self.boot_player_for_logic_error(player, e)
+
+    async def call_player_method_async(self, player: PlayerInterface, player_method: Callable, *args) -> Any:
+        """
+        The tournament's coroutines call players through this. A Manager calls them synchronously (see
+        call_player_method); an AsyncManager awaits them.
+            Parameters:
+                player (PlayerInterface): The player executing the method
+                player_method (Callable): The player method to execute
+                *args: The arguments for the given method
+            Returns:
+                The result of the given player method
+        """
+        return self.call_player_method(player, player_method, *args)
+
+    async def call_players_method_async(self, players: List[PlayerInterface], method_name: str, *args) -> List[Any]:
+        """
+        Calls the method of the given name of each player with the same arguments, one player after another
+        (see call_player_method_async).
+            Returns:
+                The result of each player's method, in the order of the players
+        """
+        return [await self.call_player_method_async(player, getattr(player, method_name), *args) for player in players]
+
+    def record_player_call_time(self, player: PlayerInterface, method_name: str, call_start: float) -> None:
+        """
+        Records the time since call_start of a call of a player method, labeled by the player's name.
+        """
+        self.metrics.record(get_player_method_metric(method_name), time.perf_counter() - call_start, player.name)
+
+    def boot_player_for_logic_error(self, player: PlayerInterface, error: Exception) -> None:
+        """
+        Boots a player whose method call raised an error (or timed out).
+        """
+        print(error)
+        self.boot_player(player, "Tournament held up due to a logic error. Player booted.")
+
+    def dump_metrics(self) -> None:
+        """
+        Writes the metrics of the tournament to this manager's metrics path, if it has a registry and a path.
+        """
+        if self.metrics is not None and self.metrics_path is not None:
+            self.metrics.dump(self.metrics_path)
 
     def remove_banned_players_from_active(self) ->  None:
         """
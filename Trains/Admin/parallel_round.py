@@ -0,0 +1,146 @@
+from concurrent.futures import ProcessPoolExecutor
+import sys
+import random
+from typing import List, Optional, Tuple
+
+sys.path.append('../../')
+from Trains.Admin.referee import Referee
+from Trains.Common.cards import Deck
+from Trains.Common.map import Map
+from Trains.Other.Types.trains_types import GameAssignment, GameResult
+
+# A GameResult where players are replaced by their index in the game assignment.
+# Player objects cannot be shared between processes, so results are sent back as indices
+# and mapped onto the manager's own player objects.
+IndexedGameRankings = List[List[Tuple[int, int]]]
+IndexedGameResult = Tuple[IndexedGameRankings, List[int]]
+
+# Read-only game inputs shared by every game a worker process plays in a round.
+# Set once per worker by initialize_worker.
+worker_game_map = None
+worker_deck = None
+
+
+def initialize_worker(game_map: Map, deck: Deck) -> None:
+    """
+    Initializes a worker process with the tournament map and deck so they are sent to each worker
+    once per round instead of once per game.
+        Parameters:
+            game_map (Map): The tournament map
+            deck (Deck): The tournament deck, or None if each referee should create its own
+    """
+    global worker_game_map, worker_deck
+    worker_game_map = game_map
+    worker_deck = deck
+
+
+def play_indexed_game(assignment: GameAssignment, game_rng: Optional[random.Random] = None) -> IndexedGameResult:
+    """
+    Plays one game of Trains in a worker process and returns its result with players given
+    by their index in the assignment.
+        Parameters:
+            assignment (list(Player)): The players in the game, in turn order
+            game_rng (random.Random): The game's random stream, or None for the worker's shared generator
+        Returns:
+            The rankings and cheaters of the game as indices into the assignment
+    """
+    referee = Referee(worker_game_map, assignment, worker_deck, rng=game_rng)
+    game_rankings, cheaters = referee.play_game()
+    indexed_rankings = [[(assignment.index(player), score) for player, score in rank] for rank in game_rankings]
+    indexed_cheaters = [assignment.index(player) for player in cheaters]
+    return indexed_rankings, indexed_cheaters
+
+
+def convert_indexed_game_result(assignment: GameAssignment, indexed_result: IndexedGameResult) -> GameResult:
+    """
+    Maps an IndexedGameResult back onto the players of the assignment it was played with.
+        Parameters:
+            assignment (list(Player)): The players in the game, in turn order
+            indexed_result (IndexedGameResult): The result of the game as indices into the assignment
+        Returns:
+            The GameResult (rankings and cheaters) of the game
+    """
+    indexed_rankings, indexed_cheaters = indexed_result
+    game_rankings = [[(assignment[index], score) for index, score in rank] for rank in indexed_rankings]
+    cheaters = [assignment[index] for index in indexed_cheaters]
+    return game_rankings, cheaters
+
+
+class ParallelRoundExecutor:
+    """
+    Plays all games of a tournament round across a pool of worker processes.
+
+    Only in-process players can be used: every player is pickled into a worker, plays its game there,
+    and the game result is mapped back onto the manager's player objects. Anything a player does to
+    its own state during a game (including being notified of a win) happens on the worker's copy.
+    Results are returned in the order of the game assignments, so a Manager applies them exactly as it
+    would after playing the games one after another.
+
+    The pool is started on first use and its workers are reused by every round played with the same map
+    and deck, so they are only spawned and sent the map and deck once per tournament. Close the executor
+    (or use it as a context manager) to shut the pool down once the tournament is over.
+    """
+
+    def __init__(self, max_workers: int = None):
+        """
+        Constructor for a ParallelRoundExecutor.
+            Parameters:
+                max_workers (int): Maximum number of worker processes, defaults to the number of CPUs
+        """
+        self.max_workers = max_workers
+        self.pool = None
+        # The map and deck the pool's workers were initialized with.
+        self.pool_map = None
+        self.pool_deck = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_pool(self, game_map: Map, deck: Deck) -> ProcessPoolExecutor:
+        """
+        Returns the pool of worker processes initialized with the given map and deck, starting a new pool
+        if there is none yet or its workers were initialized with another map or deck.
+        """
+        if self.pool is None or self.pool_map is not game_map or self.pool_deck is not deck:
+            self.close()
+            self.pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=initialize_worker,
+                                            initargs=(game_map, deck))
+            self.pool_map = game_map
+            self.pool_deck = deck
+        return self.pool
+
+    def close(self) -> None:
+        """
+        Shuts down the pool of worker processes, if it was started. The executor can still be used
+        afterwards, and starts a new pool when it is.
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+            self.pool_map = None
+            self.pool_deck = None
+
+    def play_games(self, game_map: Map, deck: Deck, game_assignments: List[GameAssignment],
+                   game_rngs: List[Optional[random.Random]] = None) -> List[GameResult]:
+        """
+        Plays a game for each game assignment in parallel.
+            Parameters:
+                game_map (Map): The tournament map
+                deck (Deck): The tournament deck, each game is played with its own copy. None if each
+                              referee should create its own deck.
+                game_assignments (list(list(Player))): The players of each game
+                game_rngs (list(random.Random)): The random stream of each game (None entries, or no list,
+                              for games that use the worker's shared generator)
+            Returns:
+                The GameResult of each game, in the order of the game assignments
+        """
+        if len(game_assignments) == 0:
+            return []
+        if game_rngs is None:
+            game_rngs = [None] * len(game_assignments)
+        indexed_results = list(self.get_pool(game_map, deck).map(play_indexed_game, game_assignments, game_rngs))
+        return [convert_indexed_game_result(assignment, indexed_result)
+                for assignment, indexed_result in zip(game_assignments, indexed_results)]
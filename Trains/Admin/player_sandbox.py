@@ -0,0 +1,305 @@
+import multiprocessing
+from multiprocessing.connection import Connection as PipeConnection
+import sys
+from typing import Any, Dict, List, Set
+
+sys.path.append('../../')
+from Trains.Common.map import Color, Destination, Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.moves import PlayerMove
+from Trains.Player.player import PlayerInterface
+
+# Seconds a sandboxed player has to answer a call unless its method has its own deadline.
+DEFAULT_CALL_TIMEOUT = 2.0
+# Number of warm workers a pool keeps ready (a game has at most 8 players).
+DEFAULT_POOL_SIZE = 8
+
+
+class PlayerTimeout(Exception):
+    """
+    Raised when a sandboxed player does not answer a call before its deadline. The worker running the
+    player is killed, so the player cannot be called again.
+    """
+    pass
+
+
+class PlayerSandboxError(Exception):
+    """
+    Raised when a sandboxed player's code raises an exception, or its worker process dies.
+    """
+    pass
+
+
+def run_sandbox_worker(connection: PipeConnection) -> None:
+    """
+    The loop of a worker process. Receives requests from the pool until told to stop:
+        ("load", player): run calls on the given (unpickled) player from now on, replying (True, None)
+        ("call", (method name, args)): call a method of the player, replying (True, result) or (False, error)
+        ("release", None): forget the player, so the worker can run another one
+        ("stop", None): exit
+    """
+    player = None
+    while True:
+        try:
+            command, payload = connection.recv()
+        except (EOFError, OSError):
+            return
+        if command == "stop":
+            return
+        if command == "release":
+            player = None
+            continue
+        try:
+            if command == "load":
+                player = payload
+                reply = (True, None)
+            else:
+                method_name, args = payload
+                reply = (True, getattr(player, method_name)(*args))
+            connection.send(reply)
+        except Exception as e:
+            # The player's exception or result may not be picklable, so errors are sent as text.
+            connection.send((False, f"{type(e).__name__}: {e}"))
+
+
+class SandboxWorker:
+    """
+    A worker process that runs one player's code at a time, and the pipe to send it requests over.
+    """
+
+    def __init__(self, context):
+        """
+        Starts a worker process.
+            Parameters:
+                context: The multiprocessing context to start the process with
+        """
+        self.connection, worker_connection = context.Pipe()
+        self.process = context.Process(target=run_sandbox_worker, args=(worker_connection,), daemon=True)
+        self.process.start()
+        worker_connection.close()
+        # Whether the worker missed a deadline or died, so it cannot be used again.
+        self.broken = False
+
+    def request(self, command: str, payload: Any, timeout: float) -> Any:
+        """
+        Sends a request to the worker and waits for its reply.
+            Parameters:
+                command (str): "load" or "call" (see run_sandbox_worker)
+                payload: The request's payload
+                timeout (float): Seconds to wait for the reply
+            Returns:
+                The result of the request
+            Throws:
+                PlayerTimeout if there is no reply in time
+                PlayerSandboxError if the request failed or the worker died
+        """
+        try:
+            self.connection.send((command, payload))
+            if not self.connection.poll(timeout):
+                self.broken = True
+                raise PlayerTimeout(f"No reply to {command} within {timeout} seconds")
+            succeeded, result = self.connection.recv()
+        except (EOFError, OSError) as e:
+            self.broken = True
+            raise PlayerSandboxError(f"Worker process died: {e}")
+        if not succeeded:
+            raise PlayerSandboxError(result)
+        return result
+
+    def notify(self, command: str) -> None:
+        """
+        Sends a request the worker does not reply to ("release" or "stop"), ignoring a dead worker.
+        """
+        try:
+            self.connection.send((command, None))
+        except (EOFError, OSError):
+            pass
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        """
+        Kills the worker process, e.g. one stuck in an infinite loop.
+        """
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class PlayerSandboxPool:
+    """
+    A pool of reusable worker processes that sandboxed players run in. Workers are started ahead of time
+    and returned to the pool when a player is closed, so they are reused across games and tournaments;
+    a worker is only replaced when the player running in it misses a deadline or crashes it.
+
+    Each worker runs one player at a time, so a player stuck in an infinite loop cannot hold up any other.
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_CALL_TIMEOUT,
+                 method_timeouts: Dict[str, float] = None):
+        """
+        Constructor for a PlayerSandboxPool. Starts the warm workers.
+            Parameters:
+                size (int): Number of idle workers to keep ready
+                timeout (float): Default deadline in seconds of a call to a sandboxed player
+                method_timeouts (dict(str, float)): Deadlines of specific player methods (e.g. {"setup": 10.0}),
+                    which override the default deadline
+        """
+        self.size = size
+        self.timeout = timeout
+        self.method_timeouts = method_timeouts if method_timeouts is not None else {}
+        self.context = multiprocessing.get_context()
+        self.idle_workers: List[SandboxWorker] = [SandboxWorker(self.context) for _ in range(size)]
+        self.workers_started = size
+
+    def __enter__(self) -> "PlayerSandboxPool":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+    def get_timeout(self, method_name: str) -> float:
+        """
+        Returns the deadline in seconds of a call to the given player method.
+        """
+        return self.method_timeouts.get(method_name, self.timeout)
+
+    def acquire(self) -> SandboxWorker:
+        """
+        Takes an idle worker from the pool, or starts one if none are idle.
+        """
+        while len(self.idle_workers) > 0:
+            worker = self.idle_workers.pop()
+            if worker.is_alive():
+                return worker
+            worker.kill()
+        self.workers_started += 1
+        return SandboxWorker(self.context)
+
+    def release(self, worker: SandboxWorker) -> None:
+        """
+        Returns a worker to the pool once its player is done, or stops it if enough workers are idle.
+        """
+        if len(self.idle_workers) < self.size and not worker.broken and worker.is_alive():
+            worker.notify("release")
+            self.idle_workers.append(worker)
+        else:
+            worker.notify("stop")
+            worker.process.join()
+
+    def discard(self, worker: SandboxWorker) -> None:
+        """
+        Kills a worker whose player missed a deadline or crashed it, and starts a warm replacement.
+        """
+        worker.kill()
+        if len(self.idle_workers) < self.size:
+            self.idle_workers.append(SandboxWorker(self.context))
+            self.workers_started += 1
+
+    def sandbox(self, player: PlayerInterface) -> "SandboxedPlayer":
+        """
+        Runs a player in a worker of this pool (see SandboxedPlayer).
+        """
+        return SandboxedPlayer(player, self)
+
+    def close(self) -> None:
+        """
+        Stops the idle workers. Workers of players that are still open are stopped when they are closed.
+        """
+        for worker in self.idle_workers:
+            worker.notify("stop")
+        for worker in self.idle_workers:
+            worker.process.join()
+        self.idle_workers = []
+        self.size = 0
+
+
+class SandboxedPlayer(PlayerInterface):
+    """
+    A player whose code runs in a worker process of a PlayerSandboxPool. Every method call is sent to the
+    worker and must be answered before its deadline; a call that misses it raises PlayerTimeout and kills
+    the worker, so an infinite loop in a strategy only boots its player. Exceptions raised by the player's
+    code are raised as PlayerSandboxError. Referees and managers boot players for both, like for any other
+    exception raised by player code.
+
+    The player is pickled into the worker when sandboxed (DynamicPlayers reload their strategy there), and
+    its state only lives in the worker. Its name and age are copied so referees and managers can order
+    and rank it. Close the player when it is done to return its worker to the pool.
+    """
+
+    def __init__(self, player: PlayerInterface, pool: PlayerSandboxPool):
+        """
+        Constructor for a SandboxedPlayer. Loads the player into a worker of the pool.
+            Parameters:
+                player (PlayerInterface): The player to run in the sandbox
+                pool (PlayerSandboxPool): The pool to take a worker from
+            Throws:
+                PlayerTimeout if the player does not load before the deadline of "load"
+                PlayerSandboxError if the player cannot be loaded
+        """
+        self.name = player.name
+        self.age = player.age
+        self.pool = pool
+        self.worker = pool.acquire()
+        self.request("load", player, pool.get_timeout("load"))
+
+    def request(self, command: str, payload: Any, timeout: float) -> Any:
+        """
+        Sends a request to this player's worker, giving up the worker if it misses the deadline or dies.
+            Throws:
+                PlayerTimeout if the worker does not reply in time
+                PlayerSandboxError if the request failed or the player's worker is gone
+        """
+        if self.worker is None:
+            raise PlayerSandboxError(f"{self.name} no longer has a worker")
+        try:
+            return self.worker.request(command, payload, timeout)
+        finally:
+            if self.worker.broken:
+                self.pool.discard(self.worker)
+                self.worker = None
+
+    def call(self, method_name: str, *args) -> Any:
+        """
+        Calls a method of the player in its worker, with the deadline of that method.
+        """
+        return self.request("call", (method_name, args), self.pool.get_timeout(method_name))
+
+    def close(self) -> None:
+        """
+        Returns this player's worker to the pool. The player cannot be called afterwards.
+        """
+        if self.worker is not None:
+            self.pool.release(self.worker)
+            self.worker = None
+
+    def setup(self, map: Map, rails: int, cards: Dict[Color, int]) -> None:
+        return self.call("setup", map, rails, cards)
+
+    def update_player_game_state(self, updated_game_state: PlayerGameState) -> None:
+        return self.call("update_player_game_state", updated_game_state)
+
+    def play(self, active_game_state: PlayerGameState) -> PlayerMove:
+        return self.call("play", active_game_state)
+
+    def pick(self, destinations: Set[Destination]) -> Set[Destination]:
+        return self.call("pick", destinations)
+
+    def more(self, cards: List[Color]) -> None:
+        return self.call("more", cards)
+
+    def boot_player_from_game(self, reason_for_boot: str) -> None:
+        return self.call("boot_player_from_game", reason_for_boot)
+
+    def boot_player_from_tournament(self, reason_for_boot: str) -> None:
+        return self.call("boot_player_from_tournament", reason_for_boot)
+
+    def win(self, winner: bool) -> None:
+        return self.call("win", winner)
+
+    def start(self) -> Map:
+        return self.call("start")
+
+    def end(self, winner: bool) -> None:
+        return self.call("end", winner)
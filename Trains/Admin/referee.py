@@ -1,18 +1,24 @@
 import asyncio
 from copy import deepcopy
-from collections import deque
-from random import randint
 import sys
-from typing import Callable, Deque, Dict, List, Set
-import networkx as nx
+import time
+from typing import Any, Callable, Collection, Deque, List, Optional, Set, Union
 
 sys.path.append('../../')
-from Trains.Common.map import City, Destination, Map, Color, Connection
+from Trains.Common.cards import Deck, Hand
+from Trains.Common.map import City, Destination, Map, Color, Connection, get_destination_sort_key
 from Trains.Common.player_game_state import PlayerGameState
+from Trains.Common.sampling_pool import SamplingPool
 from Trains.Player.player import PlayerInterface
 from Trains.Player.moves import MoveType
 from Trains.Admin.referee_game_state import RefereeGameState
-from Trains.Other.Types.trains_types import Cheaters, Edge, GameRankings, GameResult
+from Trains.Admin.longest_path import find_longest_path_length
+from Trains.Admin.game_random import RandomSource, create_rng
+from Trains.Admin.game_log import GameEventLog
+from Trains.Admin.coroutines import run_without_event_loop
+from Trains.Admin.instrumentation import MUTATION_METRIC, SCORING_METRIC, STATE_BUILD_METRIC, TURN_OVERHEAD_METRIC, \
+    VALIDATION_METRIC, MetricsRegistry, get_player_method_metric
+from Trains.Other.Types.trains_types import Cheaters, GameRankings, GameResult
 
 class Cheating(Exception):
     """
@@ -34,6 +40,9 @@ class Referee():
     Represents a referee that setups, facilitates, and ends a game of Trains.
     Should call play_game() right after __init__() to begin game and assume
     game has ended after play_game() returns. No other methods should be called
+    The game is implemented once, as coroutines (play_game_async and the steps it awaits). The synchronous
+    methods run them without an event loop, calling players synchronously (see call_player_method_async);
+    an AsyncReferee awaits its players instead.
     The referee should catch Cheating in the form of:
         - Data tampering during initialization
         - Illegal moves from players
@@ -41,8 +50,9 @@ class Referee():
         - Exceptions raised from player code
         - Type mismatch returned from player code
     and boots them from the game.
+    Unresponsive players (timeouts) are booted when their calls raise: a SandboxedPlayer (see player_sandbox)
+    runs a player in a worker process and raises PlayerTimeout when a call misses its deadline.
     The following will be handled after networking is implemented:
-        - Unresponsive players (timeouts)
         - Incorrectly formatted/invalid input (likely json)
     """
     INITIAL_RAIL_COUNT = 45
@@ -52,12 +62,27 @@ class Referee():
     NUM_DESTINATION_OPTIONS = 5
     BANNED_PLAYER_SCORE_REPRESENTATION = -21
 
-    def __init__(self, game_map: Map, players: List[PlayerInterface], deck: Deque[Color] = None):
+    def __init__(self, game_map: Map, players: List[PlayerInterface], deck: Union[Deck, Deque[Color]] = None,
+        feasible_destinations: Collection[Destination] = None, rng: RandomSource = None,
+        event_log: GameEventLog = None, metrics: MetricsRegistry = None):
         """
         Constructor for the Referee that initializes fields for the setup of a game of Trains.
             Parameters:
                 game_map (Map): The game map
                 players (list(PlayerInterface)): The list of players in descending order of player age
+                deck (Deck or deque): The deck of cards (the referee draws from its own copy), or None to create
+                    a random one
+                feasible_destinations (collection(Destination)): The feasible destinations of the map, if
+                    already known (e.g. when many games are played on one map). The map is then not searched
+                    for them again. Sorting them by their sort keys beforehand saves sorting them here.
+                rng (RandomSource): Seed or random.Random to create the deck and offer destinations with.
+                    Games with identical seeds, players and maps are identical. Defaults to the random
+                    module's shared generator.
+                event_log (GameEventLog): Log to record the game's setup, picks, moves, boots and scores to,
+                    so it can be replayed without its players (see game_replayer), or None to not record it
+                metrics (MetricsRegistry): Registry to record the latency of player calls, the referee's time per
+                    turn (building states, validating and applying moves) and scoring time in, or None to not
+                    measure them (see instrumentation)
             Throws:
                 ValueError:
                     - The game map must be a Map
@@ -77,18 +102,28 @@ class Referee():
         self.took_last_turn = set()
         self.players = players
         # Make sure given map has enough destinations for the players.
-        if  len(game_map.get_feasible_destinations(game_map.get_all_connections())) \
+        if feasible_destinations is None:
+            number_of_feasible_destinations = game_map.count_feasible_destinations(game_map.connections)
+        else:
+            number_of_feasible_destinations = len(feasible_destinations)
+        if number_of_feasible_destinations \
             < self.NUM_DESTINATION_OPTIONS + (self.NUM_DESTINATIONS * (len(self.players) - 1)):
             raise NotEnoughDestinations("Not enough destinations to give each player 5 to choose from.")
         
         self.game_map = game_map
+        self.feasible_destinations = feasible_destinations
+        self.rng = create_rng(rng)
+        self.event_log = event_log
+        self.metrics = metrics
+        # Seconds spent in player calls so far, only counted when there is a metrics registry.
+        self.player_call_time = 0.0
         self.ref_game_state = None
 
         # If the deck is not given, then create one
         if deck is None:
             self.deck = self.initialize_deck(self.INITIAL_DECK_SIZE)
         else:
-            self.deck = deck
+            self.deck = Deck(deck)
             self.INITIAL_DECK_SIZE = len(deck)
 
     ###################################
@@ -106,18 +141,34 @@ class Referee():
         with the map and the deck and its remaining cards.
 
         SIDE EFFECTS:
-            - Mutates the self.deck field by removing cards (Color's) from the deque.
+            - Mutates the self.deck field by removing cards (Color's) from the Deck.
             - Sets the self.ref_game_state (initialized to None in __init__)
         """
+        run_without_event_loop(self.set_up_game_states_async())
+
+    async def set_up_game_states_async(self) -> None:
+        """
+        Coroutine version of set_up_game_states.
+        """
         player_game_states = []
         for player_index in range(len(self.players)):
             player = self.players[player_index]
             initial_hand = self.create_initial_player_hand(self.deck, self.INITIAL_HAND_SIZE)
-            self.call_player_method(player_index, player.setup, self.game_map, 
+            await self.call_player_method_async(player_index, player.setup, self.game_map,
                 self.INITIAL_RAIL_COUNT, initial_hand)
             initial_player_state = PlayerGameState(set(), initial_hand, self.INITIAL_RAIL_COUNT, set(), dict(), list())
             player_game_states.append(initial_player_state)
         self.ref_game_state = RefereeGameState(self.game_map, self.deck, player_game_states)
+        self.log_setup()
+
+    def log_setup(self) -> None:
+        """
+        Records the setup of the game in the event log, if there is one: the map, the players' names, rails and
+        hands, and the rest of the deck.
+        """
+        if self.event_log is not None:
+            self.event_log.log_setup(self.game_map, [player.name for player in self.players], self.INITIAL_RAIL_COUNT,
+                [game_state.colored_cards for game_state in self.ref_game_state.player_game_states], self.deck)
     
     def players_pick_destinations(self) -> None:
         """
@@ -128,27 +179,63 @@ class Referee():
         SIDE EFFECT: Adds each destination the player chooses to their corresponding PlayerGameState's (inside
         self.ref_game_state) destinations.
         """
-        map_connections = self.game_map.get_all_connections()
-        feasible_destinations = \
-            self.game_map.get_feasible_destinations(map_connections)
-            
+        run_without_event_loop(self.players_pick_destinations_async())
+
+    async def players_pick_destinations_async(self) -> None:
+        """
+        Coroutine version of players_pick_destinations.
+        """
+        destination_pool = self.get_destination_pool()
+
         for player_index in range(len(self.players)):
-            chosen_destinations = self.get_player_chosen_destinations(player_index, feasible_destinations)
+            chosen_destinations = await self.get_player_chosen_destinations_async(player_index, destination_pool)
             self.ref_game_state.give_player_destinations(player_index, chosen_destinations)
 
-    def get_player_chosen_destinations(self, player_index: int, feasible_destinations: Set[Destination]) -> Set[Destination]:
+    def get_destination_pool(self) -> SamplingPool[Destination]:
+        """
+        Returns the feasible destinations of the game map that players pick their destinations from.
+            Returns:
+                (SamplingPool(Destination)) A new pool of the feasible destinations in sorted order, so the
+                destinations offered only depend on the random numbers drawn and not on set order. Picking
+                destinations removes them from the pool.
+        """
+        feasible_destinations = self.feasible_destinations
+        if feasible_destinations is None:
+            feasible_destinations = self.game_map.get_feasible_destinations(self.game_map.connections)
+        return SamplingPool(sorted(feasible_destinations, key=get_destination_sort_key))
+
+    def get_player_chosen_destinations(self, player_index: int,
+        destination_pool: SamplingPool[Destination]) -> Set[Destination]:
         """
-        Given the index of a player and the set of a map's feasible destinations that have not been chosen, 
-        call the player's pick method, removes their chosen destination from feasible destinations, and 
+        Given the index of a player and the pool of a map's feasible destinations that have not been chosen, 
+        call the player's pick method, removes their chosen destination from the pool, and 
         returns the destinations they've chosen.
         """
+        return run_without_event_loop(self.get_player_chosen_destinations_async(player_index, destination_pool))
+
+    async def get_player_chosen_destinations_async(self, player_index: int,
+        destination_pool: SamplingPool[Destination]) -> Set[Destination]:
+        """
+        Coroutine version of get_player_chosen_destinations.
+        """
         player = self.players[player_index]
 
         # Give each player their initial destinations
         inital_player_feasible_destinations = \
-            self.get_destination_selection(feasible_destinations, self.NUM_DESTINATION_OPTIONS)
+            self.get_destination_selection(destination_pool, self.NUM_DESTINATION_OPTIONS)
         destinations_not_chosen = \
-            self.call_player_method(player_index, player.pick, inital_player_feasible_destinations)
+            await self.call_player_method_async(player_index, player.pick, inital_player_feasible_destinations)
+        return self.resolve_player_destination_choice(player_index, destination_pool,
+            inital_player_feasible_destinations, destinations_not_chosen)
+
+    def resolve_player_destination_choice(self, player_index: int, destination_pool: SamplingPool[Destination],
+        inital_player_feasible_destinations: Set[Destination], destinations_not_chosen: Set[Destination]) -> Set[Destination]:
+        """
+        Given the destinations a player was offered and the destinations they returned, verifies the player's
+        choice, boots them if it is not valid, and removes the chosen destinations from the destination pool.
+            Returns:
+                The destinations the player chose (empty if they were booted)
+        """
         if destinations_not_chosen is None:
             destinations_not_chosen = set()
         destinations_chosen = inital_player_feasible_destinations - destinations_not_chosen
@@ -157,69 +244,54 @@ class Referee():
         if not self.verify_player_destinations(inital_player_feasible_destinations, destinations_chosen):
             self.boot_player(player_index, "Referee did not get a valid set of destinations.")
             return set()
-        # Remove the destinations that this player chose from the set of feasible destinations offered to players
+        # Remove the destinations that this player chose from the pool of destinations offered to players
         else:
-            feasible_destinations -= destinations_chosen
+            destination_pool.remove(destinations_chosen)
+            if self.event_log is not None:
+                self.event_log.log_pick(player_index, destinations_chosen)
             return destinations_chosen
 
-    def initialize_deck(self, number_of_cards: int) -> Deque[Color]:
+    def initialize_deck(self, number_of_cards: int) -> Deck:
         """
         Initializes the deck of colored cards for a game of Trains.  
         Randomly generates 'number_of_cards' colored cards.
             Parameters:
                 number_of_cards (int): The initial number of cards in the deck
             Returns:
-                (deque) The deck of cards
+                (Deck) The deck of cards
         """
-        deck = deque()
+        deck = Deck()
         for _ in range(number_of_cards):
-            next_card = Color(randint(1, Color.number_of_colors()))
+            next_card = Color(self.rng.randint(1, Color.number_of_colors()))
             deck.append(next_card)
 
         return deck
 
-    def create_initial_player_hand(self, deck: Deque[Color], initial_player_cards: int) -> Dict[Color, int]:
+    def create_initial_player_hand(self, deck: Deck, initial_player_cards: int) -> Hand:
         """
         Creates the initial hand of colored cards for a player using cards from a given deck.
             Parameters:
-                deck (deque[Color]): The deck of cards
+                deck (Deck): The deck of cards
                 initial_player_cards (int): The initial number of cards in a player hand
             Returns:
-                (dict[Color, int]) The player hand of colored cards as a dictionary keyed by each enum
-                    defined by Color with integer values representing the amount of cards
-        """
-        hand = dict()
-        for _ in range(initial_player_cards):
-            next_card = deck.pop()
-            if next_card in hand.keys():
-                hand[next_card] += 1
-            else:
-                hand[next_card] = 1
-
-        for i in range(1, Color.number_of_colors() + 1):
-            if Color(i) not in hand.keys():
-                hand[Color(i)] = 0
-        
+                (Hand) The player hand of colored cards, with a count for each color defined by Color
+        """
+        hand = Hand()
+        hand.add_cards(deck.pop() for _ in range(initial_player_cards))
         return hand
 
-    def get_destination_selection(self, feasible_destinations: Set[Destination], 
+    def get_destination_selection(self, destination_pool: SamplingPool[Destination], 
         number_of_destinations: int) -> Set[Destination]:
         """
         Gets the subset of feasible destinations that a player will choose their destinations from on setup.
+        Takes time proportional to number_of_destinations, not to the number of feasible destinations.
             Parameters:
-                feasible_destinations (set(Destination)): Set of all feasible destinations on a game map
+                destination_pool (SamplingPool(Destination)): Pool of the feasible destinations not chosen yet
                 number_of_destinations (int): The number of destinations that a player can select from
             Returns:
                 (set(Destination)) The set of destinations that a player will select from
         """
-        destination_options = set()
-        destination_list = list(feasible_destinations)
-        for _ in range(min(number_of_destinations, len(destination_list))):
-            random_destination = destination_list[randint(0, len(destination_list) - 1)]
-            destination_options.add(random_destination)
-            destination_list.remove(random_destination)
-
-        return destination_options
+        return destination_pool.sample(number_of_destinations, self.rng)
 
     def verify_player_destinations(self, destinations_given: Set[Destination], 
         destinations_chosen: Set[Destination]) -> bool:
@@ -258,16 +330,31 @@ class Referee():
                 who finished at a given rank (sorted by player name),
                 List of banned players sorted by player name.
         """
+        return run_without_event_loop(self.play_game_async())
+
+    async def play_game_async(self) -> GameResult:
+        """
+        Coroutine version of play_game, which an AsyncReferee awaits on the running event loop.
+            Returns:
+                Rankings as a list of lists (first place to last place) where the
+                outer list represents placement and the inner lists represent players
+                who finished at a given rank (sorted by player name),
+                List of banned players sorted by player name.
+        """
         # Set up players with the resources they need.
-        self.set_up_game_states()
-        self.players_pick_destinations()
+        await self.set_up_game_states_async()
+        await self.players_pick_destinations_async()
 
         # Main game loop
-        self.main_game_loop()
+        await self.main_game_loop_async()
 
         # Score the game and notify players of win status
+        scoring_start = self.start_timer()
         scores = self.score_game()
-        self.notify_players(scores)
+        self.record_time(SCORING_METRIC, scoring_start)
+        if self.event_log is not None:
+            self.event_log.log_scores(scores)
+        await self.notify_players_async(scores)
         # Return rankings and list of banned players
         return self.get_ranking_of_players(scores), self.get_banned_players()
 
@@ -278,6 +365,12 @@ class Referee():
         and booting players that cheat.
         THIS METHOD SHOULD ONLY BE CALLED ONCE BY play_game
         """
+        run_without_event_loop(self.main_game_loop_async())
+
+    async def main_game_loop_async(self) -> None:
+        """
+        Coroutine version of main_game_loop.
+        """
         while not self.is_game_over():
             active_player_index = self.ref_game_state.get_current_active_player_index()
             active_player = self.players[active_player_index]
@@ -287,7 +380,7 @@ class Referee():
                 self.ref_game_state.next_turn()
                 continue
 
-            self.execute_active_player_move()
+            await self.execute_active_player_move_async()
 
             # Check if game has ended
             if self.ref_game_state.on_last_turn():
@@ -313,9 +406,19 @@ class Referee():
         Executes the draw cards move for the active player.
         THIS MUTATES THE REFEREE GAME STATE FOR THE ACITVE PLAYER
         """
+        run_without_event_loop(self.execute_draw_move_async())
+
+    async def execute_draw_move_async(self) -> None:
+        """
+        Coroutine version of execute_draw_move.
+        """
+        mutation_start = self.start_timer()
         new_cards = self.ref_game_state.get_cards_from_deck(self.CARDS_ON_DRAW)
         self.ref_game_state.give_cards_to_active_player(new_cards)
-        self.call_player_method(self.ref_game_state.turn, self.get_active_player().more, new_cards)
+        self.record_time(MUTATION_METRIC, mutation_start)
+        if self.event_log is not None:
+            self.event_log.log_draw(self.ref_game_state.turn, new_cards)
+        await self.call_player_method_async(self.ref_game_state.turn, self.get_active_player().more, new_cards)
 
     def execute_acquire_connection_move(self, connection: Connection) -> None:
         """
@@ -323,15 +426,20 @@ class Referee():
         not legal.
 
         SIDE EFFECT: THIS MUTATES THE REFEREE GAME STATE FOR THE CORRESPONDING PLAYER BY GIVING THEM THE CONNECTION IF 
-        IT IS A LEGAL ACQUIISTION. The field self.ref_game_state.free_connections updated when the next player takes
-        their turn and next_turn() is called.
+        IT IS A LEGAL ACQUIISTION. The field self.ref_game_state.free_connections is updated immediately.
 
             Parameters:
                 connection (Connection): The connection that the currently active player is attempting to acquire
         """
+        validation_start = self.start_timer()
         valid = self.ref_game_state.verify_legal_connection(connection)
+        self.record_time(VALIDATION_METRIC, validation_start)
         if valid:
+            mutation_start = self.start_timer()
             self.ref_game_state.add_connection_to_active_player(connection)
+            self.record_time(MUTATION_METRIC, mutation_start)
+            if self.event_log is not None:
+                self.event_log.log_acquire(self.ref_game_state.turn, connection)
         else:
             self.boot_player(self.ref_game_state.turn, "Connection given is not able to be acquired.")
     
@@ -340,25 +448,36 @@ class Referee():
         Executes the player active player's move if it is legal, otherwise boots the player.
 
         SIDE EFFECT: Mutates the referee game state by doing one of the following:
-            - Giving a player a connection they legally acquire. The field self.ref_game_state.free_connections updated when the next player takes
-              their turn and next_turn() is called.
+            - Giving a player a connection they legally acquire. The field self.ref_game_state.free_connections is
+              updated immediately.
             - Removing cards from the deck and giving them to a player (changes self.ref_game_state.colored_card_deck).
         """
+        run_without_event_loop(self.execute_active_player_move_async())
+
+    async def execute_active_player_move_async(self) -> None:
+        """
+        Coroutine version of execute_active_player_move.
+        """
+        turn_start = self.start_timer()
+        player_call_time_before_turn = self.player_call_time
         # Get move
         active_player_index = self.ref_game_state.turn
         active_player_state = self.ref_game_state.get_player_game_state()
-        move = self.call_player_method(active_player_index, self.get_active_player().play, active_player_state)
+        self.record_time(STATE_BUILD_METRIC, turn_start)
+        move = await self.call_player_method_async(active_player_index, self.get_active_player().play,
+            active_player_state)
 
         # Execute move
         if move is None:
             self.boot_player(active_player_index, "Given action was not valid.")
         elif move.move_type == MoveType.DRAW_CARDS:
-            self.execute_draw_move()
+            await self.execute_draw_move_async()
         elif move.move_type == MoveType.ACQUIRE_CONNECTION:
             self.execute_acquire_connection_move(move.connection)
         else:
             self.boot_player(active_player_index, "Given action was not valid.")
-            
+        self.record_turn_overhead(turn_start, player_call_time_before_turn)
+
     def get_active_player(self) -> PlayerInterface:
         """
         Returns the Player who is currently taking their turn.
@@ -435,6 +554,12 @@ class Referee():
             Parameters:
                 scores (list): scores corresponding to players
         """
+        run_without_event_loop(self.notify_players_async(scores))
+
+    async def notify_players_async(self, scores: list) -> None:
+        """
+        Coroutine version of notify_players.
+        """
         highest_score = max(scores)
 
         for player, score in zip(self.players, scores):
@@ -443,67 +568,19 @@ class Referee():
             if player_index not in self.banned_player_indices:
                 if score == highest_score:
                     did_win = True
-                self.call_player_method(player_index, player.win, did_win)
+                await self.call_player_method_async(player_index, player.win, did_win)
 
     def find_longest_continuous_path_for_player(self, player_index: int) -> int:
         """
         Finds the longest continuous path that each player can create with
-        the connections that they posess.
-        SOURCE: https://networkx.org/documentation/stable/reference/algorithms/generated/networkx.algorithms.simple_paths.all_simple_paths.html#networkx.algorithms.simple_paths.all_simple_paths
+        the connections that they posess. See Trains.Admin.longest_path for the search.
             Parameters:
                 player (int): The index of the player to find a connection for
             Return:
                 connection_length (int): Length of player's longest connection
         """
-        trains_graph = nx.MultiGraph()
-        player_cities = set()
-        # Create a graph using the game map
-        for connection in self.ref_game_state.player_game_states[player_index].connections:
-            for city in connection.cities:
-                player_cities.add(city)
-        for city in player_cities:
-            trains_graph.add_node(city)
-        for connection in self.ref_game_state.player_game_states[player_index].connections:
-            city1 = list(connection.cities)[0]
-            city2 = list(connection.cities)[1]
-            weight = connection.length
-            trains_graph.add_edge(city1, city2, weight=weight)
-
-        # Get all simple paths in the graph between all cities connected via some path
-        simple_paths = []
-        for source_city in player_cities:
-            for dest_city in player_cities:
-                simple_paths += nx.all_simple_paths(trains_graph, source_city, dest_city)
-
-        # Get the weight (length) of the longest path out of all the simple paths
-        max_weight = 0
-        for path in map(nx.utils.pairwise, simple_paths):
-            path_weight = self.max_weight_of_simple_path(trains_graph, list(path))
-            if path_weight > max_weight:
-                max_weight = path_weight
-
-        return max_weight
-
-    def max_weight_of_simple_path(self, graph: nx.MultiGraph, path: List[Edge]) -> int:
-        """
-        Gets the max weight path from a set of graphs
-        THIS METHOD SHOULD ONLY BE CALLED BY get_longest_path
-        SOURCE: https://networkx.org/documentation/stable/reference/algorithms/generated/networkx.algorithms.simple_paths.all_simple_paths.html#networkx.algorithms.simple_paths.all_simple_paths
-            Parameters:
-                graph (nx.MultiGraph): the graph that paths belong to
-                path (list(edge)): paths to compare | edge is a tuple of two nodes
-            Return:
-                weight (int): max weight of the given path
-        """
-        weight = 0
-        for edge in path:
-            edge_weight_options = []
-            # get_edge_data creates a dictionary of edge attributes (weights) for all edges in the given path  
-            for edge_weight_index in graph.get_edge_data(*edge).keys():
-                edge_weight_options.append(graph.get_edge_data(*edge)[edge_weight_index]['weight'])
-            weight += max(edge_weight_options)
-
-        return weight
+        player_connections = self.ref_game_state.player_game_states[player_index].connections
+        return find_longest_path_length(player_connections)
 
     def get_connection_score(self, player_resources: PlayerGameState, score_value: int) -> int:
         """
@@ -530,9 +607,10 @@ class Referee():
                 score (int): score for destinations owned by this player
         """
         score = 0
+        player_connectivity = self.ref_game_state.map.get_connectivity(player_resources.connections)
         for destination in player_resources.destinations:
             city1, city2 = list(destination)
-            if city2 in self.ref_game_state.map.get_all_terminal_cities_from_city(city1, player_resources.connections):
+            if player_connectivity.connected(city1, city2):
                 score += score_value
             else:
                 score -= score_value
@@ -556,6 +634,8 @@ class Referee():
         try:
             if player_index not in self.banned_player_indices:
                 self.banned_player_indices.add(player_index)
+                if self.event_log is not None:
+                    self.event_log.log_boot(player_index, reason)
                 self.players[player_index].boot_player_from_game(reason)
         except:
             # Indicates error from booting player
@@ -577,10 +657,75 @@ class Referee():
         try:
 
             method = getattr(self.players[player_index], player_method.__name__)
-            result = method(*args)
-            return result
+            if self.metrics is None:
+                return method(*args)
+            return self.call_timed_player_method(player_index, method, *args)
         except Exception as e:
-            self.boot_player(player_index, "Game held up due to a logic error. Player booted.")
+            self.boot_player_for_logic_error(player_index)
+
+    async def call_player_method_async(self, player_index: int, player_method: Callable, *args) -> Any:
+        """
+        The game's coroutines call players through this. A Referee calls them synchronously (see
+        call_player_method); an AsyncReferee awaits them.
+            Parameters:
+                player_index (int): The index of the player executing the method
+                player_method (Callable): The player method to execute
+                *args: The arguments for the given method
+            Returns:
+                The result of the given player method
+        """
+        return self.call_player_method(player_index, player_method, *args)
+
+    def call_timed_player_method(self, player_index: int, method: Callable, *args):
+        """
+        Calls a player method and records its latency in the metrics registry, labeled by the player's name.
+        Exceptions raised by the method are passed on.
+        """
+        call_start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self.record_player_call_time(player_index, method.__name__, call_start)
+
+    def boot_player_for_logic_error(self, player_index: int) -> None:
+        """
+        Boots a player whose method call raised an error (or timed out).
+        """
+        self.boot_player(player_index, "Game held up due to a logic error. Player booted.")
+
+    ###################
+    # Instrumentation #
+    ###################
+
+    def start_timer(self) -> Optional[float]:
+        """
+        Returns the time to measure a metric from, or None if this referee has no metrics registry.
+        """
+        return None if self.metrics is None else time.perf_counter()
+
+    def record_time(self, metric: str, start: Optional[float]) -> None:
+        """
+        Records the time since start (see start_timer) for a metric, if this referee has a metrics registry.
+        """
+        if start is not None:
+            self.metrics.record(metric, time.perf_counter() - start)
+
+    def record_player_call_time(self, player_index: int, method_name: str, call_start: float) -> None:
+        """
+        Records the time since call_start of a call of a player method, labeled by the player's name, and adds it
+        to the time spent in player calls.
+        """
+        call_time = time.perf_counter() - call_start
+        self.player_call_time += call_time
+        self.metrics.record(get_player_method_metric(method_name), call_time, self.players[player_index].name)
+
+    def record_turn_overhead(self, turn_start: Optional[float], player_call_time_before_turn: float) -> None:
+        """
+        Records the time a turn took outside of player calls, if this referee has a metrics registry.
+        """
+        if turn_start is not None:
+            turn_player_call_time = self.player_call_time - player_call_time_before_turn
+            self.metrics.record(TURN_OVERHEAD_METRIC, time.perf_counter() - turn_start - turn_player_call_time)
 
     def get_ranking_of_players(self, scores:list) -> GameRankings:
         """
@@ -676,7 +821,7 @@ class Referee():
 
         # Game info dict
         game_info = {}
-        game_info["unacquired_connections"] = self.ref_game_state.get_all_unacquired_connections()
+        game_info["unacquired_connections"] = self.ref_game_state.get_free_connections()
         game_info["cards_in_deck"] = len(self.ref_game_state.colored_card_deck)
         game_info["last_turn"] = self.ref_game_state.on_last_turn()
 
@@ -1,9 +1,11 @@
 import sys
 from copy import deepcopy, copy
 from collections import deque
-from typing import List, Set
+from typing import Dict, FrozenSet, List, Optional, Set
 
 sys.path.append('../../')
+from Trains.Common.cards import Deck
+from Trains.Common.connection_index import AcquirableConnectionIndex
 from Trains.Common.map import Color, Connection, Destination, Map
 from Trains.Common.player_game_state import PlayerGameState
 
@@ -13,24 +15,31 @@ class RefereeGameState:
     Represents a referee game state that keeps track of player game states (PlayerGameState) and
     which player's turn it is.  Also handles the verification of players acquiring connections, and
     determines what connections are available to the currently active player.
+
+    Ownership of every map connection is tracked in an index (connection -> owning player index, or None
+    when the connection is free) that is updated as connections are acquired and released, so turns never
+    have to rebuild the set of free connections from every player's game state. The free connections are also
+    indexed by color and length, so finding the connections a player can acquire only checks each color and length.
     """
     def __init__(self, map: Map, colored_card_deck: deque, player_game_states: list):
         """
         Constructor for RefereeGameState that verifies given fields and initializes class fields to setup a game.
             Parameters:
                 map (Map): The game map
-                colored_card_deck (deque): A deque of colored cards representing the deck of colored cards
+                colored_card_deck (Deck): The deck of colored cards (a deque of Color is converted to a Deck)
                 player_game_states (list): A list of PlayerGameState provided by the referee (in sorted order) 
             Throws:
                 ValueError:
                     - The given map must be of type Map
-                    - The deck of colored cards must be a deque
+                    - The deck of colored cards must be a Deck or a deque
                     - The player game states must be a list and each one a PlayerGameState
         """
         if type(map) != Map:
             raise ValueError("The given map must be a Map")
-        if type(colored_card_deck) != deque:
-            raise ValueError("The colored card deck must be a deque")
+        if type(colored_card_deck) == deque:
+            colored_card_deck = Deck(colored_card_deck)
+        elif type(colored_card_deck) != Deck:
+            raise ValueError("The colored card deck must be a Deck or a deque")
         if type(player_game_states) != list:
             raise ValueError("The given player game states must be a list.")
         for entry in player_game_states:
@@ -41,7 +50,11 @@ class RefereeGameState:
         self.player_game_states = player_game_states
         self.turn = 0
 
-        self.free_connections = self.get_all_unacquired_connections()
+        self.connection_owners = self.build_connection_owners()
+        self.free_connections = \
+            {connection for connection, owner in self.connection_owners.items() if owner is None}
+        self.free_connections_snapshot = None
+        self.free_connection_index = AcquirableConnectionIndex(self.free_connections)
         self.colored_card_deck = colored_card_deck
 
         self.no_change = False
@@ -55,6 +68,41 @@ class RefereeGameState:
             list(self.colored_card_deck) == list(other.colored_card_deck) and \
                 self.player_game_states == other.player_game_states
 
+    def build_connection_owners(self) -> Dict[Connection, Optional[int]]:
+        """
+        Builds the connection ownership index from the map and the player game states.
+            Returns:
+                Dictionary mapping every map connection to the index of the player who owns it,
+                or None if the connection is free.
+        """
+        connection_owners = {connection: None for connection in self.map.connections}
+        for player_index in range(len(self.player_game_states)):
+            for connection in self.player_game_states[player_index].connections:
+                if connection in connection_owners:
+                    connection_owners[connection] = player_index
+        return connection_owners
+
+    def get_connection_owner(self, connection: Connection) -> Optional[int]:
+        """
+        Gets the index of the player who owns the given connection.
+            Parameters:
+                connection (Connection): A connection on the map
+            Returns:
+                The index of the owning player, or None if the connection is free (or not on the map)
+        """
+        return self.connection_owners.get(connection)
+
+    def get_free_connections(self) -> FrozenSet[Connection]:
+        """
+        Gets an immutable snapshot of the connections no player owns. The snapshot is only rebuilt
+        after a connection is acquired or released, so turns that do not change ownership share it.
+            Returns:
+                Frozen set of unacquired connections
+        """
+        if self.free_connections_snapshot is None:
+            self.free_connections_snapshot = frozenset(self.free_connections)
+        return self.free_connections_snapshot
+
     def get_current_active_player_index(self) -> int:
         """
         Returns the currently active player
@@ -64,12 +112,10 @@ class RefereeGameState:
 
     def next_turn(self) -> None:
         """
-        Increments the turn counter to the active player's index. This method also frees up any connections
-        players no longer have (i.e., if they've been banned), as well as checks to see if the RefereeGameState
-        changed last turn.
+        Increments the turn counter to the active player's index and checks to see if the RefereeGameState
+        changed last turn. Connections released by banned players are already free (see clear_player_connections).
         """
         self.turn = (self.turn + 1) % len(self.player_game_states)
-        self.free_connections = self.get_all_unacquired_connections()
         self.detect_state_change()
 
     def detect_state_change(self) -> None:
@@ -106,7 +152,7 @@ class RefereeGameState:
 
         # Setup player's game info.
         game_info = {}
-        game_info["unacquired_connections"] = self.get_all_unacquired_connections()
+        game_info["unacquired_connections"] = self.get_free_connections()
         game_info["cards_in_deck"] = len(self.colored_card_deck)
         game_info["last_turn"] = self.on_last_turn()
 
@@ -186,20 +232,17 @@ class RefereeGameState:
             Returns:
                 Set of acquireable connections
         """
-        acquirable_connections = set()
-        for connection in self.free_connections:
-            if self.verify_legal_connection_for_player(connection, player_game_state):
-                acquirable_connections.add(connection)
-        return acquirable_connections
+        return self.free_connection_index.get_acquirable_connections(player_game_state.colored_cards, player_game_state.rails)
 
     def get_all_unacquired_connections(self) -> Set[Connection]:
         """
-        Determines all connections that have not been acquired by a player.
+        Determines all connections that have not been acquired by a player by recomputing them from the
+        map and every player game state. Prefer self.free_connections/get_free_connections during a game.
             Returns:
                 Set of unacquired connections
         """
         all_connections = self.map.get_all_connections()
-        unacquired_connections = all_connections - self.get_all_player_connections()
+        unacquired_connections = set(all_connections - self.get_all_player_connections())
         return unacquired_connections
 
     def get_cards_from_deck(self, number_of_cards) -> List[Color]:
@@ -210,26 +253,16 @@ class RefereeGameState:
         SIDE EFFECT: Changes the number of cards in the deck by removing an amount greater than
         or equal to two cards.
         """
-        cards = []
-        for _ in range(number_of_cards):
-            if len(self.colored_card_deck) > 0:
-                cards.append(self.colored_card_deck.pop())
-        return cards
+        return self.colored_card_deck.draw(number_of_cards)
 
     def give_cards_to_active_player(self, cards_to_give: List[Color]) -> None:
         """
         Given a list of colored cards to be given to the active player, adds these cards
         to the player's hand.
 
-        SIDE EFFECT: Mutates the colored_card field (dict[Color, int]) by adding 1 to each value at the key of
-        the corresponding color of each card.
-        """
-        active_player_game_state = self.player_game_states[self.turn]
-        for card in cards_to_give:
-            if card in active_player_game_state.colored_cards.keys():
-                active_player_game_state.colored_cards[card] += 1
-            else:
-                active_player_game_state.colored_cards[card] = 1
+        SIDE EFFECT: Mutates the colored_card field (Hand) by adding 1 to the count of the color of each card.
+        """
+        self.player_game_states[self.turn].colored_cards.add_cards(cards_to_give)
     
     def add_connection_to_active_player(self, connection: Connection) -> None:
         """
@@ -238,7 +271,13 @@ class RefereeGameState:
         
         SIDE EFFECT: Mutates the connections, rails, and colored_card (specifically removes given 
         value of rails from that color key in the dictionary) fields of the active player's PlayerGameState.
+        Marks the connection as owned by the active player in the connection ownership index, and removes it
+        from the index of free connections.
         """
+        self.connection_owners[connection] = self.turn
+        self.free_connections.discard(connection)
+        self.free_connection_index.remove(connection)
+        self.free_connections_snapshot = None
         self.player_game_states[self.turn].connections.add(connection)
         self.player_game_states[self.turn].rails -= connection.length
         self.player_game_states[self.turn].colored_cards[connection.color] -= connection.length
@@ -260,8 +299,15 @@ class RefereeGameState:
         Given the index of a player (used when player is banned), free all of their acquired
         connections by setting its game state's connections to an empty set.
 
-        SIDE EFFECT: Mutates the connections field of the PlayerGameState corresponding to the given index.
-        """
+        SIDE EFFECT: Mutates the connections field of the PlayerGameState corresponding to the given index,
+        and marks each of the released connections as free in the connection ownership index.
+        """
+        for connection in self.player_game_states[player_index].connections:
+            if self.connection_owners.get(connection) == player_index:
+                self.connection_owners[connection] = None
+                self.free_connections.add(connection)
+                self.free_connection_index.add(connection)
+                self.free_connections_snapshot = None
         self.player_game_states[player_index].connections = set()
 
     def on_last_turn(self) -> bool:
@@ -0,0 +1,208 @@
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import sys
+from typing import Deque, Iterator, List, TextIO, Tuple
+
+sys.path.append('../../')
+from Trains.Admin.game_random import derive_rng, get_stream_seed
+from Trains.Admin.referee import NotEnoughDestinations, Referee
+from Trains.Common.map import Destination, Map, get_destination_sort_key
+from Trains.Other.Types.trains_types import GameResult
+from Trains.Other.Util.json_utils import convert_json_map_to_data_map
+from Trains.Player.dynamic_player import DynamicPlayer
+from Trains.Player.player import PlayerInterface
+
+# The strategy files, found relative to this file rather than the working directory.
+STRATEGY_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Player")
+# Number of games each task sent to a worker process plays.
+GAMES_PER_BATCH = 50
+
+# The GameSimulator of a worker process. Set once per worker by initialize_worker.
+worker_simulator = None
+
+
+def get_strategy_path(strategy_name: str) -> str:
+    """
+    Given the name of a strategy (e.g., Buy-Now, Hold-10, Cheat), returns the absolute path of its file.
+    """
+    return os.path.join(STRATEGY_DIRECTORY, strategy_name.lower().replace('-', '_') + '.py')
+
+
+class GameSimulator:
+    """
+    Plays games of Trains between the same players on the same map, entirely in-process and without
+    the tournament manager, for evaluating strategies over many games.
+
+    The map is parsed and searched for feasible destinations once, so games do not re-validate it.
+    Players are created once and reused: the referee sets every player up again at the start of a game.
+    Each game gets its own random stream, derived from the simulation seed and the index of the game,
+    so a game is played the same way no matter which worker plays it or in what order.
+    """
+
+    def __init__(self, game_map: Map, player_instances: List[List[str]], seed: int = 0):
+        """
+        Constructor for a GameSimulator.
+            Parameters:
+                game_map (Map): The map every game is played on
+                player_instances (list): [name, strategy name] of each player, in turn order
+                seed (int): The seed the seed of every game is derived from
+            Throws:
+                NotEnoughDestinations if the map does not have enough destinations for the players
+                ValueError if there are not 2 to 8 players
+        """
+        if len(player_instances) < 2 or len(player_instances) > 8:
+            raise ValueError("Simulations must have [2, 8] players")
+        self.game_map = game_map
+        self.player_instances = player_instances
+        self.seed = seed
+        # Presorted, so referees do not have to sort them to build their destination pools.
+        self.feasible_destinations: Tuple[Destination, ...] = tuple(sorted(
+            game_map.get_feasible_destinations(game_map.connections), key=get_destination_sort_key))
+        if len(self.feasible_destinations) \
+            < Referee.NUM_DESTINATION_OPTIONS + Referee.NUM_DESTINATIONS * (len(player_instances) - 1):
+            raise NotEnoughDestinations("Not enough destinations to give each player 5 to choose from.")
+        self.players = self.create_players()
+
+    def create_players(self) -> List[PlayerInterface]:
+        """
+        Creates the players of the simulation from their names and strategy names. Earlier players are older.
+        """
+        players = []
+        for index, (name, strategy_name) in enumerate(self.player_instances):
+            players.append(DynamicPlayer(name, len(self.player_instances) - index, get_strategy_path(strategy_name)))
+        return players
+
+    def play_game(self, game_index: int) -> dict:
+        """
+        Plays one game of the simulation.
+            Parameters:
+                game_index (int): The index of the game, which its seed is derived from
+            Returns:
+                (dict) The game's result as a JSON object (see get_game_result_as_json)
+        """
+        referee = Referee(self.game_map, list(self.players), feasible_destinations=self.feasible_destinations,
+                          rng=derive_rng(self.seed, game_index))
+        return self.get_game_result_as_json(game_index, get_stream_seed(self.seed, game_index), referee.play_game())
+
+    def play_games(self, first_game_index: int, number_of_games: int) -> List[str]:
+        """
+        Plays consecutive games of the simulation.
+            Parameters:
+                first_game_index (int): The index of the first game
+                number_of_games (int): The number of games to play
+            Returns:
+                (list(str)) The JSON line of each game's result, in order
+        """
+        return [json.dumps(self.play_game(game_index))
+                for game_index in range(first_game_index, first_game_index + number_of_games)]
+
+    @staticmethod
+    def get_game_result_as_json(game_index: int, game_seed: str, game_result: GameResult) -> dict:
+        """
+        Converts the result of a game into a JSON object:
+            {"game": index, "seed": seed, "rankings": [[[name, score], ...], ...], "cheaters": [name, ...]}
+        where rankings go from first place to last place.
+        """
+        game_rankings, cheaters = game_result
+        return {
+            "game": game_index,
+            "seed": game_seed,
+            "rankings": [[[player.name, score] for player, score in rank] for rank in game_rankings],
+            "cheaters": [player.name for player in cheaters]
+        }
+
+
+def initialize_worker(game_map: Map, player_instances: List[List[str]], seed: int) -> None:
+    """
+    Initializes a worker process with its own GameSimulator, so the map is sent to each worker once.
+    """
+    global worker_simulator
+    worker_simulator = GameSimulator(game_map, player_instances, seed)
+
+
+def play_worker_games(first_game_index: int, number_of_games: int) -> List[str]:
+    """
+    Plays consecutive games with the GameSimulator of this worker process.
+    """
+    return worker_simulator.play_games(first_game_index, number_of_games)
+
+
+def simulate_games(game_map: Map, player_instances: List[List[str]], number_of_games: int, seed: int = 0,
+                   workers: int = 1) -> Iterator[str]:
+    """
+    Plays seeded games of Trains between the given players on a map and yields the JSON line of each
+    game's result, in game order, as games finish.
+        Parameters:
+            game_map (Map): The map every game is played on
+            player_instances (list): [name, strategy name] of each player, in turn order
+            number_of_games (int): The number of games to play
+            seed (int): The seed of the simulation
+            workers (int): Number of worker processes to play games in, or 1 to play them in this process
+        Returns:
+            An iterator over the JSON lines of the game results
+        Throws:
+            NotEnoughDestinations if the map does not have enough destinations for the players
+    """
+    simulator = GameSimulator(game_map, player_instances, seed)
+    if workers == 1:
+        return (json.dumps(simulator.play_game(game_index)) for game_index in range(number_of_games))
+    return simulate_games_in_workers(game_map, player_instances, number_of_games, seed, workers)
+
+
+def simulate_games_in_workers(game_map: Map, player_instances: List[List[str]], number_of_games: int, seed: int,
+                              workers: int) -> Iterator[str]:
+    """
+    Plays the games of simulate_games in batches across a pool of worker processes, yielding the
+    results in game order.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker,
+                             initargs=(game_map, player_instances, seed)) as executor:
+        # Keep a bounded number of batches in flight, so results are streamed and memory stays flat.
+        pending: Deque = deque()
+        for batch_start in range(0, number_of_games, GAMES_PER_BATCH):
+            batch_size = min(GAMES_PER_BATCH, number_of_games - batch_start)
+            pending.append(executor.submit(play_worker_games, batch_start, batch_size))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while len(pending) > 0:
+            yield from pending.popleft().result()
+
+
+def write_game_results(result_lines: Iterator[str], output: TextIO) -> int:
+    """
+    Writes JSON lines of game results to an output stream.
+        Returns:
+            (int) The number of results written
+    """
+    number_of_results = 0
+    for result_line in result_lines:
+        output.write(result_line + "\n")
+        number_of_results += 1
+    output.flush()
+    return number_of_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays seeded games of Trains and writes each result as a JSON line.")
+    parser.add_argument("map", help="path of a Map JSON file")
+    parser.add_argument("games", type=int, help="number of games to play")
+    parser.add_argument("strategies", nargs="+", help="strategy of each player in turn order, e.g. Hold-10 Buy-Now")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the simulation")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    arguments = parser.parse_args()
+
+    with open(arguments.map) as map_file:
+        game_map = convert_json_map_to_data_map(json.load(map_file))
+    player_instances = [[f"Player{index + 1}", strategy] for index, strategy in enumerate(arguments.strategies)]
+    try:
+        result_lines = simulate_games(game_map, player_instances, arguments.games, arguments.seed, arguments.workers)
+        write_game_results(result_lines, sys.stdout)
+    except NotEnoughDestinations:
+        sys.stdout.write("\"error: not enough destinations\"")
+
+
+if __name__ == "__main__":
+    main()
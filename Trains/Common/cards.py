@@ -0,0 +1,206 @@
+from collections.abc import Mapping
+import sys
+from typing import Iterable, Iterator, List, Tuple
+
+sys.path.append('../../')
+from Trains.Common.map import Color
+
+# The colors of cards in ordinal order: the color with value v is at index v - 1.
+COLORS_BY_ORDINAL: Tuple[Color, ...] = tuple(sorted(Color, key=lambda color: color.value))
+# The JSON name of each color, in ordinal order.
+COLOR_NAMES_BY_ORDINAL: Tuple[str, ...] = tuple(str(color) for color in COLORS_BY_ORDINAL)
+
+
+def get_color_ordinal(color: Color) -> int:
+    """
+    Returns the index of a color's slot in a Hand and the value a Deck stores a card of the color as.
+    Uses the color's raw value, as Color.value is a (slow) property.
+        Throws:
+            KeyError if color is not a Color
+    """
+    if type(color) != Color:
+        raise KeyError(color)
+    return color._value_ - 1
+
+
+class Hand(Mapping):
+    """
+    A hand of colored cards: the number of cards of each color, kept in a slot per color (indexed by
+    color ordinal) along with the total number of cards, so counting the cards of a color or of the
+    whole hand takes constant time and adding cards allocates nothing.
+
+    A Hand is a mapping from every Color to its number of cards (0 for colors the hand has none of),
+    so it can be used anywhere the dict[Color, int] hands used to be. It compares equal to a mapping
+    with the same counts, treating colors missing from the mapping as 0.
+    """
+    __slots__ = ("counts", "total")
+
+    def __init__(self, cards: Mapping = None):
+        """
+        Constructor for a Hand.
+            Parameters:
+                cards (mapping(Color, int)): The number of cards of each color, or None for an empty hand
+            Throws:
+                ValueError:
+                    - Cards must be keyed by Color
+                    - The number of cards of a color cannot be negative
+        """
+        self.counts: List[int] = [0] * len(COLORS_BY_ORDINAL)
+        self.total = 0
+        if cards is not None:
+            for color, number_of_cards in cards.items():
+                if type(color) != Color:
+                    raise ValueError("Cards must be keyed by Color")
+                if number_of_cards < 0:
+                    raise ValueError("The number of cards for a color cannot be negative")
+                self[color] = number_of_cards
+
+    def __getitem__(self, color: Color) -> int:
+        return self.counts[get_color_ordinal(color)]
+
+    def __setitem__(self, color: Color, number_of_cards: int) -> None:
+        ordinal = get_color_ordinal(color)
+        self.total += number_of_cards - self.counts[ordinal]
+        self.counts[ordinal] = number_of_cards
+
+    def __iter__(self) -> Iterator[Color]:
+        return iter(COLORS_BY_ORDINAL)
+
+    def __len__(self) -> int:
+        return len(COLORS_BY_ORDINAL)
+
+    def __contains__(self, color) -> bool:
+        return type(color) == Color
+
+    def __eq__(self, other) -> bool:
+        if type(other) == Hand:
+            return self.counts == other.counts
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if any(type(color) != Color for color in other):
+            return False
+        return all(self.counts[ordinal] == other.get(color, 0) for ordinal, color in enumerate(COLORS_BY_ORDINAL))
+
+    def __repr__(self) -> str:
+        return f"Hand({ {color: self.counts[ordinal] for ordinal, color in enumerate(COLORS_BY_ORDINAL)} })"
+
+    def __copy__(self) -> "Hand":
+        hand = Hand()
+        hand.counts = list(self.counts)
+        hand.total = self.total
+        return hand
+
+    def __deepcopy__(self, memo: dict) -> "Hand":
+        return self.__copy__()
+
+    def copy(self) -> "Hand":
+        return self.__copy__()
+
+    def add_cards(self, cards: Iterable[Color]) -> None:
+        """
+        Adds cards to the hand.
+            Parameters:
+                cards (iterable(Color)): The cards to add
+        """
+        counts = self.counts
+        number_of_cards = 0
+        for card in cards:
+            counts[get_color_ordinal(card)] += 1
+            number_of_cards += 1
+        self.total += number_of_cards
+
+    def get_total(self) -> int:
+        """
+        Returns the number of cards in the hand.
+        """
+        return self.total
+
+    def get_as_json(self) -> dict:
+        """
+        Returns the hand as a JSON Card* object, e.g. {"red": 4, "blue": 5, "green": 0, "white": 3}.
+        """
+        return dict(zip(COLOR_NAMES_BY_ORDINAL, self.counts))
+
+
+class Deck:
+    """
+    A deck of colored cards, stored as one byte per card (the ordinal of its color) with the top of the
+    deck at the end, so copying a deck for a game is a single buffer copy and drawing cards does not
+    allocate a node per card the way a deque of Color does.
+
+    Iterating a deck goes from the bottom card to the top card. A deck compares equal to any sequence
+    (e.g. a deque or list) of the same colors in the same order.
+    """
+    __slots__ = ("cards",)
+
+    def __init__(self, cards: Iterable[Color] = ()):
+        """
+        Constructor for a Deck.
+            Parameters:
+                cards (iterable(Color)): The cards from the bottom of the deck to the top
+            Throws:
+                ValueError if a card is not a Color
+        """
+        if type(cards) == Deck:
+            self.cards = bytearray(cards.cards)
+            return
+        try:
+            self.cards = bytearray(get_color_ordinal(card) for card in cards)
+        except KeyError:
+            raise ValueError("Every card in a deck must be a Color")
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __iter__(self) -> Iterator[Color]:
+        return (COLORS_BY_ORDINAL[ordinal] for ordinal in self.cards)
+
+    def __eq__(self, other) -> bool:
+        if type(other) == Deck:
+            return self.cards == other.cards
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Deck({list(self)})"
+
+    def __copy__(self) -> "Deck":
+        return Deck(self)
+
+    def __deepcopy__(self, memo: dict) -> "Deck":
+        return Deck(self)
+
+    def append(self, card: Color) -> None:
+        """
+        Puts a card on top of the deck.
+        """
+        self.cards.append(get_color_ordinal(card))
+
+    def pop(self) -> Color:
+        """
+        Removes and returns the card on top of the deck.
+            Throws:
+                IndexError if the deck is empty
+        """
+        return COLORS_BY_ORDINAL[self.cards.pop()]
+
+    def draw(self, number_of_cards: int) -> List[Color]:
+        """
+        Removes and returns up to number_of_cards cards from the top of the deck, in the order they are drawn.
+            Returns:
+                (list(Color)) The cards drawn ([] if the deck is empty)
+        """
+        number_of_cards = min(number_of_cards, len(self.cards))
+        if number_of_cards <= 0:
+            return []
+        drawn = self.cards[-number_of_cards:]
+        del self.cards[-number_of_cards:]
+        return [COLORS_BY_ORDINAL[ordinal] for ordinal in reversed(drawn)]
+
+    def get_as_json(self) -> List[str]:
+        """
+        Returns the deck as a JSON Card+ array of color names, from the bottom card to the top card.
+        """
+        return [COLOR_NAMES_BY_ORDINAL[ordinal] for ordinal in self.cards]
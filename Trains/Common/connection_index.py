@@ -0,0 +1,125 @@
+from bisect import bisect_left
+import sys
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+sys.path.append('../../')
+from Trains.Common.map import Color, Connection, get_connection_sort_key
+
+# A (color, length) pair. Every connection of a pair is acquirable with the same cards and rails.
+BucketKey = Tuple[Color, int]
+
+
+class AcquirableConnectionIndex:
+    """
+    Indexes unacquired connections by (color, length), keeping the connections of each pair in lexicographic
+    order. Whether a player can acquire a connection only depends on its color and length, so the connections
+    a player can acquire are whole buckets, and the first of them in lexicographic order is the smallest of
+    the heads of those buckets. With 4 colors and lengths 3, 4, and 5 that is at most 12 heads, no matter
+    how many connections the map has.
+
+    A referee game state keeps one index of its free connections, and each strategy keeps one that it syncs
+    with the unacquired connections of its game state.
+    """
+
+    def __init__(self, connections: Iterable[Connection] = ()):
+        """
+        Constructor for an AcquirableConnectionIndex.
+            Parameters:
+                connections (iterable(Connection)): The unacquired connections
+        """
+        self.connections: Set[Connection] = set()
+        # The connections of each non-empty bucket in lexicographic order, and their sort keys in the same order.
+        self.buckets: Dict[BucketKey, List[Connection]] = {}
+        self.bucket_sort_keys: Dict[BucketKey, List[tuple]] = {}
+        # The frozen set last synced with (see sync), so syncing with it again does nothing.
+        self.synced_connections: Optional[frozenset] = None
+        for connection in sorted(set(connections), key=get_connection_sort_key):
+            self.connections.add(connection)
+            bucket_key = (connection.color, connection.length)
+            self.buckets.setdefault(bucket_key, []).append(connection)
+            self.bucket_sort_keys.setdefault(bucket_key, []).append(connection.sort_key)
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def __contains__(self, connection: Connection) -> bool:
+        return connection in self.connections
+
+    def add(self, connection: Connection) -> None:
+        """
+        Adds an unacquired connection (e.g. one released by a banned player), ignoring connections already in the index.
+        """
+        if connection in self.connections:
+            return
+        self.connections.add(connection)
+        bucket_key = (connection.color, connection.length)
+        sort_keys = self.bucket_sort_keys.setdefault(bucket_key, [])
+        index = bisect_left(sort_keys, connection.sort_key)
+        sort_keys.insert(index, connection.sort_key)
+        self.buckets.setdefault(bucket_key, []).insert(index, connection)
+
+    def remove(self, connection: Connection) -> None:
+        """
+        Removes an acquired connection, ignoring connections not in the index.
+        """
+        if connection not in self.connections:
+            return
+        self.connections.remove(connection)
+        bucket_key = (connection.color, connection.length)
+        sort_keys = self.bucket_sort_keys[bucket_key]
+        if len(sort_keys) == 1:
+            del self.bucket_sort_keys[bucket_key]
+            del self.buckets[bucket_key]
+            return
+        index = bisect_left(sort_keys, connection.sort_key)
+        del sort_keys[index]
+        del self.buckets[bucket_key][index]
+
+    def sync(self, unacquired_connections: Iterable[Connection]) -> None:
+        """
+        Adds and removes connections so the index holds exactly the given unacquired connections. Syncing with
+        the same frozen set as last time (e.g. the referee's snapshot on turns where no connection changed hands)
+        does nothing.
+            Parameters:
+                unacquired_connections (iterable(Connection)): The connections no player has acquired
+        """
+        if unacquired_connections is self.synced_connections:
+            return
+        connection_set = unacquired_connections if type(unacquired_connections) in (set, frozenset) \
+            else set(unacquired_connections)
+        for connection in self.connections - connection_set:
+            self.remove(connection)
+        for connection in connection_set - self.connections:
+            self.add(connection)
+        self.synced_connections = connection_set if type(connection_set) == frozenset else None
+
+    def get_first_acquirable_connection(self, colored_cards: Mapping[Color, int], rails: int) -> Optional[Connection]:
+        """
+        Gets the lexicographically first connection that can be acquired with the given cards and rails.
+            Parameters:
+                colored_cards (mapping(Color, int)): The number of cards of each color
+                rails (int): The number of rails
+            Returns:
+                The first acquirable connection, or None if none can be acquired
+        """
+        first_connection = None
+        for (color, length), bucket in self.buckets.items():
+            if length <= rails and colored_cards[color] >= length \
+                    and (first_connection is None or bucket[0].sort_key < first_connection.sort_key):
+                first_connection = bucket[0]
+        return first_connection
+
+    def get_acquirable_connections(self, colored_cards: Mapping[Color, int], rails: int) -> Set[Connection]:
+        """
+        Gets every connection that can be acquired with the given cards and rails.
+            Parameters:
+                colored_cards (mapping(Color, int)): The number of cards of each color
+                rails (int): The number of rails
+            Returns:
+                Set of acquirable connections
+        """
+        acquirable_connections = set()
+        for (color, length), bucket in self.buckets.items():
+            if length <= rails and colored_cards[color] >= length:
+                acquirable_connections.update(bucket)
+        return acquirable_connections
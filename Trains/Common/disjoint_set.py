@@ -0,0 +1,107 @@
+from typing import Dict, Generic, Hashable, Iterable, List, TypeVar
+
+Element = TypeVar("Element", bound=Hashable)
+
+
+class DisjointSet(Generic[Element]):
+    """
+    A disjoint-set (union-find) structure over hashable elements, such as the cities of a map.
+    Elements start out in a set of their own and union merges the sets of two elements. Uses union
+    by size and path halving, so find, union and connected take near constant amortized time.
+
+    Elements that have never been added are treated as being in a set of their own.
+    """
+
+    def __init__(self, elements: Iterable[Element] = ()):
+        """
+        Constructor for a DisjointSet.
+            Parameters:
+                elements (iterable): Elements to start out in sets of their own
+        """
+        self.parents: Dict[Element, Element] = {}
+        # Number of elements in the set of each root element
+        self.sizes: Dict[Element, int] = {}
+        for element in elements:
+            self.add(element)
+
+    def add(self, element: Element) -> None:
+        """
+        Adds an element in a set of its own, if it has not been added already.
+            Parameters:
+                element (Element): The element to add
+        """
+        if element not in self.parents:
+            self.parents[element] = element
+            self.sizes[element] = 1
+
+    def find(self, element: Element) -> Element:
+        """
+        Returns the root element of the set containing an element.
+            Parameters:
+                element (Element): The element to find the set of
+            Returns:
+                The root element of its set, which is the element itself if it has not been added
+        """
+        parents = self.parents
+        if element not in parents:
+            return element
+        while parents[element] != element:
+            parents[element] = parents[parents[element]]
+            element = parents[element]
+        return element
+
+    def union(self, element1: Element, element2: Element) -> None:
+        """
+        Merges the sets containing two elements, adding the elements first if needed.
+            Parameters:
+                element1 (Element): An element of the first set
+                element2 (Element): An element of the second set
+        """
+        self.add(element1)
+        self.add(element2)
+        root1, root2 = self.find(element1), self.find(element2)
+        if root1 == root2:
+            return
+        if self.sizes[root1] < self.sizes[root2]:
+            root1, root2 = root2, root1
+        self.parents[root2] = root1
+        self.sizes[root1] += self.sizes.pop(root2)
+
+    def connected(self, element1: Element, element2: Element) -> bool:
+        """
+        Determines if two elements are in the same set.
+            Parameters:
+                element1 (Element): The first element
+                element2 (Element): The second element
+            Returns:
+                True if the elements are in the same set, else False
+        """
+        return self.find(element1) == self.find(element2)
+
+    def get_set_sizes(self) -> List[int]:
+        """
+        Returns the number of elements in each set.
+            Returns:
+                (list(int)) The size of every set
+        """
+        return list(self.sizes.values())
+
+    def count_connected_pairs(self) -> int:
+        """
+        Counts the unordered pairs of distinct elements that are in the same set, without
+        enumerating them.
+            Returns:
+                (int) The number of connected pairs
+        """
+        return sum(size * (size - 1) // 2 for size in self.sizes.values())
+
+    def get_sets(self) -> List[List[Element]]:
+        """
+        Returns the elements of each set.
+            Returns:
+                (list(list(Element))) The elements of every set
+        """
+        sets: Dict[Element, List[Element]] = {}
+        for element in self.parents:
+            sets.setdefault(self.find(element), []).append(element)
+        return list(sets.values())
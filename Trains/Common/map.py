@@ -1,9 +1,12 @@
 from enum import Enum
-from copy import deepcopy
-from dataclasses import dataclass
+from copy import copy
+from dataclasses import dataclass, field
 from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
 import json
 
+from Trains.Common.disjoint_set import DisjointSet
+
 
 # TODO: Color values should be a string
 class Color(Enum):
@@ -16,14 +19,7 @@ class Color(Enum):
     WHITE = 4
 
     def __str__(self):
-        COLOR_TABLE = {
-            Color.BLUE: "blue",
-            Color.GREEN: "green",
-            Color.RED: "red",
-            Color.WHITE: "white"
-        }
-
-        return COLOR_TABLE[self]
+        return COLOR_NAMES[self]
 
     def lexicographic_ordering(color):
         """
@@ -31,19 +27,27 @@ class Color(Enum):
         Parameters:
                 color (Color): color to get ordering of
         """
-        COLOR_TABLE = {
-            Color.BLUE: 0,
-            Color.GREEN: 1,
-            Color.RED: 2,
-            Color.WHITE: 3
-        }
-
-        return COLOR_TABLE[color]
+        return COLOR_LEXICOGRAPHIC_ORDER[color]
 
     def number_of_colors():
         return len(Color)
 
 
+# Built once rather than on every call, as colors are converted and compared on every turn.
+COLOR_NAMES = {
+    Color.BLUE: "blue",
+    Color.GREEN: "green",
+    Color.RED: "red",
+    Color.WHITE: "white"
+}
+COLOR_LEXICOGRAPHIC_ORDER = {
+    Color.BLUE: 0,
+    Color.GREEN: 1,
+    Color.RED: 2,
+    Color.WHITE: 3
+}
+
+
 @dataclass(frozen=True)
 class City:
     """
@@ -84,10 +88,16 @@ class Connection:
     """
     Represents a connection by the cities connected, color, and length
     Cities must be 2 distinct cities
+
+    The lexicographic sort key and the hash of a connection are computed once, on construction, as
+    strategies sort and look up connections on every turn.
     """
     cities: set
     color: Color
     length: int
+    # (first city name, second city name, length, color order), see __lt__
+    sort_key: tuple = field(init=False, repr=False, compare=False)
+    hash_value: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """
@@ -114,33 +124,33 @@ class Connection:
         if self.length not in [3, 4, 5]:
             raise ValueError("Length must be one of [3, 4, 5]")
 
+        first_name, second_name = sorted(city.name for city in self.cities)
+        object.__setattr__(self, "sort_key",
+            (first_name, second_name, self.length, Color.lexicographic_ordering(self.color)))
+        object.__setattr__(self, "hash_value", hash((self.cities, self.color, self.length)))
+
+    def __hash__(self):
+        return self.hash_value
+
+    def __reduce__(self):
+        """
+        Pickles a connection by its fields, so its hash is computed again by the process that unpickles it
+        (string hashes differ between processes).
+        """
+        return (Connection, (self.cities, self.color, self.length))
+
     def __lt__(self, obj):
         """
         Special method for the 'less than' operator when comparing two Connections.
+        Connections are ordered by their first city name, then their second city name, then length,
+        and then the lexicographic order of their color (see sort_key).
             Parameters:
                 self (Connection): The first connection
                 obj (Connection): The second connection
             Returns:
                 -1 if the first connection (self) is less than the other connection (obj), 1 Otherwise
         """
-
-        list_self = list(self.cities)
-        if list_self[1].name < list_self[0].name:
-            list_self[0], list_self[1] = list_self[1], list_self[0]
-        list_obj = list(obj.cities)
-        if list_obj[1].name < list_obj[0].name:
-            list_obj[0], list_obj[1] = list_obj[1], list_obj[0]
-
-        if list_self[0].name < list_obj[0].name:
-            return -1
-        elif list_self[0].name == list_obj[0].name and list_self[1].name < list_obj[1].name:
-            return -1
-        elif list_self[0].name == list_obj[0].name and list_self[1].name == list_obj[
-            1].name and self.length < obj.length:
-            return -1
-        elif list_self[0].name == list_obj[0].name and list_self[1].name == list_obj[
-            1].name and self.length == obj.length and Color.lexicographic_ordering(
-                self.color) < Color.lexicographic_ordering(obj.color):
+        if self.sort_key < obj.sort_key:
             return -1
         else:
             return 1
@@ -199,26 +209,20 @@ class Destination(frozenset):
             for city in cities:
                 if type(city) is not City:
                     raise ValueError("Destinations must contain cities")
+        # (first city name, second city name), see __lt__
+        self.sort_key = tuple(sorted(city.name for city in self))
 
     def __lt__(self, obj):
         """
         Special method for the 'less than' operator when comparing two Destinations.
+        Destinations are ordered by their first city name and then their second city name (see sort_key).
             Parameters:
                 self (Destination): The first destination
                 obj (Destination): The second destination
             Returns:
                 -1 if the first destination (self) is less than the other destination (obj), 1 Otherwise
         """
-        list_self = list(self)
-        if list_self[1].name < list_self[0].name:
-            list_self[0], list_self[1] = list_self[1], list_self[0]
-        list_obj = list(obj)
-        if list_obj[1].name < list_obj[0].name:
-            list_obj[0], list_obj[1] = list_obj[1], list_obj[0]
-
-        if list_self[0].name < list_obj[0].name:
-            return -1
-        elif list_self[0].name == list_obj[0].name and list_self[1].name < list_obj[1].name:
+        if self.sort_key < obj.sort_key:
             return -1
         else:
             return 1
@@ -236,12 +240,141 @@ class Destination(frozenset):
         return city_json
 
 
+def get_connection_sort_key(connection: Connection) -> tuple:
+    """
+    Returns the lexicographic sort key of a connection, to sort connections by.
+    """
+    return connection.sort_key
+
+
+def get_destination_sort_key(destination: Destination) -> tuple:
+    """
+    Returns the lexicographic sort key of a destination, to sort destinations by.
+    """
+    return destination.sort_key
+
+
+# For each city, the cities it has connections to and the connections between them.
+AdjacencyIndex = Dict[City, Dict[City, Set[Connection]]]
+# The connections of each (color, length) pair.
+ColorLengthIndex = Dict[Tuple[Color, int], Set[Connection]]
+
+
+def build_adjacency_index(connections: Iterable[Connection]) -> AdjacencyIndex:
+    """
+    Builds an index of the neighbors of every city in the given connections.
+        Parameters:
+            connections (iterable(Connection)): The connections to index
+        Returns:
+            (AdjacencyIndex) For each city with a connection, the cities it is connected to and
+            the connections between them
+    """
+    adjacency_index = {}
+    for connection in connections:
+        city1, city2 = connection.cities
+        adjacency_index.setdefault(city1, {}).setdefault(city2, set()).add(connection)
+        adjacency_index.setdefault(city2, {}).setdefault(city1, set()).add(connection)
+    return adjacency_index
+
+
+def build_color_length_index(connections: Iterable[Connection]) -> ColorLengthIndex:
+    """
+    Groups the given connections by their color and length.
+        Parameters:
+            connections (iterable(Connection)): The connections to index
+        Returns:
+            (ColorLengthIndex) The connections of each (color, length) pair that has any
+    """
+    color_length_index = {}
+    for connection in connections:
+        color_length_index.setdefault((connection.color, connection.length), set()).add(connection)
+    return color_length_index
+
+
+class AdjacencyView:
+    """
+    A read-only view of the neighbors of cities in an AdjacencyIndex, optionally restricted to a subset
+    of the indexed connections (e.g. the connections a player owns). The view shares the index it is
+    given and does not copy it, so creating one is O(1).
+    """
+
+    def __init__(self, adjacency_index: AdjacencyIndex, connections: Set[Connection] = None):
+        """
+        Constructor for an AdjacencyView.
+            Parameters:
+                adjacency_index (AdjacencyIndex): The index to view
+                connections (set(Connection)): The indexed connections that are part of the view, or
+                                               None if all of them are
+        """
+        self.adjacency_index = adjacency_index
+        self.connections = connections
+
+    def get_neighbors(self, city: City) -> List[City]:
+        """
+        Returns the cities connected to a city by a connection in this view.
+            Parameters:
+                city (City): The city to get the neighbors of
+            Returns:
+                (list(City)) The neighbors of the city
+        """
+        city_neighbors = self.adjacency_index.get(city, {})
+        if self.connections is None:
+            return list(city_neighbors)
+        return [neighbor for neighbor, between in city_neighbors.items() if not between.isdisjoint(self.connections)]
+
+    def get_reachable_cities(self, city: City) -> List[City]:
+        """
+        Finds the cities that can be reached from a city by connections in this view with a
+        breadth first search. Visits each city and connection at most once.
+            Parameters:
+                city (City): The starting city
+            Returns:
+                (list(City)) The reachable cities, including the starting city, in the order visited
+        """
+        visited = {city}
+        visit_order = [city]
+        visit_q = deque([city])
+        while len(visit_q) > 0:
+            current_city = visit_q.popleft()
+            for neighbor in self.get_neighbors(current_city):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    visit_order.append(neighbor)
+                    visit_q.append(neighbor)
+        return visit_order
+
+
+def build_connectivity(connections: Iterable[Connection]) -> DisjointSet:
+    """
+    Builds a DisjointSet of the cities in the given connections, where cities are in the same set
+    if there is a path between them.
+        Parameters:
+            connections (iterable(Connection)): The connections joining cities
+        Returns:
+            (DisjointSet) The connected components of the cities
+    """
+    connectivity = DisjointSet()
+    for connection in connections:
+        city1, city2 = connection.cities
+        connectivity.union(city1, city2)
+    return connectivity
+
+
 class Map:
     """
     Represents the game map for a game of trains. A master map object
     should be held by the Referee and a deep copy of the map should be
     passed to players to prevent tampering. A map also has a width and height,
     which represent its display size.
+
+    Cities and connections are frozen dataclasses, and the map keeps them in frozensets that are
+    made when it is constructed, so the accessors below share them rather than copy them and callers
+    cannot tamper with the map through them.
+
+    The neighbors of every city are indexed when the map is constructed (see AdjacencyView), so
+    reachability and JSON queries take time linear in the size of the map. Feasible destinations
+    are computed from the connected components of the map (see get_connectivity). A map cannot
+    change once constructed, so its indexes never have to be rebuilt.
     """
 
     def __init__(self, cities: set, connections: set, height: int = 800, width: int = 800):
@@ -266,10 +399,92 @@ class Map:
                 if city not in cities:
                     raise ValueError("Cities in connections must be in cities set")
 
-        self.cities = cities
-        self.connections = connections
+        self.cities = frozenset(cities)
+        self.connections = frozenset(connections)
         self.height = height
         self.width = width
+        self.adjacency_index = build_adjacency_index(self.connections)
+        self.color_length_index = build_color_length_index(self.connections)
+        # Connected components of the map's connections, built when first needed.
+        self.connectivity = None
+        # The map's connections in lexicographic order, built when first needed.
+        self.sorted_connections = None
+
+    def is_map_connections(self, connections: Set[Connection]) -> bool:
+        """
+        Determines if a set of connections is the set of all connections on the map.
+            Parameters:
+                connections (set(Connection)): The connections to check
+            Returns:
+                True if they are all of the map's connections, else False
+        """
+        return connections is self.connections or connections == self.connections
+
+    def get_adjacency_view(self, connections: Set[Connection]) -> AdjacencyView:
+        """
+        Returns a view of the neighbors of cities using only the given connections. Views of the map's
+        connections, or of a subset of them such as a player's connections, share the map's index.
+            Parameters:
+                connections (set(Connection)): The connections to view
+            Returns:
+                (AdjacencyView) View of the given connections
+        """
+        if self.is_map_connections(connections):
+            return AdjacencyView(self.adjacency_index)
+        if self.connections.issuperset(connections):
+            return AdjacencyView(self.adjacency_index, connections)
+        return AdjacencyView(build_adjacency_index(connections))
+
+    def get_connectivity(self, connections: Set[Connection]) -> DisjointSet:
+        """
+        Returns the connected components of the cities in the given connections as a DisjointSet.
+        The components of the map's own connections are computed once and reused.
+            Parameters:
+                connections (set(Connection)): The connections joining cities
+            Returns:
+                (DisjointSet) The cities of the connections, in sets of connected cities
+        """
+        is_map_connections = self.is_map_connections(connections)
+        if is_map_connections and self.connectivity is not None:
+            return self.connectivity
+        connectivity = build_connectivity(connections)
+        if is_map_connections:
+            self.connectivity = connectivity
+        return connectivity
+
+    def are_connected(self, city1: City, city2: City, connections: Set[Connection]) -> bool:
+        """
+        Determines if there is a path between two cities using the given connections.
+            Parameters:
+                city1 (City): The first city
+                city2 (City): The second city
+                connections (set(Connection)): The connections that can be used
+            Returns:
+                True if the cities are distinct and connected, else False
+        """
+        return city1 != city2 and self.get_connectivity(connections).connected(city1, city2)
+
+    def count_feasible_destinations(self, connections: Set[Connection]) -> int:
+        """
+        Counts the feasible destinations of a set of map connections without creating them. Every pair
+        of cities in a connected component is a destination.
+            Parameters:
+                connections (set(Connection)): The connections that can be used
+            Returns:
+                (int) The number of feasible destinations
+        """
+        return self.get_connectivity(connections).count_connected_pairs()
+
+    def get_connections_with_color_and_length(self, color: Color, length: int) -> Set[Connection]:
+        """
+        Returns the connections on the map with the given color and length.
+            Parameters:
+                color (Color): The color of the connections
+                length (int): The length of the connections
+            Returns:
+                (set(Connection)) The connections with the color and length
+        """
+        return set(self.color_length_index.get((color, length), set()))
 
     def __eq__(self, obj):
         """
@@ -283,12 +498,13 @@ class Map:
 
     def get_copy_of_map(self):
         """
-        Returns a deep copy of the map for players to construct their
-        game map.
+        Returns a copy of the map for players to construct their
+        game map. The copy shares the map's frozensets of cities and connections and its indexes,
+        so it is made in O(1) and cannot be modified.
                 Returns
                     map (Map): Copy of the map
         """
-        return deepcopy(self)
+        return copy(self)
 
     def get_city_names(self):
         """
@@ -312,19 +528,30 @@ class Map:
 
     def get_all_cities(self):
         """
-        Returns all the cities on the map as a set
+        Returns all the cities on the map as a frozenset, which is shared rather than copied.
                 Returns
-                    (set): All cities on the map as a set
+                    (frozenset): All cities on the map as a set
         """
-        return deepcopy(self.cities)
+        return self.cities
 
     def get_all_connections(self):
         """
-        Returns all the connections on the map as a set
+        Returns all the connections on the map as a frozenset, which is shared rather than copied.
                 Returns
-                    (set): All connections on the map as a set
+                    (frozenset): All connections on the map as a set
         """
-        return deepcopy(self.connections)
+        return self.connections
+
+    def get_sorted_connections(self) -> Tuple[Connection, ...]:
+        """
+        Returns all the connections on the map in lexicographic order (see Connection.__lt__). The order
+        is sorted once and shared.
+                Returns
+                    (tuple(Connection)): All connections on the map in lexicographic order
+        """
+        if self.sorted_connections is None:
+            self.sorted_connections = tuple(sorted(self.connections, key=get_connection_sort_key))
+        return self.sorted_connections
 
     def get_feasible_destinations(self, connections: set):
         """
@@ -336,14 +563,21 @@ class Map:
                 Returns
                     (set(Destination)): All possible destinations
         """
-        starting_cities = self.get_cities_from_connections(connections)
-        destinations = set()
-        for city in starting_cities:
-            terminal_cities = self.get_all_terminal_cities_from_city(city, connections)
-            for terminal_city in terminal_cities:
-                destinations.add(Destination({city, terminal_city}))
+        return set(self.generate_feasible_destinations(connections))
 
-        return destinations
+    def generate_feasible_destinations(self, connections: set) -> Iterator[Destination]:
+        """
+        Generates the feasible destinations of a set of map connections one component at a time,
+        without storing them.
+                Parameters:
+                    connections (set(Connection)): set of connections on map
+                Returns
+                    (iterator(Destination)): Every feasible destination, once
+        """
+        for component in self.get_connectivity(connections).get_sets():
+            for index, city in enumerate(component):
+                for terminal_city in component[index + 1:]:
+                    yield Destination({city, terminal_city})
 
     def get_all_terminal_cities_from_city(self, city: City, connections: set):
         """
@@ -355,23 +589,8 @@ class Map:
             Returns:
                 a list of cities (list(City))
         """
-        visit_q = deque()
-        visit_q.append(city)
-        visited = []
-        all_connection_cities = [connection.cities for connection in connections]
-
-        while len(visit_q) > 0:
-            current_city = visit_q.popleft()
-            visited.append(current_city)
-
-            for connection_cities in all_connection_cities:
-                if current_city in connection_cities:
-                    for neighbor in connection_cities:
-                        if neighbor not in visited:
-                            visit_q.append(neighbor)
-
-        visited.remove(city)
-        return visited
+        reachable_cities = self.get_adjacency_view(connections).get_reachable_cities(city)
+        return reachable_cities[1:]
 
     def get_as_json(self):
         """
@@ -421,12 +640,10 @@ class Map:
                 city (City): City that needs its connections added to map_connections.
                 added_connections(set(Connections)): Set of connections that have already been added to map_connections.
         """
-        for connection in self.connections:
-            if city in connection.cities and connection not in added_connections:
-                other_city = None
-                for connection_city in connection.cities:
-                    if city != connection_city:
-                        other_city = connection_city
+        for other_city, city_connections in self.adjacency_index.get(city, {}).items():
+            for connection in city_connections:
+                if connection in added_connections:
+                    continue
 
                 if city.name not in map_connections.keys():
                     map_connections[city.name] = {}
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 import sys
 import json
 sys.path.append('../../')
-from Trains.Common.map import Color
+from Trains.Common.cards import Hand
 
 
 @dataclass
@@ -14,7 +14,7 @@ class PlayerGameState:
     and opponent info (other player's connections).
         Parameters:
             connections (set): Set of a player's connections
-            colored_cards (dict): Dictionary of a player's colored cards
+            colored_cards (Hand): A player's colored cards (a dict of Color to count is converted to a Hand)
             rails (int): The number of rail segments a player has
             destinations (set): A set of a player's 2 destinations
             game_info (dict): A dictionary that tracks unacquired connections, the number of cards left 
@@ -23,7 +23,7 @@ class PlayerGameState:
                                   the number of cards in their hand.
     """
     connections: set
-    colored_cards: dict
+    colored_cards: Hand
     rails: int
     destinations: set
     game_info: dict
@@ -35,7 +35,7 @@ class PlayerGameState:
             Throws:
                 ValueError:
                     - Connections must be a set
-                    - Colored cards must be a dictionary
+                    - Colored cards must be a Hand or a dictionary
                     - Player game state must have 0 or more of a certain colored card
                     - Player game state must have 0 or more rails
                     - Destination must be a set
@@ -43,12 +43,11 @@ class PlayerGameState:
         """
         if type(self.connections) != set:
             raise ValueError("Connections must be a set")
-        if type(self.colored_cards) != dict:
-            raise ValueError("Colored cards must be a dictionary")
-        else:
-            for num in self.colored_cards.values():
-                if num < 0:
-                    raise ValueError("The number of cards for a color cannot be negative")
+        if type(self.colored_cards) == dict:
+            # Throws a ValueError if a count is negative
+            self.colored_cards = Hand(self.colored_cards)
+        elif type(self.colored_cards) != Hand:
+            raise ValueError("Colored cards must be a Hand or a dictionary")
         if self.rails < 0:
             raise ValueError("Player must have 0 or more rails")
         if type(self.destinations) != set:
@@ -68,10 +67,7 @@ class PlayerGameState:
             Returns:
                 total (int): The total number of colored cards in the player game state
         """
-        total = 0
-        for num in self.colored_cards.values():
-            total += num
-        return total
+        return self.colored_cards.get_total()
 
     def get_as_json(self):
         """
@@ -140,10 +136,7 @@ class PlayerGameState:
             this_player_json[f"destination{current_destination}"] = destination.get_as_json()
             current_destination += 1
 
-        colored_cards_dict = {}
-        for color_key in self.colored_cards.keys():
-            colored_cards_dict[color_key.__str__()] = self.colored_cards[color_key]
-        this_player_json["cards"] = colored_cards_dict
+        this_player_json["cards"] = self.colored_cards.get_as_json()
 
         this_player_json["acquired"] = []
         for connection in self.connections:
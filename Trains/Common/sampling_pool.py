@@ -0,0 +1,73 @@
+from typing import Dict, Generic, Hashable, Iterable, Iterator, List, Set, TypeVar
+
+Element = TypeVar("Element", bound=Hashable)
+
+
+class SamplingPool(Generic[Element]):
+    """
+    A pool of distinct hashable elements, such as the destinations that have not been chosen yet,
+    that random samples are drawn from. Elements are kept in an array with the index of each element,
+    so drawing an element and removing an element (by swapping it with the last element) both take
+    constant time no matter how big the pool is.
+
+    Sampling does not remove elements from the pool. Which elements are sampled only depends on the
+    order the elements were given in and the random numbers drawn.
+    """
+
+    def __init__(self, elements: Iterable[Element] = ()):
+        """
+        Constructor for a SamplingPool.
+            Parameters:
+                elements (iterable): The distinct elements in the pool, in the order to sample them from
+        """
+        self.elements: List[Element] = list(elements)
+        self.indices: Dict[Element, int] = {element: index for index, element in enumerate(self.elements)}
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __contains__(self, element: Element) -> bool:
+        return element in self.indices
+
+    def __iter__(self) -> Iterator[Element]:
+        return iter(self.elements)
+
+    def sample(self, number_of_elements: int, rng) -> Set[Element]:
+        """
+        Draws distinct elements from the pool at random, or every element if there are not enough.
+            Parameters:
+                number_of_elements (int): The number of elements to draw
+                rng (random.Random): The generator to draw random numbers from
+            Returns:
+                (set(Element)) The elements drawn
+        """
+        # Partial Fisher-Yates shuffle: move each drawn element to the end of the undrawn elements.
+        last_undrawn_index = len(self.elements)
+        for _ in range(min(number_of_elements, len(self.elements))):
+            last_undrawn_index -= 1
+            self.swap(rng.randint(0, last_undrawn_index), last_undrawn_index)
+        return set(self.elements[last_undrawn_index:])
+
+    def swap(self, index1: int, index2: int) -> None:
+        """
+        Swaps the elements at two indices of the pool.
+        """
+        elements = self.elements
+        elements[index1], elements[index2] = elements[index2], elements[index1]
+        self.indices[elements[index1]] = index1
+        self.indices[elements[index2]] = index2
+
+    def remove(self, elements: Iterable[Element]) -> None:
+        """
+        Removes elements from the pool, ignoring elements that are not in it.
+            Parameters:
+                elements (iterable): The elements to remove
+        """
+        for element in elements:
+            index = self.indices.pop(element, None)
+            if index is None:
+                continue
+            last_element = self.elements.pop()
+            if index < len(self.elements):
+                self.elements[index] = last_element
+                self.indices[last_element] = index
@@ -0,0 +1,255 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import timeit
+from collections import deque
+from typing import Callable, Dict, List
+
+sys.path.append('../../../')
+from Trains.Admin.referee import Referee
+from Trains.Admin.referee_game_state import RefereeGameState
+from Trains.Admin.simulation import get_strategy_path
+from Trains.Common.map import Color, Destination, Map, get_connection_sort_key
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Other.Benchmarks.random_maps import generate_random_map, sample_connections
+from Trains.Other.Util.json_utils import convert_json_map_to_data_map
+from Trains.Player.buy_now import Buy_Now
+from Trains.Player.dynamic_player import DynamicPlayer
+from Trains.Player.hold_10 import Hold_10
+
+CITY_COUNTS = [10, 25, 50, 100, 200, 500]
+# Average number of cities each city is joined to, so the number of connections grows linearly with the cities.
+AVERAGE_DEGREE = 6
+NUMBER_OF_PLAYERS = 4
+# Share of the map's connections the players own between them, as in the middle of a game.
+ACQUIRED_SHARE = 0.5
+# Number of player game states the strategies cycle through, one per turn of the game.
+NUMBER_OF_TURNS = 16
+REPETITIONS = 5
+# Shortest time in seconds of one repetition; fast functions are called in a loop for at least this long.
+MIN_REPETITION_TIME = 0.02
+# Ratio to the baseline above which a timing is reported as a regression.
+REGRESSION_THRESHOLD = 1.5
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hot_path_baseline.json")
+
+
+def create_referee(number_of_cities: int, seed: int = 0) -> Referee:
+    """
+    Creates a referee in the middle of a game on a random map: the players own half of the map's connections
+    between them, and each has two destinations and more than ten cards.
+        Parameters:
+            number_of_cities (int): Number of cities on the map
+            seed (int): Seed of the map and the game
+        Returns:
+            (Referee) The referee, whose game state is set up
+    """
+    density = min(1.0, AVERAGE_DEGREE / (number_of_cities - 1))
+    game_map = generate_random_map(number_of_cities, density, seed)
+    rng = random.Random(seed)
+    cities = sorted(game_map.get_all_cities())
+    acquired = sorted(sample_connections(game_map, int(len(game_map.connections) * ACQUIRED_SHARE), seed),
+                      key=get_connection_sort_key)
+    player_game_states = []
+    for player_index in range(NUMBER_OF_PLAYERS):
+        destinations = {Destination(set(rng.sample(cities, 2))), Destination(set(rng.sample(cities, 2)))}
+        cards = {color: rng.randint(3, 8) for color in Color}
+        player_game_states.append(PlayerGameState(set(acquired[player_index::NUMBER_OF_PLAYERS]), cards, 45,
+                                                  destinations, dict(), []))
+    deck = deque(rng.choice(list(Color)) for _ in range(250))
+    players = [DynamicPlayer(f"Player{index}", NUMBER_OF_PLAYERS - index, get_strategy_path("Hold-10"))
+               for index in range(NUMBER_OF_PLAYERS)]
+    referee = Referee(game_map, players, deck, rng=seed)
+    referee.ref_game_state = RefereeGameState(game_map, deck, player_game_states)
+    return referee
+
+
+def get_turn_states(referee: Referee, seed: int = 0) -> List[PlayerGameState]:
+    """
+    Plays NUMBER_OF_TURNS turns on a copy of the referee's game state in which every player acquires a free
+    connection, and returns the state each player was given on their turn. The players are given enough extra
+    cards to pay for every acquisition, so the strategies always look for a connection to acquire.
+    """
+    game_state = referee.ref_game_state
+    turns_per_player = math.ceil(NUMBER_OF_TURNS / NUMBER_OF_PLAYERS)
+    extra_cards = turns_per_player * max(connection.length for connection in game_state.map.connections)
+    game_state = RefereeGameState(game_state.map, deque(game_state.colored_card_deck),
+                                  [PlayerGameState(set(player.connections),
+                                                   {color: player.colored_cards[color] + extra_cards for color in Color},
+                                                   player.rails, player.destinations, dict(), [])
+                                   for player in game_state.player_game_states])
+    rng = random.Random(seed)
+    turn_states = []
+    for _ in range(NUMBER_OF_TURNS):
+        turn_states.append(game_state.get_player_game_state())
+        free_connections = sorted(game_state.get_free_connections(), key=get_connection_sort_key)
+        if len(free_connections) > 0:
+            game_state.add_connection_to_active_player(rng.choice(free_connections))
+        game_state.next_turn()
+    return turn_states
+
+
+def cycle(function: Callable, arguments: list) -> Callable:
+    """
+    Returns a function that calls the given function on the next of the given arguments each time it is called.
+    """
+    state = {"index": 0}
+
+    def call_next():
+        argument = arguments[state["index"]]
+        state["index"] = (state["index"] + 1) % len(arguments)
+        return function(argument)
+    return call_next
+
+
+def advance_turn(game_state: RefereeGameState) -> None:
+    """
+    The referee's work between two turns: moving on to the next player and building their state.
+    """
+    game_state.next_turn()
+    game_state.get_player_game_state()
+
+
+def get_hot_paths(referee: Referee) -> Dict[str, Callable]:
+    """
+    Returns the hot paths of a game on the referee's map, as functions without parameters.
+        Parameters:
+            referee (Referee): A referee in the middle of a game (see create_referee)
+        Returns:
+            (dict) Functions to time by name
+    """
+    game_state = referee.ref_game_state
+    game_map: Map = game_state.map
+    map_json = game_map.get_as_json()
+    player_game_state = game_state.get_player_game_state()
+    turn_states = get_turn_states(referee)
+    return {
+        "Map.get_feasible_destinations": lambda: game_map.get_feasible_destinations(game_map.connections),
+        "Referee.find_longest_continuous_path_for_player":
+            cycle(referee.find_longest_continuous_path_for_player, list(range(NUMBER_OF_PLAYERS))),
+        "RefereeGameState.next_turn": lambda: advance_turn(game_state),
+        "PlayerGameState.get_as_json": player_game_state.get_as_json,
+        "convert_json_map_to_data_map": lambda: convert_json_map_to_data_map(map_json),
+        "Hold_10.get_player_move": cycle(Hold_10().get_player_move, turn_states),
+        "Buy_Now.get_player_move": cycle(Buy_Now().get_player_move, turn_states),
+    }
+
+
+def time_per_call(function: Callable) -> float:
+    """
+    Times the best of REPETITIONS loops of calls of a function, each at least MIN_REPETITION_TIME long.
+        Returns:
+            (float) The best time of one call in seconds
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < MIN_REPETITION_TIME:
+        number *= 2
+    return min(timer.repeat(REPETITIONS, number)) / number
+
+
+def run_benchmarks(city_counts: List[int], seed: int = 0) -> dict:
+    """
+    Times every hot path on maps of each number of cities.
+        Parameters:
+            city_counts (list(int)): Numbers of cities of the maps, in increasing order
+            seed (int): Seed of the maps and the games
+        Returns:
+            (dict) The number of connections of each map, and the time of one call of each hot path in seconds
+            on each map, by number of cities (as strings, to round trip through JSON)
+    """
+    results = {"connections": {}, "seconds": {}}
+    for number_of_cities in city_counts:
+        referee = create_referee(number_of_cities, seed)
+        results["connections"][str(number_of_cities)] = len(referee.ref_game_state.map.connections)
+        for name, function in get_hot_paths(referee).items():
+            results["seconds"].setdefault(name, {})[str(number_of_cities)] = time_per_call(function)
+    return results
+
+
+def get_scaling_exponent(seconds: Dict[str, float]) -> float:
+    """
+    Returns the exponent k of the fitted curve time ~ cities^k over the given times by number of cities, by
+    least squares on a log-log scale (1 is linear, 2 quadratic).
+    """
+    points = [(math.log(int(cities)), math.log(time)) for cities, time in seconds.items() if time > 0]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> List[tuple]:
+    """
+    Compares timings with a baseline.
+        Parameters:
+            results (dict): Timings (see run_benchmarks)
+            baseline (dict): Earlier timings to compare with
+            threshold (float): Ratio of a timing to its baseline above which it is a regression
+        Returns:
+            (list(tuple)) The name, number of cities and ratio to the baseline of every regressed timing
+    """
+    regressions = []
+    for name, seconds in results["seconds"].items():
+        for cities, time in seconds.items():
+            baseline_time = baseline["seconds"].get(name, {}).get(cities)
+            if baseline_time is not None and time / baseline_time > threshold:
+                regressions.append((name, cities, time / baseline_time))
+    return regressions
+
+
+def print_scaling(results: dict, baseline: dict = None) -> None:
+    """
+    Prints the time of one call of each hot path in microseconds by number of cities, with the fitted scaling
+    exponent, and each time's ratio to the baseline when given one.
+    """
+    city_counts = list(results["connections"])
+    print(f"{'cities':<48} {'':>7} " + " ".join(f"{cities:>9}" for cities in city_counts))
+    print(f"{'connections':<48} {'':>7} " + " ".join(f"{results['connections'][cities]:>9}" for cities in city_counts))
+    print(f"{'time per call (us)':<48} {'scaling':>7}")
+    for name, seconds in results["seconds"].items():
+        print(f"{name:<48} {get_scaling_exponent(seconds):>7.2f} "
+              + " ".join(f"{seconds[cities] * 1e6:>9.2f}" for cities in city_counts))
+        if baseline is not None and name in baseline["seconds"]:
+            ratios = [seconds[cities] / baseline["seconds"][name][cities]
+                      if cities in baseline["seconds"][name] else None for cities in city_counts]
+            print(f"{'  vs baseline':<48} {'':>7} " + " ".join(f"{ratio:>8.2f}x" if ratio is not None else f"{'-':>9}"
+                                                               for ratio in ratios))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Times the hot paths of the game logic on maps of growing size.")
+    parser.add_argument("--cities", type=int, nargs="+", default=CITY_COUNTS, help="numbers of cities of the maps")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the maps and the games")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="path of the baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="ratio to the baseline above which a timing is a regression")
+    arguments = parser.parse_args()
+
+    results = run_benchmarks(sorted(arguments.cities), arguments.seed)
+    if arguments.save_baseline:
+        with open(arguments.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print_scaling(results)
+        return
+
+    baseline = None
+    if os.path.exists(arguments.baseline):
+        with open(arguments.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_scaling(results, baseline)
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, arguments.threshold)
+        for name, cities, ratio in regressions:
+            print(f"REGRESSION: {name} on {cities} cities is {ratio:.2f}x the baseline")
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import sys
+import time
+from typing import List
+
+import networkx as nx
+
+sys.path.append('../../../')
+from Trains.Admin.longest_path import find_longest_path_length
+from Trains.Other.Benchmarks.random_maps import generate_random_map, sample_connections
+from Trains.Other.Types.trains_types import Edge
+
+# (number of cities, density, number of connections owned by the player)
+SCENARIOS = [
+    (8, 0.6, 10),
+    (10, 0.6, 15),
+    (12, 0.7, 20),
+    (14, 0.8, 25),
+]
+LARGE_SCENARIOS = [
+    (30, 0.5, 40),
+    (60, 0.5, 60),
+    (200, 0.1, 120),
+]
+REPETITIONS = 3
+
+
+def networkx_longest_path_length(connections: set) -> int:
+    """
+    The referee's original longest path computation, kept as a reference for correctness and
+    timing. Enumerates every simple path between every pair of cities with networkx.
+        Parameters:
+            connections (set(Connection)): The connections a player owns
+        Returns:
+            (int) Length of the longest continuous path
+    """
+    trains_graph = nx.MultiGraph()
+    player_cities = set()
+    for connection in connections:
+        for city in connection.cities:
+            player_cities.add(city)
+    for city in player_cities:
+        trains_graph.add_node(city)
+    for connection in connections:
+        city1, city2 = list(connection.cities)
+        trains_graph.add_edge(city1, city2, weight=connection.length)
+
+    simple_paths = []
+    for source_city in player_cities:
+        for dest_city in player_cities:
+            simple_paths += nx.all_simple_paths(trains_graph, source_city, dest_city)
+
+    max_weight = 0
+    for path in map(nx.utils.pairwise, simple_paths):
+        path_weight = max_weight_of_simple_path(trains_graph, list(path))
+        if path_weight > max_weight:
+            max_weight = path_weight
+    return max_weight
+
+
+def max_weight_of_simple_path(graph: nx.MultiGraph, path: List[Edge]) -> int:
+    """
+    Gets the weight of a path in a multigraph using the heaviest edge between each pair of nodes.
+        Parameters:
+            graph (nx.MultiGraph): the graph that the path belongs to
+            path (list(edge)): path to weigh | edge is a tuple of two nodes
+        Returns:
+            weight (int): weight of the given path
+    """
+    weight = 0
+    for edge in path:
+        weight += max(data['weight'] for data in graph.get_edge_data(*edge).values())
+    return weight
+
+
+def time_function(function, connections: set) -> tuple:
+    """
+    Times the best of REPETITIONS calls of a longest path function.
+        Returns:
+            (tuple) The result of the function and the best time in seconds
+    """
+    best_time = None
+    result = None
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        result = function(connections)
+        elapsed = time.perf_counter() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+    return result, best_time
+
+
+def main():
+    print(f"{'cities':>6} {'density':>7} {'owned':>5} {'length':>6} {'networkx (s)':>13} {'engine (s)':>11} {'speedup':>8}")
+    for number_of_cities, density, owned in SCENARIOS:
+        game_map = generate_random_map(number_of_cities, density, seed=number_of_cities)
+        connections = sample_connections(game_map, owned, seed=owned)
+        expected, networkx_time = time_function(networkx_longest_path_length, connections)
+        actual, engine_time = time_function(find_longest_path_length, connections)
+        if expected != actual:
+            raise AssertionError(f"Engine found {actual} but networkx found {expected}")
+        print(f"{number_of_cities:>6} {density:>7} {owned:>5} {actual:>6} {networkx_time:>13.5f} {engine_time:>11.5f} "
+              f"{networkx_time / engine_time:>7.0f}x")
+
+    for number_of_cities, density, owned in LARGE_SCENARIOS:
+        game_map = generate_random_map(number_of_cities, density, seed=number_of_cities)
+        connections = sample_connections(game_map, owned, seed=owned)
+        actual, engine_time = time_function(find_longest_path_length, connections)
+        print(f"{number_of_cities:>6} {density:>7} {owned:>5} {actual:>6} {'-':>13} {engine_time:>11.5f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+sys.path.append('../../../')
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+
+NUMBER_OF_CITIES = 200
+DENSITY = 0.05
+REPETITIONS = 50
+
+
+def time_accessor(accessor: Callable) -> float:
+    """
+    Times the best of REPETITIONS calls of a Map accessor.
+        Returns:
+            (float) The best time in seconds
+    """
+    best_time = None
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        accessor()
+        elapsed = time.perf_counter() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+    return best_time
+
+
+def measure_allocated_bytes(accessor: Callable) -> int:
+    """
+    Measures the memory allocated by one call of a Map accessor that is still held by its result.
+        Returns:
+            (int) Number of bytes allocated
+    """
+    accessor()  # Builds anything the accessor caches, so only the cost of a call is measured.
+    tracemalloc.start()
+    result = accessor()
+    allocated_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return allocated_bytes
+
+
+def main():
+    game_map = generate_random_map(NUMBER_OF_CITIES, DENSITY)
+    print(f"{NUMBER_OF_CITIES} cities, {len(game_map.connections)} connections")
+    accessors = [
+        ("get_all_connections", game_map.get_all_connections),
+        ("get_all_cities", game_map.get_all_cities),
+        ("get_copy_of_map", game_map.get_copy_of_map),
+    ]
+    print(f"{'accessor':>20} {'time (ms)':>10} {'memory (KiB)':>13}")
+    for name, accessor in accessors:
+        best_time = time_accessor(accessor)
+        allocated_bytes = measure_allocated_bytes(accessor)
+        print(f"{name:>20} {best_time * 1000:>10.4f} {allocated_bytes / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import json
+import sys
+import time
+from typing import Callable
+
+import jsonschema
+
+sys.path.append('../../../')
+from Trains.Other.Benchmarks.state_delta_benchmark import create_referee_game_state
+from Trains.Remote.messages.message_schemas import MAP_SCHEMA, METHOD_CALL_SCHEMA, PLAY_SCHEMA
+from Trains.Remote.messages.valdiate_server_message import validate_server_message
+from Trains.Remote.messages.validate_map_info import validate_map_json
+
+REPETITIONS = 10
+
+
+def validate_server_message_uncached(server_message_json: list) -> bool:
+    """Validates a play call the way validate_server_message used to, with jsonschema.validate."""
+    jsonschema.validate(instance=server_message_json, schema=METHOD_CALL_SCHEMA)
+    jsonschema.validate(instance=server_message_json[1], schema=PLAY_SCHEMA)
+    return True
+
+
+def validate_map_json_uncached(map_json: dict) -> bool:
+    """Validates a map the way validate_map_json used to, with jsonschema.validate."""
+    jsonschema.validate(instance=map_json, schema=MAP_SCHEMA)
+    return True
+
+
+def time_validator(validator: Callable, message) -> float:
+    """
+    Times the best of REPETITIONS validations of a message.
+        Returns:
+            (float) The best time in seconds
+    """
+    best_time = None
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        if not validator(message):
+            raise ValueError("Benchmark message is invalid")
+        elapsed = time.perf_counter() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+    return best_time
+
+
+def main():
+    referee_game_state = create_referee_game_state(0)
+    play_message = json.loads(json.dumps(["play", [referee_game_state.get_player_game_state().get_as_json()]]))
+    map_json = json.loads(json.dumps(referee_game_state.map.get_as_json()))
+    print(f"{len(referee_game_state.map.cities)} cities, {len(referee_game_state.map.connections)} connections")
+
+    validators = [
+        ("play (jsonschema.validate)", validate_server_message_uncached, play_message),
+        ("play (cached validators)", lambda message: validate_server_message(message, use_fast_path=False),
+         play_message),
+        ("play (fast path)", validate_server_message, play_message),
+        ("map (jsonschema.validate)", validate_map_json_uncached, map_json),
+        ("map (cached validator)", validate_map_json, map_json),
+    ]
+    print(f"{'validation':>28} {'time per message (ms)':>22}")
+    for name, validator, message in validators:
+        print(f"{name:>28} {time_validator(validator, message) * 1000:>22.3f}")
+
+
+if __name__ == "__main__":
+    main()
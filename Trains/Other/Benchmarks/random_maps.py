@@ -0,0 +1,47 @@
+import random
+import sys
+from itertools import combinations
+
+sys.path.append('../../../')
+from Trains.Common.map import City, Color, Connection, Map
+
+CONNECTION_LENGTHS = [3, 4, 5]
+
+
+def generate_random_map(number_of_cities: int, density: float, seed: int = 0, max_parallel: int = 2) -> Map:
+    """
+    Generates a random map for benchmarking. Every pair of cities is joined with probability
+    'density' by between 1 and 'max_parallel' connections of distinct colors and random lengths.
+        Parameters:
+            number_of_cities (int): Number of cities on the map
+            density (float): Probability in [0, 1] that a pair of cities is connected
+            seed (int): Seed for the random number generator so maps can be regenerated
+            max_parallel (int): Maximum number of connections between a pair of cities (at most 4)
+        Returns:
+            (Map) The generated map
+    """
+    rng = random.Random(seed)
+    cities = {City(f"City{index}", rng.randint(0, 800), rng.randint(0, 800)) for index in range(number_of_cities)}
+    connections = set()
+    for city1, city2 in combinations(sorted(cities), 2):
+        if rng.random() >= density:
+            continue
+        colors = rng.sample(list(Color), rng.randint(1, min(max_parallel, Color.number_of_colors())))
+        for color in colors:
+            connections.add(Connection(frozenset({city1, city2}), color, rng.choice(CONNECTION_LENGTHS)))
+    return Map(cities, connections)
+
+
+def sample_connections(game_map: Map, number_of_connections: int, seed: int = 0) -> set:
+    """
+    Picks a random subset of a map's connections, such as the connections a player acquired.
+        Parameters:
+            game_map (Map): The map to pick connections from
+            number_of_connections (int): How many connections to pick (capped at the number on the map)
+            seed (int): Seed for the random number generator
+        Returns:
+            (set(Connection)) The sampled connections
+    """
+    rng = random.Random(seed)
+    all_connections = sorted(game_map.connections, key=lambda connection: connection.get_as_json())
+    return set(rng.sample(all_connections, min(number_of_connections, len(all_connections))))
@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.synchronize import Event
+from typing import List
+
+sys.path.append('../../../')
+from Trains.Admin.instrumentation import PLAYER_METHOD_METRIC_PREFIX, SCORING_METRIC, MetricsRegistry
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+from Trains.Common.map import Map
+from Trains.Remote.client_runtime import ClientRuntime
+from Trains.Remote.server import Server
+from Trains.Remote.server_proxy import ServerProxy
+
+HOSTNAME = "127.0.0.1"
+# Strategies of the clients, given to them in turn.
+STRATEGY_NAMES = ["Hold-10", "Buy-Now"]
+# Seconds between the sign ups of consecutive clients (see ClientRuntime).
+SIGN_UP_INTERVAL = 0.005
+# ServerProxy resolves strategy names relative to the Trains directory.
+TRAINS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+# Player calls a RemotePlayerProxy answers without a message to its client, left out of the message latencies.
+LOCAL_PLAYER_METHODS = {"more"}
+
+
+def get_free_port() -> int:
+    """
+    Returns a loopback port that is free to listen on.
+    """
+    with socket.socket() as free_socket:
+        free_socket.bind((HOSTNAME, 0))
+        return free_socket.getsockname()[1]
+
+
+def signal_when_listening(server: Server, listening: Event) -> None:
+    """
+    Sets the event once the server is listening, for clients that connect only once (see ServerProxy).
+    """
+    while server.active_server is None:
+        time.sleep(0.01)
+    listening.set()
+
+
+def run_benchmark_server(port: int, number_of_clients: int, tournaments: int, concurrent_games: bool, seed: int,
+                         listening: Event, connection: Connection) -> None:
+    """
+    Runs a long-running Server (see Server.run_tournaments) for a number of tournaments in its own process, so
+    its CPU time is measured apart from the clients', and sends the measurements back over a pipe.
+    """
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    metrics = MetricsRegistry()
+    server = Server(HOSTNAME, port, number_of_clients, number_of_clients, 30, concurrent_games=concurrent_games,
+                    rng=seed, metrics=metrics)
+    threading.Thread(target=signal_when_listening, args=(server, listening), daemon=True).start()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    results = server.run_tournaments(tournaments)
+    connection.send({
+        "cpu_time": time.process_time() - cpu_start,
+        "wall_time": time.perf_counter() - wall_start,
+        "sign_up_time": server.sign_up_metrics.sign_up_time,
+        "tournaments": len(results),
+        "cheaters": sum(len(cheaters) for _, cheaters in results),
+        "metrics": metrics
+    })
+    connection.close()
+
+
+def create_clients(number_of_clients: int, port: int, game_map: Map) -> List[ServerProxy]:
+    """
+    Creates persistent ServerProxys that suggest the given map, whose players use the strategies of
+    STRATEGY_NAMES in turn.
+    """
+    working_directory = os.getcwd()
+    os.chdir(TRAINS_DIRECTORY)
+    try:
+        return [ServerProxy(HOSTNAME, port, f"Client{index}", STRATEGY_NAMES[index % len(STRATEGY_NAMES)], game_map,
+                            persistent=True) for index in range(number_of_clients)]
+    finally:
+        os.chdir(working_directory)
+
+
+def run_load_test(number_of_clients: int, tournaments: int, number_of_cities: int, density: float,
+                  concurrent_games: bool = False, seed: int = 0) -> dict:
+    """
+    Runs tournaments between ServerProxy clients, run on one event loop by a ClientRuntime, and a Server over
+    loopback.
+        Parameters:
+            number_of_clients (int): Number of clients, all of which play every tournament
+            tournaments (int): Number of tournaments to run over the same connections
+            number_of_cities (int): Number of cities on the map the clients suggest
+            density (float): Density of the map (see generate_random_map)
+            concurrent_games (bool): Whether the server plays the games of a round concurrently (AsyncManager)
+            seed (int): Seed of the map and of the tournaments
+        Returns:
+            (dict) The load test's report: games per second, the latency of each kind of message (the
+            server's round trip for a player call), failed client sessions, and server and client CPU time
+    """
+    game_map = generate_random_map(number_of_cities, density, seed)
+    port = get_free_port()
+    clients = create_clients(number_of_clients, port, game_map)
+    runtime = ClientRuntime(clients, SIGN_UP_INTERVAL)
+    listening = multiprocessing.Event()
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server_process = multiprocessing.Process(target=run_benchmark_server,
+                                             args=(port, number_of_clients, tournaments, concurrent_games, seed,
+                                                   listening, sender))
+    server_process.start()
+    # Only the server process writes to the pipe, so receiving fails instead of waiting if it dies.
+    sender.close()
+    listening.wait()
+    client_cpu_start = time.process_time()
+    runtime.run()
+    client_cpu_time = time.process_time() - client_cpu_start
+    server_report = receiver.recv()
+    server_process.join()
+
+    metrics: MetricsRegistry = server_report["metrics"]
+    games = metrics.get_histogram(SCORING_METRIC).count
+    tournament_time = server_report["wall_time"] - server_report["sign_up_time"]
+    messages = {}
+    for metric in sorted(metrics.histograms):
+        method_name = metric[len(PLAYER_METHOD_METRIC_PREFIX):]
+        if metric.startswith(PLAYER_METHOD_METRIC_PREFIX) and method_name not in LOCAL_PLAYER_METHODS:
+            histogram = metrics.get_combined_histogram(metric)
+            messages[method_name] = {
+                "count": histogram.count,
+                "p50": histogram.get_percentile(50),
+                "p99": histogram.get_percentile(99)
+            }
+    return {
+        "clients": number_of_clients,
+        "cities": number_of_cities,
+        "connections": len(game_map.connections),
+        "concurrent_games": concurrent_games,
+        "tournaments": server_report["tournaments"],
+        "games": games,
+        "cheaters": server_report["cheaters"],
+        "sign_up_time": server_report["sign_up_time"],
+        "tournament_time": tournament_time,
+        "games_per_second": games / tournament_time if tournament_time > 0 else 0.0,
+        "messages": messages,
+        "failed_sessions": runtime.failed_sessions,
+        "server_cpu_time": server_report["cpu_time"],
+        "server_cpu_utilization": server_report["cpu_time"] / server_report["wall_time"],
+        "client_cpu_time": client_cpu_time
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['clients']} clients, {report['cities']} cities, {report['connections']} connections, "
+          f"{report['tournaments']} tournaments, {report['games']} games, {report['cheaters']} booted")
+    print(f"games/s {report['games_per_second']:.1f}, sign up {report['sign_up_time'] * 1000:.0f} ms, "
+          f"tournaments {report['tournament_time']:.2f} s")
+    print(f"failed client sessions: {report['failed_sessions']}")
+    print(f"cpu: server {report['server_cpu_time']:.2f} s ({report['server_cpu_utilization']:.0%} of wall time), "
+          f"clients {report['client_cpu_time']:.2f} s")
+    print(f"{'message':>8} {'count':>8} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for method_name, latency in report["messages"].items():
+        print(f"{method_name:>8} {latency['count']:>8} {latency['p50'] * 1000:>9.3f} {latency['p99'] * 1000:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-tests the remote Server with ServerProxy clients over loopback.")
+    parser.add_argument("--clients", type=int, default=16, help="number of clients")
+    parser.add_argument("--tournaments", type=int, default=3, help="number of tournaments to run")
+    parser.add_argument("--cities", type=int, default=40, help="number of cities on the map")
+    parser.add_argument("--density", type=float, default=0.15, help="density of the map")
+    parser.add_argument("--concurrent-games", action="store_true", help="play the games of a round concurrently")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the map and the tournaments")
+    parser.add_argument("--output", help="path of a JSON file to write the report to, to compare runs")
+    arguments = parser.parse_args()
+
+    report = run_load_test(arguments.clients, arguments.tournaments, arguments.cities, arguments.density,
+                           arguments.concurrent_games, arguments.seed)
+    print_report(report)
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import json
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.append('../../../')
+from Trains.Admin.referee_game_state import RefereeGameState
+from Trains.Common.map import Color, Destination, get_connection_sort_key
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+from Trains.Other.Util.json_utils import convert_from_json_to_player_game_state
+from Trains.Remote.state_updates import DELTA_KEY, apply_player_game_state_delta, \
+    get_player_game_state_delta_as_json, snapshot_player_game_state
+
+NUMBER_OF_CITIES = 200
+DENSITY = 0.05
+NUMBER_OF_PLAYERS = 4
+NUMBER_OF_TURNS = 200
+
+
+def create_referee_game_state(seed: int) -> RefereeGameState:
+    """
+    Creates the state of a game on a random map where every player has two destinations and plenty of
+    rails and cards, so every turn can acquire a connection.
+    """
+    game_map = generate_random_map(NUMBER_OF_CITIES, DENSITY, seed)
+    rng = random.Random(seed)
+    cities = sorted(game_map.get_all_cities())
+    player_game_states = []
+    for _ in range(NUMBER_OF_PLAYERS):
+        destinations = {Destination(set(rng.sample(cities, 2))), Destination(set(rng.sample(cities, 2)))}
+        cards = {color: 1000 for color in Color}
+        player_game_states.append(PlayerGameState(set(), cards, 1000, destinations, dict(), []))
+    deck = deque(rng.choice(list(Color)) for _ in range(250))
+    return RefereeGameState(game_map, deck, player_game_states)
+
+
+def main():
+    referee_game_state = create_referee_game_state(0)
+    rng = random.Random(0)
+    print(f"{NUMBER_OF_CITIES} cities, {len(referee_game_state.map.connections)} connections, "
+          f"{NUMBER_OF_PLAYERS} players, {NUMBER_OF_TURNS} turns")
+
+    full_bytes, delta_bytes = 0, 0
+    full_time, delta_time = 0.0, 0.0
+    last_sent = [None] * NUMBER_OF_PLAYERS
+    last_received = [None] * NUMBER_OF_PLAYERS
+    for _ in range(NUMBER_OF_TURNS):
+        player_index = referee_game_state.turn
+        game_state = referee_game_state.get_player_game_state()
+
+        start = time.perf_counter()
+        full_message = json.dumps(["play", [game_state.get_as_json()]])
+        convert_from_json_to_player_game_state(json.loads(full_message)[1][0])
+        full_time += time.perf_counter() - start
+        full_bytes += len(full_message.encode())
+
+        start = time.perf_counter()
+        if last_sent[player_index] is None:
+            delta_message = full_message
+            received = convert_from_json_to_player_game_state(json.loads(delta_message)[1][0])
+        else:
+            delta_json = get_player_game_state_delta_as_json(last_sent[player_index], game_state)
+            delta_message = json.dumps(["play", [{DELTA_KEY: delta_json}]])
+            received = apply_player_game_state_delta(last_received[player_index],
+                                                     json.loads(delta_message)[1][0][DELTA_KEY])
+        last_sent[player_index] = snapshot_player_game_state(game_state)
+        last_received[player_index] = received
+        delta_time += time.perf_counter() - start
+        delta_bytes += len(delta_message.encode())
+
+        free_connections = sorted(referee_game_state.get_free_connections(), key=get_connection_sort_key)
+        if len(free_connections) > 0:
+            referee_game_state.add_connection_to_active_player(rng.choice(free_connections))
+        referee_game_state.next_turn()
+
+    print(f"{'state updates':>14} {'KiB sent':>10} {'bytes/play':>11} {'time (ms)':>10}")
+    for name, sent_bytes, elapsed in [("full", full_bytes, full_time), ("delta", delta_bytes, delta_time)]:
+        print(f"{name:>14} {sent_bytes / 1024:>10.1f} {sent_bytes / NUMBER_OF_TURNS:>11.0f} {elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
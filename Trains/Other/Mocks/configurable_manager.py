@@ -1,24 +1,23 @@
-from copy import deepcopy
 import json, os, sys
-from collections import deque
 from typing import List
 
 sys.path.append("../../../")
 from Trains.Other.Util.json_utils import convert_json_map_to_data_map
 from Trains.Admin.manager import Manager
 from Trains.Admin.referee import Referee, NotEnoughDestinations
+from Trains.Common.cards import Deck
 from Trains.Common.map import Map
 from Trains.Other.Types.trains_types import GameAssignment
 
 class ConfigurableManager(Manager):
 
-    def __init__(self, players: list, deck: deque = None, use_default: bool = False):
+    def __init__(self, players: list, deck: Deck = None, use_default: bool = False):
         """
         Constructor that initializes a ConfigurableManager. Takes in a list of players to be used normally (as a Manager would),
         and optionally a custom deck for use by the Referee.
             Parameters:
                 players (list): List of players for a tournament.
-                deck (deque): Custom deck for use during tournament games.
+                deck (Deck): Custom deck for use during tournament games.
         """
         self.use_default = use_default
         super().__init__(players, deck)
@@ -33,12 +32,9 @@ class ConfigurableManager(Manager):
                 game_assigments (list(list(Player))): list of a lists of players where each inner
                                               list represents the 2-8 players in a game of trains
         """
-        for assignment in game_assignments:
+        for game_index, assignment in enumerate(game_assignments):
             game_map = self.tournament_map
-            if self.deck is not None:
-                ref = Referee(game_map, assignment, deepcopy(self.deck))
-            else:
-                ref = Referee(game_map, assignment)
+            ref = Referee(game_map, assignment, self.deck, rng=self.get_game_rng(game_index))
             game_rankings, cheaters = ref.play_game()
             # Eliminate losing players
             if len(game_rankings) >= 2:
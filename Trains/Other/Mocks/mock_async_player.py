@@ -0,0 +1,46 @@
+import asyncio
+import sys
+
+sys.path.append("../../../")
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.moves import PlayerMove
+from Trains.Other.Mocks.mock_tournament_player import MockTournamentPlayer
+
+
+class MockAsyncPlayer(MockTournamentPlayer):
+    """
+    Mock Player used for testing asynchronous referees and managers. Provides coroutine versions
+    of play and win that wait for a given delay and record each call in a shared log.
+    """
+    def __init__(self, name: str, age: int, call_log: list, delay: float = 0, move: PlayerMove = None):
+        """
+        Initializes an instance of a mock async player
+            Parameters:
+                name (str): Player name
+                age (int): Player age
+                call_log (list): Log that (player name, method name) is appended to on each call
+                delay (float): Seconds to wait before responding to each call
+                move (PlayerMove): Move to always make, or None to use the Hold_10 strategy
+        """
+        super().__init__(name, age, move)
+        self.call_log = call_log
+        self.delay = delay
+
+    async def play_async(self, game_state: PlayerGameState) -> PlayerMove:
+        self.call_log.append((self.name, "play"))
+        await asyncio.sleep(self.delay)
+        return self.play(game_state)
+
+    async def win_async(self, winner: bool) -> None:
+        self.call_log.append((self.name, "win"))
+        await asyncio.sleep(self.delay)
+        self.win(winner)
+
+
+class MockAsyncTimeoutPlayer(MockAsyncPlayer):
+    """
+    Mock Player whose play call fails the same way a RemotePlayerProxy does when its client does not respond.
+    """
+    async def play_async(self, game_state: PlayerGameState) -> PlayerMove:
+        self.call_log.append((self.name, "play"))
+        raise asyncio.TimeoutError()
@@ -0,0 +1,113 @@
+import asyncio
+import sys
+from typing import Any, List
+sys.path.append("../../../")
+from Trains.Common.map import Map
+from Trains.Remote.connection_pool import PERSISTENT_SESSION, SESSION_KEY
+from Trains.Remote.message_framing import MessageReader, MessageStreamClosed, encode_message
+
+# Seconds between attempts to connect to a server that is not listening yet.
+CONNECT_RETRY_INTERVAL = 0.05
+
+
+class ByteCountingReader:
+    """
+    Wraps a StreamReader to count the bytes read from it.
+    """
+    def __init__(self, reader: asyncio.StreamReader):
+        self.reader = reader
+        self.bytes_read = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        data = await self.reader.read(n)
+        self.bytes_read += len(data)
+        return data
+
+
+class MockRemoteClient:
+    """
+    Mock client used for testing servers. Signs up with a Trains server over TCP and answers every method
+    call with a fixed legal response: it suggests its map, keeps the first two destinations offered and
+    asks for more cards every turn. Messages are not converted to data objects or validated, so the client
+    does not depend on a strategy or on the message schemas.
+    """
+    def __init__(self, name: str, game_map: Map, persistent: bool = False):
+        """
+        Initializes a mock client
+            Parameters:
+                name (str): Player name
+                game_map (Map): The map to suggest on start
+                persistent (bool): Whether to ask the server for a persistent session
+        """
+        self.name = name
+        self.game_map_json = game_map.get_as_json()
+        self.persistent = persistent
+        # Whether the client won each tournament it finished (it loses a tournament when it loses a game).
+        self.tournament_results: List[bool] = []
+        self.method_calls = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    async def play(self, hostname: str, port: int, connect_attempts: int = 1) -> List[bool]:
+        """
+        Signs up with the server and answers method calls until the server closes the connection.
+            Parameters:
+                hostname (str): The server's host name
+                port (int): The server's port
+                connect_attempts (int): How many times to try to connect, for a server that may not be
+                    listening yet
+            Returns:
+                Whether the client won each tournament it finished
+        """
+        reader, writer = await self.connect(hostname, port, connect_attempts)
+        sign_up_info = [self.name]
+        if self.persistent:
+            sign_up_info.append({SESSION_KEY: PERSISTENT_SESSION})
+        self.send(writer, sign_up_info)
+        await writer.drain()
+
+        counting_reader = ByteCountingReader(reader)
+        message_reader = MessageReader(counting_reader)
+        try:
+            while True:
+                method_name, method_args = await message_reader.read_message()
+                self.method_calls += 1
+                response = self.get_response(method_name, method_args)
+                if response is not None:
+                    self.send(writer, response)
+                    await writer.drain()
+        except (MessageStreamClosed, ConnectionError):
+            pass
+        writer.close()
+        self.bytes_received = counting_reader.bytes_read
+        return self.tournament_results
+
+    async def connect(self, hostname: str, port: int, connect_attempts: int):
+        """
+        Connects to the server, retrying every CONNECT_RETRY_INTERVAL seconds while it refuses connections.
+        """
+        for _ in range(connect_attempts - 1):
+            try:
+                return await asyncio.open_connection(hostname, port)
+            except ConnectionRefusedError:
+                await asyncio.sleep(CONNECT_RETRY_INTERVAL)
+        return await asyncio.open_connection(hostname, port)
+
+    def send(self, writer: asyncio.StreamWriter, message: Any) -> None:
+        data = encode_message(message)
+        self.bytes_sent += len(data)
+        writer.write(data)
+
+    def get_response(self, method_name: str, method_args: list) -> Any:
+        """
+        Returns the JSON response to a method call, or None if the method has no response.
+        """
+        if method_name == "start":
+            return self.game_map_json
+        if method_name == "pick":
+            return method_args[0][2:]
+        if method_name == "play":
+            return "more cards"
+        if method_name == "end" or (method_name == "win" and not method_args[0]):
+            self.tournament_results.append(method_args[0])
+        return None
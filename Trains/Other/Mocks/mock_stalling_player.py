@@ -0,0 +1,42 @@
+import sys
+sys.path.append("../../../")
+from Trains.Common.map import Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Player.moves import PlayerMove
+from Trains.Player.player import AbstractPlayer
+from Trains.Player.hold_10 import Hold_10
+
+
+class MockStallingPlayer(AbstractPlayer):
+    """
+    Mock Player used for testing.  Plays with the Hold_10 strategy, but never returns from one of its
+    methods (an infinite loop), like an unresponsive player.
+    """
+    def __init__(self, name: str, age: int, stalling_method: str = "play"):
+        """
+        Initializes an instance of a mock player
+            Parameters:
+                name (str): Player name
+                age (int): Player age
+                stalling_method (str): Name of the method that never returns ("setup" or "play")
+        """
+        super().__init__(name, age)
+        self.strategy = Hold_10()
+        self.stalling_method = stalling_method
+
+    def stall(self) -> None:
+        """
+        Loops forever.
+        """
+        while True:
+            pass
+
+    def setup(self, map: Map, rails: int, cards: dict):
+        if self.stalling_method == "setup":
+            self.stall()
+        super().setup(map, rails, cards)
+
+    def play(self, game_state: PlayerGameState) -> PlayerMove:
+        if self.stalling_method == "play":
+            self.stall()
+        return super().play(game_state)
@@ -34,13 +34,7 @@ class Dynamic_Hold_10(AbstractPlayerStrategy):
             Returns:
                 Connection to acquire if possible, None otherwise
         """
-        unacquired_connections = resources.game_info["unacquired_connections"]
-        sorted_connections = self.get_lexicographic_order_of_connections(list(unacquired_connections))
-
-        for connection in sorted_connections:
-            if self.can_acquire_connection(resources, connection):
-                return connection
-        return None
+        return self.get_first_acquirable_connection(resources)
 
     def get_player_move(self, resources):
         """
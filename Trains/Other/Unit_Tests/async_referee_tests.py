@@ -0,0 +1,108 @@
+import asyncio
+from collections import deque
+from copy import deepcopy
+import json
+import socket
+import unittest
+import sys
+
+sys.path.append('../../../')
+
+from Trains.Common.map import Color
+from Trains.Admin.async_referee import AsyncReferee
+from Trains.Admin.async_manager import AsyncManager
+from Trains.Admin.manager import Manager
+from Trains.Admin.referee import Referee
+from Trains.Player.moves import DrawCardMove
+from Trains.Other.Mocks.mock_async_player import MockAsyncPlayer, MockAsyncTimeoutPlayer
+from Trains.Other.Mocks.mock_tournament_player import MockTournamentPlayer
+from Trains.Other.Util.json_utils import convert_json_map_to_data_map
+from Trains.Remote.Remote_Player_Proxy import RemotePlayerProxy
+
+
+class TestAsyncReferee(unittest.TestCase):
+    def setUp(self):
+        default_game_map_file_path = "../../../Trains/Other/Examples/Maps/default_map1.json"
+        with open(default_game_map_file_path) as default_map_file:
+            self.game_map = convert_json_map_to_data_map(json.load(default_map_file))
+        self.red_deck = deque([Color.RED for _ in range(40)])
+        self.call_log = []
+
+    def test_play_game_async_all_draw(self):
+        players = [MockAsyncPlayer(f"player{i}", i, self.call_log, move=DrawCardMove()) for i in range(3)]
+        referee = AsyncReferee(self.game_map, players, self.red_deck)
+        rankings, banned = asyncio.run(referee.play_game_async())
+        self.assertEqual(len(rankings), 1)
+        self.assertEqual([player_score[0] for player_score in rankings[0]], players)
+        self.assertEqual(banned, [])
+        for player in players:
+            self.assertTrue(player.is_game_winner)
+
+    def test_referee_plays_the_same_game_as_async_referee(self):
+        players = [MockAsyncPlayer(f"player{i}", i, self.call_log) for i in range(3)]
+        rankings, banned = Referee(self.game_map, deepcopy(players), self.red_deck, rng=1).play_game()
+        async_referee = AsyncReferee(self.game_map, deepcopy(players), self.red_deck, rng=1)
+        async_rankings, async_banned = asyncio.run(async_referee.play_game_async())
+        self.assertEqual([[(player.name, score) for player, score in rank] for rank in async_rankings],
+                         [[(player.name, score) for player, score in rank] for rank in rankings])
+        self.assertEqual(async_banned, banned)
+
+    def test_play_game_of_async_referee_needs_an_event_loop(self):
+        players = [MockAsyncPlayer(f"player{i}", i, self.call_log, move=DrawCardMove()) for i in range(2)]
+        with self.assertRaises(RuntimeError):
+            AsyncReferee(self.game_map, players, self.red_deck).play_game()
+        self.assertEqual(self.call_log, [])
+
+    def test_play_game_async_boots_unresponsive_player(self):
+        slow = MockAsyncTimeoutPlayer("slow", 1, self.call_log)
+        players = [MockAsyncPlayer("fast", 2, self.call_log, move=DrawCardMove()), slow]
+        referee = AsyncReferee(self.game_map, players, self.red_deck)
+        rankings, banned = asyncio.run(referee.play_game_async())
+        self.assertEqual(banned, [slow])
+        self.assertTrue(slow.booted)
+        self.assertEqual(rankings[0][0][0], players[0])
+
+    def test_remote_player_that_stops_reading_times_out(self):
+        async def send_to_client_that_does_not_read():
+            server_socket, client_socket = socket.socketpair()
+            reader, writer = await asyncio.open_connection(sock=server_socket)
+            player = RemotePlayerProxy("stalled", 1, reader, writer)
+            player.TIMEOUT = 0.2
+            try:
+                # Much more than the socket buffers hold, so the write cannot drain.
+                await player.tcp_communicate_async(["setup", ["x" * (1 << 24)]], False)
+            finally:
+                writer.close()
+                client_socket.close()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(send_to_client_that_does_not_read())
+
+    def test_games_played_concurrently(self):
+        first_game = [MockAsyncPlayer(f"a{i}", i, self.call_log, 0.001, DrawCardMove()) for i in range(2)]
+        second_game = [MockAsyncPlayer(f"b{i}", i, self.call_log, 0.001, DrawCardMove()) for i in range(2)]
+
+        async def play_both():
+            referees = [AsyncReferee(self.game_map, game, deepcopy(self.red_deck)) for game in [first_game, second_game]]
+            return await asyncio.gather(*[referee.play_game_async() for referee in referees])
+
+        asyncio.run(play_both())
+        names = [name for name, _ in self.call_log]
+        last_first_game_call = max(index for index, name in enumerate(names) if name.startswith("a"))
+        first_second_game_call = names.index("b0")
+        self.assertLess(first_second_game_call, last_first_game_call)
+
+
+class TestAsyncManager(unittest.TestCase):
+    def test_run_tournament_async_matches_manager(self):
+        map_path = "../../../Trains/Other/Examples/Maps/default_map1.json"
+        players = [MockTournamentPlayer(f"player{i}", i, DrawCardMove(), map_path) for i in range(12)]
+        deck = deque([Color.RED for _ in range(40)])
+        winners, banned = Manager(deepcopy(players), deque(deck)).run_tournament()
+        async_winners, async_banned = asyncio.run(AsyncManager(deepcopy(players), deque(deck)).run_tournament_async())
+        self.assertEqual([player.name for player in async_winners], [player.name for player in winners])
+        self.assertEqual([player.name for player in async_banned], [player.name for player in banned])
+
+
+if __name__ == '__main__':
+    unittest.main()
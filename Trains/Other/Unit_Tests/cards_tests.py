@@ -0,0 +1,91 @@
+from collections import deque
+from copy import copy, deepcopy
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Common.cards import Deck, Hand
+from Trains.Common.map import Color
+from Trains.Other.Util.json_utils import convert_card_star_to_json, convert_from_json_to_card_star, \
+    convert_from_json_to_deck
+
+
+class TestHand(unittest.TestCase):
+    def setUp(self):
+        self.hand = Hand({Color.RED: 4, Color.BLUE: 5, Color.WHITE: 3})
+
+    def test_counts_and_total(self):
+        self.assertEqual(self.hand[Color.GREEN], 0)
+        self.assertEqual(self.hand.get_total(), 12)
+        self.hand[Color.BLUE] -= 2
+        self.hand.add_cards([Color.GREEN, Color.GREEN, Color.RED])
+        self.assertEqual(self.hand[Color.BLUE], 3)
+        self.assertEqual(self.hand[Color.RED], 5)
+        self.assertEqual(self.hand.get_total(), 13)
+
+    def test_is_a_mapping_of_every_color(self):
+        self.assertEqual(set(self.hand.keys()), set(Color))
+        self.assertEqual(sum(self.hand.values()), self.hand.get_total())
+        self.assertEqual(self.hand, {Color.RED: 4, Color.BLUE: 5, Color.GREEN: 0, Color.WHITE: 3})
+        self.assertEqual({Color.RED: 4, Color.BLUE: 5, Color.WHITE: 3}, self.hand)
+        self.assertNotEqual(self.hand, {Color.RED: 4})
+        with self.assertRaises(KeyError):
+            self.hand["red"]
+
+    def test_invalid_hands(self):
+        with self.assertRaises(ValueError):
+            Hand({Color.RED: -1})
+        with self.assertRaises(ValueError):
+            Hand({"red": 1})
+
+    def test_copies_are_independent(self):
+        for hand_copy in [copy(self.hand), deepcopy(self.hand), self.hand.copy()]:
+            hand_copy.add_cards([Color.RED])
+            self.assertEqual(self.hand[Color.RED], 4)
+            self.assertEqual(self.hand.get_total(), 12)
+
+    def test_json(self):
+        json_hand = {"red": 4, "blue": 5, "green": 0, "white": 3}
+        self.assertEqual(self.hand.get_as_json(), json_hand)
+        self.assertEqual(convert_card_star_to_json(self.hand), json_hand)
+        self.assertEqual(convert_from_json_to_card_star(json_hand), self.hand)
+
+
+class TestDeck(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck([Color.RED, Color.BLUE, Color.GREEN, Color.WHITE])
+
+    def test_draw_from_top(self):
+        self.assertEqual(self.deck.draw(3), [Color.WHITE, Color.GREEN, Color.BLUE])
+        self.assertEqual(self.deck.draw(3), [Color.RED])
+        self.assertEqual(self.deck.draw(3), [])
+        self.assertEqual(len(self.deck), 0)
+
+    def test_pop_and_append(self):
+        self.deck.append(Color.RED)
+        self.assertEqual(self.deck.pop(), Color.RED)
+        self.assertEqual(self.deck.pop(), Color.WHITE)
+        with self.assertRaises(IndexError):
+            Deck().pop()
+
+    def test_equals_sequences_of_colors(self):
+        self.assertEqual(self.deck, deque([Color.RED, Color.BLUE, Color.GREEN, Color.WHITE]))
+        self.assertEqual(self.deck, Deck(deque(self.deck)))
+        self.assertNotEqual(self.deck, [Color.RED])
+        with self.assertRaises(ValueError):
+            Deck(["red"])
+
+    def test_copies_are_independent(self):
+        deck_copy = copy(self.deck)
+        deck_copy.draw(2)
+        self.assertEqual(len(self.deck), 4)
+        self.assertEqual(len(deck_copy), 2)
+
+    def test_json(self):
+        json_deck = ["red", "blue", "green", "white"]
+        self.assertEqual(self.deck.get_as_json(), json_deck)
+        self.assertEqual(convert_from_json_to_deck(json_deck), self.deck)
+
+
+if __name__ == '__main__':
+    unittest.main()
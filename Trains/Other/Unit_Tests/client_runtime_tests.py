@@ -0,0 +1,99 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import socket
+import threading
+import time
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Admin.referee import Referee
+from Trains.Admin.simulation import get_strategy_path
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+from Trains.Player.dynamic_player import DynamicPlayer
+from Trains.Remote.client_runtime import ClientRuntime
+from Trains.Remote.server import Server
+from Trains.Remote.server_proxy import ServerProxy
+
+
+def get_free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+        return free_socket.getsockname()[1]
+
+
+class TestClientRuntime(unittest.TestCase):
+    def setUp(self):
+        self.game_map = generate_random_map(15, 0.3)
+
+    def create_client(self, port: int, name: str, executor=None) -> ServerProxy:
+        """
+        Creates a ServerProxy for a Hold-10 player. Strategy names are resolved relative to a directory in
+        Trains, so the client is created from the Trains directory.
+        """
+        working_directory = os.getcwd()
+        os.chdir("../../")
+        try:
+            return ServerProxy("127.0.0.1", port, name, "Hold-10", self.game_map, executor=executor)
+        finally:
+            os.chdir(working_directory)
+
+    def test_clients_share_one_event_loop(self):
+        port = get_free_port()
+        clients = [self.create_client(port, f"Player{index}") for index in range(20)]
+        server = Server("127.0.0.1", port, 2, 20, 2)
+        tournament_result = []
+        server_thread = threading.Thread(target=self.run_server, args=(server, tournament_result))
+        server_thread.start()
+        while server.active_server is None:
+            time.sleep(0.01)
+        runtime = ClientRuntime(clients, sign_up_interval=0.005)
+        threads_before = threading.active_count()
+        results = runtime.run()
+        server_thread.join(30)
+
+        self.assertEqual(len(results), 20)
+        self.assertEqual(runtime.failed_sessions, 0)
+        winners, cheaters = tournament_result[0]
+        self.assertEqual(cheaters, [])
+        self.assertGreater(len(winners), 0)
+        self.assertEqual(results.count(True), len(winners))
+        self.assertEqual(server.sign_up_metrics.admitted, 20)
+        self.assertEqual([player.name for player in server.players], [client.player.name for client in clients])
+        self.assertLessEqual(threading.active_count(), threads_before)
+
+    def run_server(self, server: Server, tournament_result: list) -> None:
+        """
+        Runs the server's tournament on a new event loop and appends its winners and cheaters to tournament_result.
+        """
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        tournament_result.append(server.run_server())
+
+    def test_failed_sessions_do_not_stop_the_others(self):
+        clients = [self.create_client(get_free_port(), f"Player{index}") for index in range(3)]
+        runtime = ClientRuntime(clients)
+        self.assertEqual(runtime.run(), [False, False, False])
+        self.assertEqual(runtime.failed_sessions, 3)
+
+    def test_play_is_offloaded_to_an_executor(self):
+        players = [DynamicPlayer("Alice", 2, get_strategy_path("Hold-10")),
+                   DynamicPlayer("Bob", 1, get_strategy_path("Buy-Now"))]
+        referee = Referee(self.game_map, players, rng=4)
+        referee.set_up_game_states()
+        referee.players_pick_destinations()
+        game_state = referee.ref_game_state.get_player_game_state()
+        expected_move = players[0].play(game_state)
+
+        event_loop = asyncio.new_event_loop()
+        with ThreadPoolExecutor(2) as thread_pool, ProcessPoolExecutor(1) as process_pool:
+            for executor in [thread_pool, process_pool]:
+                client = self.create_client(0, "Alice", executor)
+                client.player = players[0]
+                move = event_loop.run_until_complete(client.call_player_method("play", game_state))
+                self.assertEqual(move.get_as_json(), expected_move.get_as_json())
+        event_loop.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
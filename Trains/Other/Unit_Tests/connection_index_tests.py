@@ -0,0 +1,77 @@
+import random
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Common.cards import Hand
+from Trains.Common.connection_index import AcquirableConnectionIndex
+from Trains.Common.map import get_connection_sort_key
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+
+
+class TestAcquirableConnectionIndex(unittest.TestCase):
+    def setUp(self):
+        self.game_map = generate_random_map(20, 0.3)
+        self.connections = set(self.game_map.connections)
+        self.index = AcquirableConnectionIndex(self.connections)
+        self.rng = random.Random(4)
+
+    def get_first_by_scanning(self, connections, hand, rails):
+        for connection in sorted(connections, key=get_connection_sort_key):
+            if rails >= connection.length and hand[connection.color] >= connection.length:
+                return connection
+        return None
+
+    def get_random_hand(self):
+        return Hand({color: self.rng.randint(0, 6) for color in Hand()})
+
+    def test_at_most_twelve_buckets(self):
+        self.assertLessEqual(len(self.index.buckets), 12)
+        self.assertEqual(len(self.index), len(self.connections))
+        for bucket in self.index.buckets.values():
+            self.assertEqual(bucket, sorted(bucket, key=get_connection_sort_key))
+
+    def test_first_acquirable_matches_scan(self):
+        for _ in range(50):
+            hand = self.get_random_hand()
+            rails = self.rng.randint(0, 6)
+            self.assertEqual(self.index.get_first_acquirable_connection(hand, rails),
+                             self.get_first_by_scanning(self.connections, hand, rails))
+        self.assertIsNone(self.index.get_first_acquirable_connection(Hand(), 45))
+
+    def test_acquirable_connections_match_scan(self):
+        hand = self.get_random_hand()
+        expected = {connection for connection in self.connections
+                    if connection.length <= 4 and hand[connection.color] >= connection.length}
+        self.assertEqual(self.index.get_acquirable_connections(hand, 4), expected)
+
+    def test_add_and_remove_keep_order(self):
+        sorted_connections = sorted(self.connections, key=get_connection_sort_key)
+        for connection in sorted_connections[::2]:
+            self.index.remove(connection)
+        self.index.remove(sorted_connections[0])
+        remaining = set(sorted_connections[1::2])
+        hand = Hand({color: 5 for color in Hand()})
+        self.assertEqual(set(self.index.connections), remaining)
+        self.assertEqual(self.index.get_first_acquirable_connection(hand, 45), sorted_connections[1])
+        self.index.add(sorted_connections[0])
+        self.index.add(sorted_connections[1])
+        self.assertEqual(self.index.get_first_acquirable_connection(hand, 45), sorted_connections[0])
+        for bucket in self.index.buckets.values():
+            self.assertEqual(bucket, sorted(bucket, key=get_connection_sort_key))
+
+    def test_sync(self):
+        unacquired = frozenset(self.rng.sample(sorted(self.connections, key=get_connection_sort_key),
+                                               len(self.connections) // 2))
+        index = AcquirableConnectionIndex()
+        index.sync(unacquired)
+        self.assertEqual(index.connections, unacquired)
+        index.sync(list(self.connections))
+        self.assertEqual(index.connections, self.connections)
+        hand = self.get_random_hand()
+        self.assertEqual(index.get_first_acquirable_connection(hand, 5),
+                         self.get_first_by_scanning(self.connections, hand, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import os
+import socket
+import threading
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+from Trains.Other.Mocks.mock_remote_client import MockRemoteClient
+from Trains.Remote.connection_pool import PlayerConnectionPool, requests_persistent_session
+from Trains.Remote.Remote_Player_Proxy import RemotePlayerProxy
+from Trains.Remote.server import Server
+from Trains.Remote.server_proxy import ServerProxy
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.event_loop)
+
+    def tearDown(self):
+        self.event_loop.close()
+        asyncio.set_event_loop(None)
+
+    def create_connected_player(self, name: str):
+        """
+        Returns a RemotePlayerProxy connected to a client socket over a socket pair, and the client socket.
+        """
+        server_socket, client_socket = socket.socketpair()
+        reader, writer = self.event_loop.run_until_complete(asyncio.open_connection(sock=server_socket))
+        return RemotePlayerProxy(name, 0, reader, writer, persistent=True), client_socket
+
+    def create_client(self, port: int, name: str, game_map, persistent: bool) -> ServerProxy:
+        """
+        Creates a ServerProxy for a Hold-10 player. Strategy names are resolved relative to a directory in
+        Trains, so the client is created from the Trains directory.
+        """
+        working_directory = os.getcwd()
+        os.chdir("../../")
+        try:
+            return ServerProxy("127.0.0.1", port, name, "Hold-10", game_map, persistent=persistent)
+        finally:
+            os.chdir(working_directory)
+
+    def test_requests_persistent_session(self):
+        self.assertTrue(requests_persistent_session(["Alice", {"framing": "length-prefixed"}, {"session": "persistent"}]))
+        self.assertFalse(requests_persistent_session(["Alice", {"session": "single"}]))
+        self.assertFalse(requests_persistent_session(["Alice"]))
+
+    def test_refresh_evicts_closed_connections_and_promotes_waiting_clients(self):
+        connections = [self.create_connected_player(f"Player{index}") for index in range(4)]
+        players = [player for player, _ in connections]
+        pool = PlayerConnectionPool(players[:2], 2, max_waiting=2)
+        pool.add_waiting(players[2])
+        pool.add_waiting(players[3])
+        self.assertFalse(pool.can_wait())
+
+        connections[0][1].close()
+        connections[2][1].close()
+        self.event_loop.run_until_complete(asyncio.sleep(0.05))
+        pool.refresh()
+        self.assertEqual(pool.players, [players[1], players[3]])
+        self.assertEqual(len(pool.waiting), 0)
+        self.assertEqual((pool.evicted, pool.promoted), (2, 1))
+        self.assertTrue(players[0].writer.is_closing())
+
+        pool.close()
+        self.assertTrue(all(player.writer.is_closing() for player in players))
+        for _, client_socket in connections:
+            client_socket.close()
+
+    def test_persistent_server_proxy_keeps_playing(self):
+        game_map = generate_random_map(15, 0.3)
+        single_client = self.create_client(0, "Alice", game_map, False)
+        persistent_client = self.create_client(0, "Bob", game_map, True)
+        for client in [single_client, persistent_client]:
+            self.event_loop.run_until_complete(client.execute_method_call(["win", [False]]))
+        self.assertFalse(single_client.game_active)
+        self.assertTrue(persistent_client.game_active)
+        self.assertFalse(persistent_client.in_tournament)
+        self.assertEqual(persistent_client.tournament_results, [False])
+
+    def test_tournaments_reuse_persistent_connections(self):
+        game_map = generate_random_map(15, 0.3)
+        with socket.socket() as free_socket:
+            free_socket.bind(("127.0.0.1", 0))
+            port = free_socket.getsockname()[1]
+        clients = [MockRemoteClient(name, game_map, name != "Dave") for name in ["Alice", "Bob", "Carl", "Dave"]]
+
+        async def play_clients():
+            await asyncio.sleep(0.3)
+            await asyncio.gather(*[client.play("127.0.0.1", port) for client in clients])
+
+        client_thread = threading.Thread(target=asyncio.run, args=(play_clients(),))
+        client_thread.start()
+        server = Server("127.0.0.1", port, 2, 4, 2, rng=1)
+        tournament_results = server.run_tournaments(3)
+        client_thread.join(10)
+
+        self.assertEqual(len(tournament_results), 3)
+        self.assertTrue(all(cheaters == [] for _, cheaters in tournament_results))
+        self.assertEqual(server.sign_up_metrics.admitted, 4)
+        self.assertEqual(server.connection_pool.evicted, 1)
+        self.assertEqual(sorted(player.name for player in server.players), ["Alice", "Bob", "Carl"])
+        for client in clients[:3]:
+            self.assertEqual(len(client.tournament_results), 3)
+        self.assertEqual(len(clients[3].tournament_results), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Common.disjoint_set import DisjointSet
+
+
+class TestDisjointSet(unittest.TestCase):
+    def setUp(self):
+        self.disjoint_set = DisjointSet(["a", "b", "c", "d", "e"])
+        self.disjoint_set.union("a", "b")
+        self.disjoint_set.union("c", "b")
+
+    def test_connected(self):
+        self.assertTrue(self.disjoint_set.connected("a", "c"))
+        self.assertFalse(self.disjoint_set.connected("a", "d"))
+
+    def test_element_not_added(self):
+        self.assertEqual(self.disjoint_set.find("z"), "z")
+        self.assertFalse(self.disjoint_set.connected("z", "a"))
+        self.assertTrue(self.disjoint_set.connected("z", "z"))
+
+    def test_union_adds_elements(self):
+        self.disjoint_set.union("x", "y")
+        self.assertTrue(self.disjoint_set.connected("x", "y"))
+        self.assertEqual(sorted(self.disjoint_set.get_set_sizes()), [1, 1, 2, 3])
+
+    def test_get_sets(self):
+        self.assertEqual(sorted(sorted(elements) for elements in self.disjoint_set.get_sets()),
+                         [["a", "b", "c"], ["d"], ["e"]])
+
+    def test_count_connected_pairs(self):
+        self.assertEqual(self.disjoint_set.count_connected_pairs(), 3)
+        self.disjoint_set.union("d", "e")
+        self.assertEqual(self.disjoint_set.count_connected_pairs(), 4)
+        self.disjoint_set.union("a", "e")
+        self.assertEqual(self.disjoint_set.count_connected_pairs(), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
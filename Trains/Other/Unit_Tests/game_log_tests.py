@@ -0,0 +1,76 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Admin.game_log import GameEventLog, open_game_log
+from Trains.Admin.game_replayer import GameReplayer, ReplayMismatch, replay_game_log
+from Trains.Admin.referee import Referee
+from Trains.Admin.simulation import get_strategy_path
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+from Trains.Other.Mocks.mock_bad_setup_player import MockBadSetUpPlayer
+from Trains.Player.dynamic_player import DynamicPlayer
+
+
+class TestGameLog(unittest.TestCase):
+    def setUp(self):
+        self.game_map = generate_random_map(20, 0.25)
+
+    def create_players(self):
+        return [DynamicPlayer("Alice", 4, get_strategy_path("Hold-10")),
+                DynamicPlayer("Bob", 3, get_strategy_path("Buy-Now")),
+                DynamicPlayer("Carl", 2, get_strategy_path("Cheat")),
+                MockBadSetUpPlayer("Dave", 1)]
+
+    def record_game(self, seed: int) -> list:
+        """
+        Plays a seeded game with an event log and returns the logged events and the referee's scores.
+        """
+        output = io.StringIO()
+        referee = Referee(self.game_map, self.create_players(), rng=seed, event_log=GameEventLog(output))
+        referee.play_game()
+        events = [json.loads(line) for line in output.getvalue().splitlines()]
+        return events, referee.score_game()
+
+    def test_logged_events(self):
+        events, scores = self.record_game(1)
+        event_types = [event["type"] for event in events]
+        self.assertEqual(event_types[0], "boot")
+        self.assertEqual(events[0]["player"], 3)
+        self.assertEqual(event_types[1], "setup")
+        self.assertEqual(events[1]["players"], ["Alice", "Bob", "Carl", "Dave"])
+        self.assertEqual(event_types.count("pick"), 3)
+        self.assertIn({"type": "boot", "player": 2, "reason": "Connection given is not able to be acquired."}, events)
+        self.assertEqual(events[-1], {"type": "scores", "scores": scores})
+
+    def test_replay_reproduces_scores(self):
+        for seed in range(3):
+            events, scores = self.record_game(seed)
+            replayer = GameReplayer()
+            self.assertEqual(replayer.replay(events), scores)
+            self.assertEqual(replayer.banned_player_indices, {2, 3})
+
+    def test_replay_detects_mismatches(self):
+        events, _ = self.record_game(0)
+        draw_event = next(event for event in events if event["type"] == "draw")
+        draw_event["cards"] = ["white" if card != "white" else "red" for card in draw_event["cards"]]
+        with self.assertRaises(ReplayMismatch):
+            GameReplayer().replay(events)
+
+    def test_log_file_with_many_games(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.log")
+            scores = []
+            with open_game_log(path) as event_log:
+                for seed in range(2):
+                    referee = Referee(self.game_map, self.create_players(), rng=seed, event_log=event_log)
+                    referee.play_game()
+                    scores.append(referee.score_game())
+            self.assertEqual(replay_game_log(path), scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Admin.instrumentation import LATENCY_BUCKET_BOUNDS, MUTATION_METRIC, SCORING_METRIC, \
+    STATE_BUILD_METRIC, TURN_OVERHEAD_METRIC, VALIDATION_METRIC, LatencyHistogram, MetricsRegistry, \
+    get_player_method_metric
+from Trains.Admin.manager import Manager
+from Trains.Admin.referee import Referee
+from Trains.Admin.simulation import get_strategy_path
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+from Trains.Other.Mocks.mock_tournament_player import MockTournamentPlayer
+from Trains.Player.dynamic_player import DynamicPlayer
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.000003)
+        for _ in range(10):
+            histogram.record(0.5)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.get_mean(), (90 * 0.000003 + 10 * 0.5) / 100)
+        self.assertEqual(histogram.get_percentile(50), LATENCY_BUCKET_BOUNDS[2])
+        self.assertEqual(histogram.get_percentile(90), LATENCY_BUCKET_BOUNDS[2])
+        self.assertEqual(histogram.get_percentile(99), 0.5)
+        histogram.record(10 ** 6)
+        self.assertEqual(histogram.get_percentile(100), 10 ** 6)
+        histogram_json = histogram.get_as_json()
+        self.assertEqual(sum(histogram_json["buckets"].values()), 101)
+        self.assertEqual(histogram_json["buckets"]["inf"], 1)
+        self.assertEqual(LatencyHistogram().get_as_json()["p99"], 0.0)
+
+    def test_combined_histogram(self):
+        metrics = MetricsRegistry()
+        metrics.record("player.play", 0.001, "Alice")
+        metrics.record("player.play", 0.004, "Bob")
+        metrics.record("player.play", 0.002, "Bob")
+        combined_histogram = metrics.get_combined_histogram("player.play")
+        self.assertEqual(combined_histogram.count, 3)
+        self.assertAlmostEqual(combined_histogram.total, 0.007)
+        self.assertEqual((combined_histogram.minimum, combined_histogram.maximum), (0.001, 0.004))
+        self.assertEqual(metrics.get_combined_histogram("player.pick").count, 0)
+        self.assertEqual(metrics.get_histogram("player.play", "Bob").count, 2)
+
+    def test_referee_records_player_calls_and_bookkeeping(self):
+        metrics = MetricsRegistry()
+        players = [DynamicPlayer("Alice", 2, get_strategy_path("Hold-10")),
+                   DynamicPlayer("Bob", 1, get_strategy_path("Buy-Now"))]
+        Referee(generate_random_map(20, 0.25), players, rng=3, metrics=metrics).play_game()
+        play_histograms = metrics.histograms[get_player_method_metric("play")]
+        self.assertEqual(set(play_histograms), {"Alice", "Bob"})
+        turns = sum(histogram.count for histogram in play_histograms.values())
+        self.assertEqual(metrics.get_histogram(STATE_BUILD_METRIC).count, turns)
+        self.assertEqual(metrics.get_histogram(TURN_OVERHEAD_METRIC).count, turns)
+        self.assertGreater(metrics.get_histogram(VALIDATION_METRIC).count, 0)
+        self.assertGreater(metrics.get_histogram(MUTATION_METRIC).count, 0)
+        self.assertEqual(metrics.get_histogram(SCORING_METRIC).count, 1)
+        self.assertEqual(metrics.get_histogram(get_player_method_metric("setup"), "Alice").count, 1)
+
+    def test_manager_dumps_metrics(self):
+        metrics = MetricsRegistry()
+        map_path = "../../../Trains/Other/Examples/Maps/default_map1.json"
+        players = [MockTournamentPlayer(f"player{index}", index, game_map_file_path=map_path) for index in range(4)]
+        with tempfile.TemporaryDirectory() as directory:
+            metrics_path = os.path.join(directory, "metrics.json")
+            Manager(players, rng=1, metrics=metrics, metrics_path=metrics_path).run_tournament()
+            with open(metrics_path) as metrics_file:
+                metrics_json = json.load(metrics_file)
+        self.assertEqual(set(metrics_json[get_player_method_metric("start")]),
+                         {"player0", "player1", "player2", "player3"})
+        self.assertEqual(metrics_json[get_player_method_metric("start")]["player0"]["count"], 1)
+        self.assertIn(get_player_method_metric("play"), metrics_json)
+        self.assertIn(SCORING_METRIC, metrics_json)
+
+
+if __name__ == '__main__':
+    unittest.main()
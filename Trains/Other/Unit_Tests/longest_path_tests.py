@@ -0,0 +1,61 @@
+import unittest
+import sys
+
+sys.path.append('../../../')
+
+from Trains.Common.map import Connection, City, Color
+from Trains.Admin.longest_path import find_longest_path_length, build_weighted_adjacency, get_connected_components
+
+
+class TestLongestPath(unittest.TestCase):
+    def setUp(self):
+        self.boston = City("Boston", 70, 80)
+        self.new_york = City("New York", 60, 70)
+        self.philadelphia = City("Philadelphia", 90, 10)
+        self.austin = City("Austin", 50, 10)
+        self.boise = City("Boise", 30, 50)
+        self.wdc = City("Washington D.C.", 55, 60)
+
+        self.boston_new_york_blue = Connection(frozenset({self.boston, self.new_york}), Color.BLUE, 3)
+        self.boston_new_york_red = Connection(frozenset({self.boston, self.new_york}), Color.RED, 5)
+        self.new_york_philadelphia = Connection(frozenset({self.new_york, self.philadelphia}), Color.RED, 4)
+        self.boston_philadelphia = Connection(frozenset({self.boston, self.philadelphia}), Color.GREEN, 4)
+        self.philadelphia_wdc = Connection(frozenset({self.philadelphia, self.wdc}), Color.WHITE, 5)
+        self.austin_boise = Connection(frozenset({self.austin, self.boise}), Color.RED, 5)
+
+    def test_no_connections(self):
+        self.assertEqual(find_longest_path_length(set()), 0)
+
+    def test_single_connection(self):
+        self.assertEqual(find_longest_path_length({self.boston_new_york_blue}), 3)
+
+    def test_parallel_connections_use_longest(self):
+        connections = {self.boston_new_york_blue, self.boston_new_york_red}
+        self.assertEqual(find_longest_path_length(connections), 5)
+
+    def test_cities_are_not_revisited(self):
+        # Triangle plus a tail: the best path walks the tail and two sides of the triangle
+        connections = {self.boston_new_york_red, self.new_york_philadelphia, self.boston_philadelphia,
+                       self.philadelphia_wdc}
+        self.assertEqual(find_longest_path_length(connections), 5 + 4 + 5)
+
+    def test_disjoint_components(self):
+        connections = {self.boston_new_york_blue, self.new_york_philadelphia, self.austin_boise}
+        self.assertEqual(find_longest_path_length(connections), 7)
+
+    def test_build_weighted_adjacency(self):
+        adjacency = build_weighted_adjacency({self.boston_new_york_blue, self.boston_new_york_red,
+                                              self.new_york_philadelphia})
+        self.assertEqual(adjacency[self.boston], {self.new_york: 5})
+        self.assertEqual(adjacency[self.new_york], {self.boston: 5, self.philadelphia: 4})
+
+    def test_get_connected_components(self):
+        adjacency = build_weighted_adjacency({self.boston_new_york_blue, self.austin_boise})
+        components = get_connected_components(adjacency)
+        self.assertEqual(len(components), 2)
+        self.assertIn({self.boston, self.new_york}, components)
+        self.assertIn({self.austin, self.boise}, components)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,9 @@ import sys, json, unittest
 sys.path.append('../../../')
 from Trains.Admin.referee import NotEnoughDestinations
 from Trains.Common.map import City, Color, Connection
+from Trains.Admin.game_random import derive_rng
 from Trains.Admin.manager import Manager
+from Trains.Admin.parallel_round import ParallelRoundExecutor
 from Trains.Other.Mocks.mock_tournament_player import MockTournamentCheaterEnd, MockTournamentCheaterStart, MockTournamentPlayer, MockTournamentPlayerNoMap
 from Trains.Other.Mocks.configurable_manager import ConfigurableManager
 from Trains.Player.moves import AcquireConnectionMove, DrawCardMove
@@ -405,5 +407,60 @@ class TestManager(unittest.TestCase):
         self.assertEqual(len(manager.eliminated_players), 0)
         self.assertEqual(len(manager.banned_players), num_players)
 
+    def test_run_tournament_round_parallel_matches_sequential(self):
+        bogus_connection = Connection(frozenset({City("Nowhere", 50, 50), City("The Void", 100, 100)}), Color.BLUE, 4)
+        players = deepcopy(self.draw_players[0:11])
+        players.append(MockTournamentPlayer("cheater", 999, AcquireConnectionMove(bogus_connection)))
+        sequential_manager = Manager(deepcopy(players), self.create_red_deck(40))
+        with ParallelRoundExecutor(2) as round_executor:
+            parallel_manager = Manager(deepcopy(players), self.create_red_deck(40), round_executor)
+            for manager in [sequential_manager, parallel_manager]:
+                manager.tournament_map = self.default_game_map
+                manager.run_tournament_round(manager.assign_players_to_games())
+
+        self.assertEqual([player.name for player in parallel_manager.active_players],
+                         [player.name for player in sequential_manager.active_players])
+        self.assertEqual([player.name for player in parallel_manager.banned_players], ["cheater"])
+        self.assertEqual([player.name for player in sequential_manager.banned_players], ["cheater"])
+        # Results are mapped back onto the manager's own player objects
+        for player in parallel_manager.banned_players:
+            self.assertNotIn(player, parallel_manager.active_players)
+
+    def test_seeded_rounds_are_identical(self):
+        players = [Hold_10_Player(f"hold10 {index}", index) for index in range(5)] \
+            + [Buy_Now_Player(f"buynow {index}", index + 5) for index in range(5)]
+        round_results = []
+        with ParallelRoundExecutor(2) as round_executor:
+            managers = [Manager(deepcopy(players), rng=11), Manager(deepcopy(players), rng=11),
+                        Manager(deepcopy(players), round_executor=round_executor, rng=11)]
+            for manager in managers:
+                manager.tournament_map = self.default_game_map
+                manager.run_tournament_round(manager.assign_players_to_games())
+                round_results.append(([player.name for player in manager.active_players],
+                                      [player.name for player in manager.banned_players]))
+        self.assertEqual(round_results[0], round_results[1])
+        self.assertEqual(round_results[0], round_results[2])
+
+    def test_parallel_rounds_reuse_worker_pool(self):
+        players = [Hold_10_Player(f"hold10 {index}", index) for index in range(8)]
+        round_executor = ParallelRoundExecutor(2)
+        manager = Manager(deepcopy(players), round_executor=round_executor, rng=3)
+        manager.tournament_map = self.default_game_map
+        manager.run_tournament_round(manager.assign_players_to_games())
+        pool = round_executor.pool
+        self.assertIsNotNone(pool)
+        manager.run_tournament_round(manager.assign_players_to_games())
+        self.assertIs(round_executor.pool, pool)
+        round_executor.close()
+        self.assertIsNone(round_executor.pool)
+
+    def test_game_rng_is_derived_from_seed_round_and_game(self):
+        manager = Manager(deepcopy(self.draw_players), rng=11)
+        self.assertIsNone(Manager(deepcopy(self.draw_players)).get_game_rng(0))
+        self.assertEqual(manager.get_game_rng(2).random(), derive_rng(11, 0, 2).random())
+        self.assertNotEqual(manager.get_game_rng(2).random(), manager.get_game_rng(3).random())
+        manager.round_index += 1
+        self.assertEqual(manager.get_game_rng(2).random(), derive_rng(11, 1, 2).random())
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,8 @@
 import sys
 sys.path.append('../../../')
 
+import functools
+import pickle
 import unittest
 from Trains.Common.map import City, Connection, Color, Destination, Map
 
@@ -158,6 +160,11 @@ class TestMap(unittest.TestCase):
         self.connections = {self.connection1, self.connection2, self.connection3}
         self.test_map = Map(self.cities, self.connections)
 
+    def create_map_with_all_connections(self) -> Map:
+        cities = {self.boston, self.new_york, self.philadelphia, self.los_angeles, self.austin, self.wdc}
+        connections = {self.connection1, self.connection2, self.connection3, self.connection4, self.connection5}
+        return Map(cities, connections)
+
     def test_constructor(self):
         boston = City("Boston", 70, 80)
         new_york = City("New York", 60, 70)
@@ -217,6 +224,18 @@ class TestMap(unittest.TestCase):
         map_copy = self.test_map.get_copy_of_map()
         self.assertTrue(map_copy == self.test_map)
 
+    def test_get_copy_of_map_is_immutable(self):
+        map_copy = self.test_map.get_copy_of_map()
+        with self.assertRaises(AttributeError):
+            map_copy.connections.add(self.connection4)
+        self.assertEqual(map_copy.get_feasible_destinations(map_copy.connections),
+                         self.test_map.get_feasible_destinations(self.test_map.connections))
+
+    def test_get_all_connections_snapshot_shared(self):
+        self.assertIs(self.test_map.get_all_connections(), self.test_map.get_all_connections())
+        self.assertIsInstance(self.test_map.get_all_connections(), frozenset)
+        self.assertIs(self.test_map.get_all_cities(), self.test_map.cities)
+
     def test_get_city_names(self):
         names1 = {"Boston", "New York", "Philadelphia"}
         names2 = {"New York", "Philadelphia", "Boston"}
@@ -276,11 +295,72 @@ class TestMap(unittest.TestCase):
         dest6 = Destination({self.boston, self.wdc})
         dest7 = Destination({self.wdc, self.philadelphia})
 
-        self.connections.add(self.connection4)
-        self.connections.add(self.connection5)
-        self.assertEqual(self.test_map.get_feasible_destinations(self.test_map.connections),
+        test_map = self.create_map_with_all_connections()
+        self.assertEqual(test_map.get_feasible_destinations(test_map.connections),
                          {dest1, dest2, dest3, dest4, dest5, dest6, dest7})
 
+    def test_get_all_terminal_cities_from_city_player_connections(self):
+        cities = {self.boston, self.new_york, self.philadelphia, self.wdc}
+        connections = {self.connection1, self.connection2, self.connection3, self.connection5}
+        test_map = Map(cities, connections)
+        player_connections = {self.connection1, self.connection5}
+        self.assertEqual(test_map.get_all_terminal_cities_from_city(self.boston, player_connections), [self.new_york])
+        self.assertEqual(test_map.get_all_terminal_cities_from_city(self.austin, player_connections), [])
+
+    def test_get_all_terminal_cities_from_city_connections_not_on_map(self):
+        connections = {self.connection4}
+        self.assertEqual(self.test_map.get_all_terminal_cities_from_city(self.austin, connections), [self.los_angeles])
+
+    def test_get_adjacency_view_neighbors(self):
+        self.assertEqual(set(self.test_map.get_adjacency_view(self.connections).get_neighbors(self.boston)),
+                         {self.new_york, self.philadelphia})
+        self.assertEqual(self.test_map.get_adjacency_view({self.connection1}).get_neighbors(self.boston),
+                         [self.new_york])
+
+    def test_get_feasible_destinations_player_connections(self):
+        self.assertEqual(self.test_map.get_feasible_destinations({self.connection1}),
+                         {Destination({self.boston, self.new_york})})
+
+    def test_map_ignores_changes_to_given_sets(self):
+        sorted_connections = self.test_map.get_sorted_connections()
+        self.cities.add(self.wdc)
+        self.connections.remove(self.connection1)
+        self.connections.add(self.connection5)
+        self.assertEqual(self.test_map.get_all_cities(), {self.boston, self.new_york, self.philadelphia})
+        self.assertEqual(self.test_map.get_all_connections(), {self.connection1, self.connection2, self.connection3})
+        self.assertEqual(set(self.test_map.get_sorted_connections()), self.test_map.get_all_connections())
+        self.assertIs(self.test_map.get_sorted_connections(), sorted_connections)
+        self.assertEqual(self.test_map.get_all_terminal_cities_from_city(self.wdc, self.test_map.connections), [])
+
+    def test_are_connected(self):
+        test_map = self.create_map_with_all_connections()
+        self.assertTrue(test_map.are_connected(self.boston, self.wdc, test_map.connections))
+        self.assertFalse(test_map.are_connected(self.boston, self.austin, test_map.connections))
+        self.assertFalse(test_map.are_connected(self.boston, self.boston, test_map.connections))
+        self.assertFalse(test_map.are_connected(self.boston, self.philadelphia, {self.connection1}))
+
+    def test_count_feasible_destinations(self):
+        self.assertEqual(self.test_map.count_feasible_destinations(self.test_map.connections), 3)
+        test_map = self.create_map_with_all_connections()
+        self.assertEqual(test_map.count_feasible_destinations(test_map.connections), 7)
+        self.assertEqual(test_map.count_feasible_destinations({self.connection1, self.connection4}), 2)
+
+    def test_get_connections_with_color_and_length(self):
+        self.assertEqual(self.test_map.get_connections_with_color_and_length(Color.RED, 3), {self.connection2})
+        self.assertEqual(self.test_map.get_connections_with_color_and_length(Color.RED, 5), set())
+
+    def test_get_sorted_connections(self):
+        sorted_connections = self.test_map.get_sorted_connections()
+        self.assertEqual(list(sorted_connections),
+                         sorted(self.connections, key=functools.cmp_to_key(Connection.__lt__)))
+        self.assertIs(self.test_map.get_sorted_connections(), sorted_connections)
+
+    def test_connection_sort_key_and_hash_survive_pickling(self):
+        connection = pickle.loads(pickle.dumps(self.connection1))
+        self.assertEqual(connection.sort_key, self.connection1.sort_key)
+        self.assertEqual(hash(connection), hash(self.connection1))
+        self.assertIn(connection, self.test_map.connections)
+
     def test_get_map_as_json(self):
         cities = {self.boston, self.new_york}
         connections = {self.connection1}
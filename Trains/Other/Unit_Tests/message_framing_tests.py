@@ -0,0 +1,168 @@
+import asyncio
+import json
+import socket
+import unittest
+from unittest import mock
+import sys
+
+sys.path.append('../../../')
+from Trains.Remote.message_framing import LENGTH_PREFIXED_FRAMING, NEWLINE_FRAMING, RAW_FRAMING, NO_MESSAGE, \
+    FRAMING_KEY, LENGTH_PREFIX, MessageDecoder, MessageReader, MessageTooLarge, encode_message
+from Trains.Remote.networking_constants import MAX_MESSAGE_SIZE
+from Trains.Remote.Remote_Player_Proxy import RemotePlayerProxy
+from Trains.Remote.server import Server
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+
+FRAMINGS = [RAW_FRAMING, NEWLINE_FRAMING, LENGTH_PREFIXED_FRAMING]
+
+
+class TestMessageDecoder(unittest.TestCase):
+    def setUp(self):
+        self.messages = [["win", [True]], ["end", [True]], "more cards", {"framing": "raw"}, None,
+                         ["pick", [["a\nb", "ü"]]]]
+
+    def test_coalesced_messages(self):
+        for framing in FRAMINGS:
+            decoder = MessageDecoder(framing)
+            decoder.feed(b"".join(encode_message(message, framing) for message in self.messages))
+            self.assertEqual(decoder.next_messages(), self.messages)
+            self.assertEqual(decoder.next_message(), NO_MESSAGE)
+            self.assertEqual(len(decoder.buffer), 0)
+
+    def test_messages_split_byte_by_byte(self):
+        for framing in FRAMINGS:
+            decoder = MessageDecoder(framing)
+            received = []
+            data = b"".join(encode_message(message, framing) for message in self.messages)
+            for index in range(len(data)):
+                decoder.feed(data[index:index + 1])
+                received += decoder.next_messages()
+            self.assertEqual(received, self.messages)
+
+    def test_raw_whitespace_between_messages(self):
+        decoder = MessageDecoder()
+        decoder.feed(b'  ["win", [true]]\n ["end", [false]]  ')
+        self.assertEqual(decoder.next_messages(), [["win", [True]], ["end", [False]]])
+
+    def test_raw_trims_once_per_batch(self):
+        decoder = MessageDecoder(NEWLINE_FRAMING)
+        data = encode_message("ü") + encode_message(["end", [True]])
+        decoder.feed(data[:2])
+        decoder.set_framing(RAW_FRAMING)
+        decoder.feed(data[2:])
+        self.assertEqual(decoder.next_message(), "ü")
+        self.assertEqual(len(decoder.buffer), len(data))
+        self.assertEqual(decoder.next_message(), ["end", [True]])
+        self.assertEqual(decoder.next_message(), NO_MESSAGE)
+        self.assertEqual((len(decoder.buffer), decoder.text), (0, ""))
+
+    def test_raw_invalid_json(self):
+        decoder = MessageDecoder()
+        decoder.feed(b'["win", tru]')
+        self.assertRaises(json.JSONDecodeError, decoder.next_message)
+
+    def test_newline_invalid_json(self):
+        decoder = MessageDecoder(NEWLINE_FRAMING)
+        decoder.feed(b'["win", \n')
+        self.assertRaises(json.JSONDecodeError, decoder.next_message)
+
+    def test_set_framing_decodes_buffered_data(self):
+        decoder = MessageDecoder()
+        decoder.feed(encode_message({FRAMING_KEY: LENGTH_PREFIXED_FRAMING}) +
+                     encode_message(["start", []], LENGTH_PREFIXED_FRAMING))
+        self.assertEqual(decoder.next_message(), {FRAMING_KEY: LENGTH_PREFIXED_FRAMING})
+        decoder.set_framing(LENGTH_PREFIXED_FRAMING)
+        self.assertEqual(decoder.next_message(), ["start", []])
+
+    def test_length_prefix_above_max_message_size(self):
+        decoder = MessageDecoder(LENGTH_PREFIXED_FRAMING)
+        decoder.feed(LENGTH_PREFIX.pack(MAX_MESSAGE_SIZE + 1) + b"[")
+        self.assertRaises(MessageTooLarge, decoder.next_message)
+
+    @mock.patch("Trains.Remote.message_framing.MAX_MESSAGE_SIZE", 16)
+    def test_unterminated_messages_above_max_message_size(self):
+        for framing in [NEWLINE_FRAMING, RAW_FRAMING]:
+            decoder = MessageDecoder(framing)
+            decoder.feed(b'["more cards", "')
+            self.assertEqual(decoder.next_message(), NO_MESSAGE)
+            decoder.feed(b"x")
+            self.assertRaises(MessageTooLarge, decoder.next_message)
+
+    @mock.patch("Trains.Remote.message_framing.MAX_MESSAGE_SIZE", 16)
+    def test_remote_player_closes_connection_on_message_too_large(self):
+        async def exchange():
+            server_socket, client_socket = socket.socketpair()
+            reader, writer = await asyncio.open_connection(sock=server_socket)
+            player = RemotePlayerProxy("Alice", 1, reader, writer)
+            client_socket.sendall(b'["more cards and then some more"]')
+            with self.assertRaises(MessageTooLarge):
+                await player.tcp_communicate_async(["play", []])
+            self.assertTrue(writer.is_closing())
+            client_socket.close()
+
+        asyncio.run(exchange())
+
+
+class TestMessageReaderOverLoopback(unittest.TestCase):
+    def setUp(self):
+        # Large enough that its JSON takes many reads.
+        self.game_map = generate_random_map(200, 0.1)
+
+    def play_start_exchange(self, sign_up_message: list, framing: str) -> tuple:
+        """
+        Signs a hand-written client up with a Server over loopback and has the server ask it for a map.
+        Returns the name and framing of the RemotePlayerProxy the server created, and the map it received.
+        """
+        server = Server("127.0.0.1", 0, 2, 8, 1)
+        created_players = []
+
+        async def on_client_connection(reader, writer):
+            player = await server.create_player(reader, writer)
+            created_players.append(player)
+            created_players.append(await player.start_async())
+            writer.close()
+
+        async def exchange():
+            listener = await asyncio.start_server(on_client_connection, "127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            message_reader = MessageReader(reader)
+            writer.write(encode_message(sign_up_message))
+            client_framing = RAW_FRAMING
+            message = await message_reader.read_message()
+            if message == {FRAMING_KEY: framing}:
+                client_framing = framing
+                message_reader.set_framing(framing)
+                message = await message_reader.read_message()
+            self.assertEqual(message, ["start", []])
+            writer.write(encode_message(self.game_map.get_as_json(), client_framing))
+            await writer.drain()
+            while len(created_players) < 2:
+                await asyncio.sleep(0.01)
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return client_framing
+
+        client_framing = asyncio.run(exchange())
+        player, suggested_map = created_players
+        self.assertEqual(player.framing, client_framing)
+        return player.name, player.framing, suggested_map
+
+    def test_legacy_sign_up_uses_raw_framing(self):
+        name, framing, suggested_map = self.play_start_exchange(["Alice"], RAW_FRAMING)
+        self.assertEqual(name, "Alice")
+        self.assertEqual(framing, RAW_FRAMING)
+        self.assertEqual(suggested_map, self.game_map)
+
+    def test_negotiated_framings(self):
+        for requested_framing in [NEWLINE_FRAMING, LENGTH_PREFIXED_FRAMING]:
+            name, framing, suggested_map = \
+                self.play_start_exchange(["Bob", {FRAMING_KEY: requested_framing}], requested_framing)
+            self.assertEqual(name, "Bob")
+            self.assertEqual(framing, requested_framing)
+            self.assertEqual(suggested_map, self.game_map)
+
+
+if __name__ == '__main__':
+    unittest.main()
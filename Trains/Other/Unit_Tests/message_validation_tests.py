@@ -0,0 +1,96 @@
+import json
+import random
+import sys
+import unittest
+from collections import deque
+
+sys.path.append('../../../')
+from Trains.Admin.referee_game_state import RefereeGameState
+from Trains.Common.map import City, Color, Connection, Destination, Map
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Remote.messages.message_schemas import MAP_SCHEMA, PLAY_SCHEMA
+from Trains.Remote.messages.schema_validators import get_schema_validator, is_valid_json
+from Trains.Remote.messages.valdiate_server_message import is_valid_play_args, validate_server_message
+from Trains.Remote.messages.validate_client_message import validate_action_message
+from Trains.Remote.messages.validate_map_info import validate_destination_plus, validate_map_json
+
+REPLACEMENT_VALUES = [True, 7, 2.5, "red", [], {}, None, [["Boston", [1, 2]]]]
+
+
+def get_paths(value, path=()):
+    """Returns the path (keys and indices) to every value nested in pythonic JSON."""
+    paths = [path]
+    if isinstance(value, list):
+        for index, item in enumerate(value):
+            paths += get_paths(item, path + (index,))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            paths += get_paths(item, path + (key,))
+    return paths
+
+
+def replace_at_path(value, path, replacement):
+    """Returns a copy of pythonic JSON with the value at a path replaced."""
+    if len(path) == 0:
+        return replacement
+    copied = list(value) if isinstance(value, list) else dict(value)
+    copied[path[0]] = replace_at_path(value[path[0]], path[1:], replacement)
+    return copied
+
+
+class TestMessageValidation(unittest.TestCase):
+    def setUp(self):
+        boston = City("Boston", 70, 80)
+        new_york = City("New York", 60, 70)
+        philadelphia = City("Philadelphia", 60, 70)
+        self.connection1 = Connection(frozenset({boston, new_york}), Color.BLUE, 3)
+        self.connection2 = Connection(frozenset({philadelphia, new_york}), Color.RED, 3)
+        self.connection3 = Connection(frozenset({boston, philadelphia}), Color.GREEN, 4)
+        self.test_map = Map({boston, new_york, philadelphia}, {self.connection1, self.connection2, self.connection3})
+        destinations = {Destination({new_york, philadelphia}), Destination({new_york, boston})}
+        cards = {Color.RED: 5, Color.BLUE: 6, Color.GREEN: 7, Color.WHITE: 8}
+        pgs1 = PlayerGameState(set(), dict(cards), 10, set(destinations), dict(), [])
+        pgs2 = PlayerGameState({self.connection3}, dict(cards), 10, set(destinations), dict(), [])
+        self.rgs = RefereeGameState(self.test_map, deque([Color.RED]), [pgs1, pgs2])
+        self.play_args = json.loads(json.dumps([self.rgs.get_player_game_state().get_as_json()]))
+
+    def test_validators_are_cached(self):
+        self.assertIs(get_schema_validator(PLAY_SCHEMA), get_schema_validator(PLAY_SCHEMA))
+        self.assertIsNot(get_schema_validator(PLAY_SCHEMA), get_schema_validator(MAP_SCHEMA))
+
+    def test_validate_server_message(self):
+        self.assertTrue(validate_server_message(["play", self.play_args]))
+        self.assertTrue(validate_server_message(["play", self.play_args], use_fast_path=False))
+        self.assertTrue(validate_server_message(["win", [True]]))
+        self.assertTrue(validate_server_message(["pick", [[self.connection1.get_as_json()[:2]]]]))
+        self.assertFalse(validate_server_message(["win", ["yes"]]))
+        self.assertFalse(validate_server_message(["fly", []]))
+        self.assertFalse(validate_server_message(["play"]))
+        self.assertFalse(validate_server_message({"play": self.play_args}))
+
+    def test_fast_play_validation_agrees_with_schema(self):
+        rng = random.Random(0)
+        self.rgs.add_connection_to_active_player(self.connection1)
+        acquired_args = json.loads(json.dumps([self.rgs.get_player_game_state().get_as_json()]))
+        for play_args in [self.play_args, acquired_args, [], [{}], [self.play_args[0], 1], "play"]:
+            self.assertEqual(is_valid_play_args(play_args), is_valid_json(play_args, PLAY_SCHEMA))
+            paths = get_paths(play_args)
+            for _ in range(300):
+                mutated = replace_at_path(play_args, rng.choice(paths), rng.choice(REPLACEMENT_VALUES))
+                self.assertEqual(is_valid_play_args(mutated), is_valid_json(mutated, PLAY_SCHEMA), mutated)
+
+    def test_validate_action_message(self):
+        self.assertTrue(validate_action_message("more cards"))
+        self.assertTrue(validate_action_message(self.connection1.get_as_json()))
+        self.assertFalse(validate_action_message(["Boston", [70, 80], "blue", "three"]))
+        self.assertFalse(validate_action_message(3))
+
+    def test_validate_map_json(self):
+        self.assertTrue(validate_map_json(self.test_map.get_as_json()))
+        self.assertFalse(validate_map_json({"width": "800"}))
+        self.assertTrue(validate_destination_plus([self.connection1.get_as_json()[:2]]))
+        self.assertFalse(validate_destination_plus(["Boston", "New York"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
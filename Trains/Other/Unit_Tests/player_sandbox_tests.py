@@ -0,0 +1,81 @@
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Admin.player_sandbox import PlayerSandboxError, PlayerSandboxPool, PlayerTimeout
+from Trains.Admin.referee import Referee
+from Trains.Admin.simulation import get_strategy_path
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+from Trains.Other.Mocks.mock_bad_setup_player import MockBadSetUpPlayer
+from Trains.Other.Mocks.mock_stalling_player import MockStallingPlayer
+from Trains.Player.dynamic_player import DynamicPlayer
+
+
+class TestPlayerSandbox(unittest.TestCase):
+    def setUp(self):
+        self.game_map = generate_random_map(15, 0.3)
+        self.pool = PlayerSandboxPool(size=3, timeout=1.0)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def create_players(self):
+        return [DynamicPlayer("Alice", 3, get_strategy_path("Hold-10")),
+                DynamicPlayer("Bob", 2, get_strategy_path("Buy-Now")),
+                DynamicPlayer("Carl", 1, get_strategy_path("Hold-10"))]
+
+    def get_result_names(self, game_result):
+        game_rankings, cheaters = game_result
+        return [[(player.name, score) for player, score in rank] for rank in game_rankings], \
+            [player.name for player in cheaters]
+
+    def test_sandboxed_game_matches_in_process_game(self):
+        in_process_result = Referee(self.game_map, self.create_players(), rng=5).play_game()
+        sandboxed_players = [self.pool.sandbox(player) for player in self.create_players()]
+        sandboxed_result = Referee(self.game_map, sandboxed_players, rng=5).play_game()
+        self.assertEqual(self.get_result_names(sandboxed_result), self.get_result_names(in_process_result))
+        self.assertTrue(all(player in sandboxed_players for rank in sandboxed_result[0] for player, _ in rank))
+        for player in sandboxed_players:
+            player.close()
+
+    def test_workers_are_reused(self):
+        player = self.pool.sandbox(self.create_players()[0])
+        process = player.worker.process
+        player.close()
+        self.assertIn(process, [worker.process for worker in self.pool.idle_workers])
+        for _ in range(3):
+            players = [self.pool.sandbox(player) for player in self.create_players()]
+            Referee(self.game_map, players, rng=1).play_game()
+            for player in players:
+                player.close()
+        self.assertEqual(self.pool.workers_started, 3)
+
+    def test_stalling_player_is_booted_on_timeout(self):
+        players = [self.pool.sandbox(player) for player in self.create_players()[:2]]
+        stalling_player = self.pool.sandbox(MockStallingPlayer("Dave", 0))
+        game_rankings, cheaters = Referee(self.game_map, players + [stalling_player], rng=2).play_game()
+        self.assertEqual(cheaters, [stalling_player])
+        self.assertIsNone(stalling_player.worker)
+        self.assertEqual(len(self.pool.idle_workers), 1)
+        with self.assertRaises(PlayerSandboxError):
+            stalling_player.start()
+        for player in players:
+            player.close()
+
+    def test_method_deadlines(self):
+        pool = PlayerSandboxPool(size=1, timeout=1.0, method_timeouts={"setup": 0.2})
+        player = pool.sandbox(MockStallingPlayer("Dave", 0, "setup"))
+        with self.assertRaises(PlayerTimeout):
+            player.setup(self.game_map, 45, {})
+        pool.close()
+
+    def test_player_exceptions_are_raised(self):
+        player = self.pool.sandbox(MockBadSetUpPlayer("Erin", 0))
+        with self.assertRaises(PlayerSandboxError):
+            player.setup(self.game_map, 45, {})
+        self.assertIsNotNone(player.worker)
+        player.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-import unittest, sys, os
+import unittest, sys, os, shutil, tempfile
 
 
 sys.path.append('../../../')
@@ -10,7 +10,7 @@ from Trains.Player.moves import MoveType
 from Trains.Player.strategy import PlayerStrategyInterface, AbstractPlayerStrategy
 from Trains.Player.buy_now_player import Buy_Now_Player
 from Trains.Player.hold_10_player import Hold_10_Player
-from Trains.Player.dynamic_player import DynamicPlayer
+from Trains.Player.dynamic_player import DynamicPlayer, StrategyCache
 from Trains.Player.player import PlayerInterface
 from Trains.Other.Strategies.dynamic_hold_10 import Dynamic_Hold_10
 
@@ -236,6 +236,16 @@ class TestPlayerHold10(unittest.TestCase):
         self.assertEqual(self.test_h10.strategy.get_lexicographic_order_of_connections([self.connection1, self.connection2, \
             self.connection3, self.connection4]), [self.connection4, self.connection1, self.connection3, self.connection2])
 
+    def test_get_lex_order_connections_filters_map_order(self):
+        self.test_h10.setup(self.game_map, self.t10_initial_rails, self.t10_initial_cards)
+        self.assertIs(self.test_h10.strategy.connection_order, self.game_map.get_sorted_connections())
+        self.assertEqual(self.test_h10.strategy.get_lexicographic_order_of_connections({self.connection7, self.connection5, \
+            self.connection8, self.connection4}), [self.connection4, self.connection8, self.connection5, self.connection7])
+        # Connections that are not in the map's order are sorted
+        other_connection = Connection(frozenset({self.austin, self.houston}), Color.RED, 3)
+        self.assertEqual(self.test_h10.strategy.get_lexicographic_order_of_connections([self.connection1, other_connection]),
+            [other_connection, self.connection1])
+
 
 class TestPlayerBuyNow(unittest.TestCase):
     def setUp(self):
@@ -480,5 +490,26 @@ class TestPlayerDynamicallyLoadedStrategy(unittest.TestCase):
         self.assertTrue(isinstance(rel_dh10.strategy, PlayerStrategyInterface))
         self.assertEqual(type(rel_dh10.strategy).__name__, Dynamic_Hold_10.__name__)
 
+    def test_strategy_file_is_loaded_once(self):
+        strategy_cache = StrategyCache()
+        first_class = strategy_cache.get_strategy_class(self.abs_filepath)
+        self.assertIs(strategy_cache.get_strategy_class(self.abs_filepath), first_class)
+        self.assertEqual(strategy_cache.get_stats(), {"hits": 1, "misses": 1, "entries": 1})
+        player1 = DynamicPlayer(self.name, self.age, self.abs_filepath)
+        player2 = DynamicPlayer(self.name, self.age, self.rel_filepath)
+        self.assertIs(type(player1.strategy), type(player2.strategy))
+        self.assertIsNot(player1.strategy, player2.strategy)
+
+    def test_modified_strategy_file_is_reloaded(self):
+        strategy_cache = StrategyCache()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "copied_strategy.py")
+            shutil.copy(self.abs_filepath, path)
+            first_class = strategy_cache.get_strategy_class(path)
+            modification_time = os.stat(path).st_mtime_ns + 1000000000
+            os.utime(path, ns=(modification_time, modification_time))
+            self.assertIsNot(strategy_cache.get_strategy_class(path), first_class)
+        self.assertEqual(strategy_cache.get_stats(), {"hits": 0, "misses": 2, "entries": 1})
+
 if __name__ == '__main__':
     unittest.main()
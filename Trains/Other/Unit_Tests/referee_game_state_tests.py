@@ -156,6 +156,31 @@ class TestRefereeGameState(unittest.TestCase):
         self.rgs.next_turn()
         self.assertEqual(self.rgs.get_all_unacquired_connections(), set())
 
+    def test_get_connection_owner(self):
+        self.assertEqual(self.rgs.get_connection_owner(self.connection1), 0)
+        self.assertEqual(self.rgs.get_connection_owner(self.connection4), 1)
+        self.assertIsNone(self.rgs.get_connection_owner(self.connection5))
+
+    def test_add_connection_to_active_player_updates_owner_index(self):
+        self.rgs.add_connection_to_active_player(self.connection5)
+        self.assertEqual(self.rgs.get_connection_owner(self.connection5), 0)
+        self.assertEqual(self.rgs.free_connections, set())
+        self.assertEqual(self.rgs.get_free_connections(), frozenset())
+
+    def test_clear_player_connections_updates_owner_index(self):
+        self.rgs.clear_player_connections(1)
+        self.assertIsNone(self.rgs.get_connection_owner(self.connection3))
+        self.assertIsNone(self.rgs.get_connection_owner(self.connection4))
+        self.assertEqual(self.rgs.free_connections, {self.connection3, self.connection4, self.connection5})
+        self.assertEqual(self.rgs.free_connections, self.rgs.get_all_unacquired_connections())
+
+    def test_get_free_connections_snapshot_reused_between_changes(self):
+        snapshot = self.rgs.get_free_connections()
+        self.rgs.next_turn()
+        self.assertIs(self.rgs.get_free_connections(), snapshot)
+        self.rgs.clear_player_connections(0)
+        self.assertEqual(self.rgs.get_free_connections(), {self.connection1, self.connection2, self.connection5})
+
     def test_get_cards_from_deck(self):
         NUM_CARDS_ON_DRAW = 2
         deck = deque([Color.RED, Color.BLUE, Color.GREEN, Color.WHITE])
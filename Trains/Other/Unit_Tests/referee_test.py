@@ -1,11 +1,13 @@
 from collections import deque
 from copy import deepcopy
+import random
 import re
 import unittest
 import sys
 
 sys.path.append('../../../')
 
+from Trains.Common.cards import Deck, Hand
 from Trains.Common.player_game_state import PlayerGameState
 from Trains.Common.map import Connection, City, Destination, Color, Map
 from Trains.Player.buy_now_player import Buy_Now_Player
@@ -126,7 +128,7 @@ class TestReferee(unittest.TestCase):
 
     def test_create_initial_player_hand(self):
         hand = self.ref.create_initial_player_hand(self.deck, self.INITIAL_HAND_SIZE)
-        self.assertEqual(type(hand), dict)
+        self.assertEqual(type(hand), Hand)
         self.assertEqual(sum(hand.values()), self.INITIAL_HAND_SIZE)
         str_colors = set()
         for i in range(1, Color.number_of_colors() + 1):
@@ -135,10 +137,19 @@ class TestReferee(unittest.TestCase):
             self.assertIn(card_color, str_colors)
 
     def test_get_destination_selection(self):
-        destination_options = self.ref.get_destination_selection(self.feasible_destinations, self.NUM_DESTINATION_OPTIONS)
+        destination_pool = self.ref.get_destination_pool()
+        destination_options = self.ref.get_destination_selection(destination_pool, self.NUM_DESTINATION_OPTIONS)
         self.assertEqual(len(destination_options), self.NUM_DESTINATION_OPTIONS)
         for destination in destination_options:
             self.assertIn(destination, self.feasible_destinations)
+        # Offering destinations does not remove them, choosing them does
+        self.assertEqual(len(destination_pool), len(self.feasible_destinations))
+        destinations_not_chosen = set(list(destination_options)[:3])
+        destinations_chosen = self.ref.resolve_player_destination_choice(0, destination_pool, destination_options,
+            destinations_not_chosen)
+        self.assertEqual(destinations_chosen, destination_options - destinations_not_chosen)
+        self.assertEqual(len(destination_pool), len(self.feasible_destinations) - 2)
+        self.assertEqual(set(destination_pool), self.feasible_destinations - destinations_chosen)
 
     def test_verify_player_destinations_valid(self):
         destinations_given = set({self.destination1, self.destination2, self.destination3, self.destination4, self.destination5})
@@ -201,7 +212,7 @@ class TestReferee(unittest.TestCase):
         self.assertFalse(self.ref.is_game_over())
 
     def test_execute_draw_move(self):
-        deck = deque([Color.GREEN, Color.RED, Color.RED])
+        deck = Deck([Color.GREEN, Color.RED, Color.RED])
         self.ref.ref_game_state.colored_card_deck = deck
         hand_before_draw = self.ref.ref_game_state.player_game_states[0].colored_cards
         exp_hand = deepcopy(hand_before_draw)
@@ -214,7 +225,7 @@ class TestReferee(unittest.TestCase):
         self.assertEqual(self.ref.ref_game_state.colored_card_deck, deque([Color.GREEN]))
     
     def test_execute_draw_move_not_the_full_amount_drawn(self):
-        deck = deque([Color.RED])
+        deck = Deck([Color.RED])
         self.ref.ref_game_state.colored_card_deck = deck
         hand_before_draw = self.ref.ref_game_state.player_game_states[0].colored_cards
         exp_hand = deepcopy(hand_before_draw)
@@ -227,7 +238,7 @@ class TestReferee(unittest.TestCase):
         self.assertEqual(self.ref.ref_game_state.colored_card_deck, deque())
 
     def test_execute_draw_move_none_drawn_empty_deck(self):
-        deck = deque()
+        deck = Deck()
         self.ref.ref_game_state.colored_card_deck = deck
         hand_before_draw = self.ref.ref_game_state.player_game_states[0].colored_cards
         exp_hand = hand_before_draw
@@ -462,6 +473,24 @@ class TestReferee(unittest.TestCase):
         exp_rankings = [[(tie_player1, 10), (tie_player2, 10)], [(losing_player, -10)]]
         self.assertEqual(rankings, exp_rankings)
 
+    def test_seeded_referees_are_reproducible(self):
+        seeded_ref = Referee(self.test_map, self.players, rng=7)
+        same_seed_ref = Referee(self.test_map, self.players, rng=random.Random(7))
+        self.assertEqual(seeded_ref.initialize_deck(self.INITIAL_DECK_SIZE),
+                         same_seed_ref.initialize_deck(self.INITIAL_DECK_SIZE))
+        self.assertEqual(seeded_ref.get_destination_selection(seeded_ref.get_destination_pool(), self.NUM_DESTINATION_OPTIONS),
+                         same_seed_ref.get_destination_selection(same_seed_ref.get_destination_pool(), self.NUM_DESTINATION_OPTIONS))
+
+    def test_seeded_games_are_identical(self):
+        game_results = []
+        for _ in range(2):
+            players = [Hold_10_Player(self.p1_name, 22), Hold_10_Player(self.p2_name, 17), Buy_Now_Player(self.p3_name, 12)]
+            rankings, cheaters = Referee(self.test_map, players, rng=3).play_game()
+            game_results.append(([[(player.name, score) for player, score in rank] for rank in rankings],
+                                 [player.name for player in cheaters]))
+        self.assertEqual(game_results[0], game_results[1])
+
+
 class TestRefereeIntegrationTests(unittest.TestCase):
     
     def setUp(self):
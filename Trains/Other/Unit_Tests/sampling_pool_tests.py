@@ -0,0 +1,49 @@
+import random
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Common.sampling_pool import SamplingPool
+
+
+class TestSamplingPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = SamplingPool(["a", "b", "c", "d", "e"])
+
+    def test_sample_does_not_remove(self):
+        sample = self.pool.sample(3, random.Random(0))
+        self.assertEqual(len(sample), 3)
+        self.assertTrue(sample <= {"a", "b", "c", "d", "e"})
+        self.assertEqual(set(self.pool), {"a", "b", "c", "d", "e"})
+
+    def test_sample_more_than_pool(self):
+        self.assertEqual(self.pool.sample(7, random.Random(0)), {"a", "b", "c", "d", "e"})
+        self.assertEqual(SamplingPool().sample(2, random.Random(0)), set())
+
+    def test_sample_is_reproducible(self):
+        other_pool = SamplingPool(["a", "b", "c", "d", "e"])
+        for _ in range(5):
+            self.assertEqual(self.pool.sample(2, random.Random(3)), other_pool.sample(2, random.Random(3)))
+
+    def test_remove(self):
+        self.pool.remove({"a", "e", "z"})
+        self.assertEqual(len(self.pool), 3)
+        self.assertNotIn("a", self.pool)
+        self.assertIn("b", self.pool)
+        self.assertEqual(set(self.pool), {"b", "c", "d"})
+        self.pool.remove(["b", "c", "d"])
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(self.pool.sample(1, random.Random(0)), set())
+
+    def test_sample_is_uniform(self):
+        rng = random.Random(1)
+        counts = {element: 0 for element in self.pool}
+        for _ in range(5000):
+            for element in self.pool.sample(2, rng):
+                counts[element] += 1
+        for count in counts.values():
+            self.assertAlmostEqual(count / 5000, 2 / 5, delta=0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
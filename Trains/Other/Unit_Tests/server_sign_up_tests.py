@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+import sys
+sys.path.append('../../../')
+
+from Trains.Remote.message_framing import encode_message
+from Trains.Remote.server import Server
+
+
+class TestServerSignUp(unittest.TestCase):
+    def setUp(self):
+        self.event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.event_loop)
+
+    def tearDown(self):
+        self.event_loop.close()
+        asyncio.set_event_loop(None)
+
+    def sign_up(self, server: Server, clients) -> list:
+        """
+        Runs the server's sign up phase while the given client coroutines connect to it over loopback.
+        Returns the results of the clients.
+        """
+        server.active_server = server.create_asyncio_server()
+        port = server.active_server.sockets[0].getsockname()[1]
+
+        async def run():
+            sign_up = asyncio.ensure_future(server.sign_up_players_async())
+            results = await asyncio.gather(*[client(port) for client in clients])
+            await sign_up
+            server.active_server.close()
+            await server.active_server.wait_closed()
+            return results
+
+        return self.event_loop.run_until_complete(run())
+
+    def create_client(self, name: str, delay: float = 0):
+        async def client(port: int) -> bool:
+            """
+            Signs up with the given name after a delay. Returns whether the server kept the connection open.
+            """
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await asyncio.sleep(delay)
+            writer.write(encode_message([name]))
+            await writer.drain()
+            kept_open = True
+            try:
+                kept_open = await asyncio.wait_for(reader.read(1), 0.3) != b""
+            except asyncio.TimeoutError:
+                pass
+            writer.close()
+            return kept_open
+        return client
+
+    def create_silent_client(self):
+        async def client(port: int) -> bool:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            closed = await reader.read(1) == b""
+            writer.close()
+            return not closed
+        return client
+
+    def test_sign_up_ends_when_capacity_is_reached(self):
+        server = Server("127.0.0.1", 0, 2, 3, 10)
+        clients = [self.create_client(f"Player{index}", 0.05 * index) for index in range(5)]
+        kept_open = self.sign_up(server, clients)
+        self.assertEqual([player.name for player in server.players], ["Player0", "Player1", "Player2"])
+        self.assertEqual([player.age for player in server.players], [3, 2, 1])
+        self.assertEqual(kept_open, [True, True, True, False, False])
+        metrics = server.sign_up_metrics
+        self.assertEqual((metrics.connections, metrics.admitted, metrics.rejected), (5, 3, 2))
+        self.assertLess(metrics.sign_up_time, 5)
+        self.assertTrue(server.first_wait_phase)
+
+    def test_handshake_deadline_and_back_pressure(self):
+        server = Server("127.0.0.1", 0, 3, 8, 0.6, handshake_timeout=0.3, max_pending_handshakes=1)
+        clients = [self.create_silent_client(), self.create_client("Alice", 0.05), self.create_client("Bob", 0.05)]
+        kept_open = self.sign_up(server, clients)
+        self.assertEqual(kept_open[0], False)
+        self.assertEqual(server.sign_up_metrics.handshake_timeouts, 1)
+        self.assertEqual(server.sign_up_metrics.peak_pending_handshakes, 3)
+        self.assertEqual(sorted(player.name for player in server.players), ["Alice", "Bob"])
+        self.assertFalse(server.first_wait_phase)
+        self.assertTrue(server.enough_players_joined())
+
+    def test_invalid_sign_up_is_an_error(self):
+        server = Server("127.0.0.1", 0, 2, 8, 0.2)
+
+        async def closing_client(port: int) -> bool:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"[\"Half")
+            writer.close()
+            return True
+
+        self.sign_up(server, [closing_client])
+        self.assertEqual(server.players, [])
+        self.assertEqual(server.sign_up_metrics.handshake_errors, 1)
+        self.assertEqual(server.sign_up_metrics.get_as_json()["admission_rate"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import json
+import sys
+import unittest
+
+sys.path.append('../../../')
+from Trains.Admin.referee import NotEnoughDestinations
+from Trains.Admin.simulation import GameSimulator, simulate_games, write_game_results
+from Trains.Common.map import City, Color, Connection, Map
+from Trains.Other.Benchmarks.random_maps import generate_random_map
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self.game_map = generate_random_map(15, 0.3)
+        self.player_instances = [["Alice", "Hold-10"], ["Bob", "Buy-Now"], ["Carl", "Cheat"]]
+
+    def test_results_are_json_lines_in_game_order(self):
+        output = io.StringIO()
+        number_of_results = write_game_results(simulate_games(self.game_map, self.player_instances, 5, 3), output)
+        self.assertEqual(number_of_results, 5)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([result["game"] for result in results], list(range(5)))
+        for result in results:
+            self.assertEqual(result["cheaters"], ["Carl"])
+            ranked_names = {name for rank in result["rankings"] for name, _ in rank}
+            self.assertEqual(ranked_names, {"Alice", "Bob"})
+
+    def test_games_are_reproducible(self):
+        first_run = list(simulate_games(self.game_map, self.player_instances, 4, 7))
+        simulator = GameSimulator(self.game_map, self.player_instances, 7)
+        self.assertEqual(first_run[2], json.dumps(simulator.play_game(2)))
+        self.assertEqual(first_run, list(simulate_games(self.game_map, self.player_instances, 4, 7)))
+
+    def test_workers_give_the_same_results(self):
+        in_process = list(simulate_games(self.game_map, self.player_instances, 6, 1))
+        self.assertEqual(list(simulate_games(self.game_map, self.player_instances, 6, 1, workers=2)), in_process)
+
+    def test_not_enough_destinations(self):
+        boston = City("Boston", 70, 80)
+        new_york = City("New York", 60, 70)
+        game_map = Map({boston, new_york}, {Connection(frozenset({boston, new_york}), Color.BLUE, 3)})
+        with self.assertRaises(NotEnoughDestinations):
+            simulate_games(game_map, self.player_instances, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+from collections import deque
+from dataclasses import replace
+import json
+import sys
+sys.path.append('../../../')
+
+import unittest
+from Trains.Admin.referee_game_state import RefereeGameState
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Common.map import Connection, City, Destination, Map, Color
+from Trains.Other.Util.json_utils import convert_from_json_to_player_game_state
+from Trains.Remote.state_updates import DELTA_KEY, DELTA_STATE_UPDATES, FULL_STATE_UPDATES, STATE_UPDATES_KEY, \
+    apply_player_game_state_delta, get_player_game_state_delta_as_json, is_state_delta, \
+    requests_delta_state_updates, snapshot_player_game_state
+
+
+class TestStateUpdates(unittest.TestCase):
+    def setUp(self):
+        self.boston = City("Boston", 70, 80)
+        self.new_york = City("New York", 60, 70)
+        self.philadelphia = City("Philadelphia", 60, 70)
+        self.los_angeles = City("Los Angeles", 0, 10)
+        self.austin = City("Austin", 50, 15)
+        self.wdc = City("Washington D.C.", 55, 60)
+        self.connection1 = Connection(frozenset({self.boston, self.new_york}), Color.BLUE, 3)
+        self.connection2 = Connection(frozenset({self.philadelphia, self.new_york}), Color.RED, 3)
+        self.connection3 = Connection(frozenset({self.boston, self.philadelphia}), Color.GREEN, 4)
+        self.connection4 = Connection(frozenset({self.austin, self.los_angeles}), Color.WHITE, 5)
+        self.connection5 = Connection(frozenset({self.wdc, self.philadelphia}), Color.WHITE, 5)
+        cities = {self.boston, self.new_york, self.philadelphia, self.los_angeles, self.austin, self.wdc}
+        connections = {self.connection1, self.connection2, self.connection3, self.connection4, self.connection5}
+        self.test_map = Map(cities, connections)
+        self.dest1 = Destination({self.new_york, self.philadelphia})
+        self.dest2 = Destination({self.new_york, self.boston})
+        self.dest3 = Destination({self.boston, self.philadelphia})
+
+        self.deck = deque([Color.RED, Color.GREEN, Color.BLUE, Color.WHITE, Color.RED])
+        pgs1 = PlayerGameState({self.connection1}, {Color.RED: 5, Color.BLUE: 6, Color.GREEN: 7, Color.WHITE: 8},
+                               20, {self.dest1, self.dest2}, dict(), [])
+        pgs2 = PlayerGameState({self.connection4}, {Color.RED: 1, Color.BLUE: 0, Color.GREEN: 2, Color.WHITE: 3},
+                               20, {self.dest3, self.dest1}, dict(), [])
+        self.rgs = RefereeGameState(self.test_map, self.deck, [pgs1, pgs2])
+
+    def send_and_receive(self, previous: PlayerGameState, current: PlayerGameState,
+                         received: PlayerGameState) -> PlayerGameState:
+        """
+        Sends the current state as a delta from the previous one through JSON, and applies it to the
+        state the client received last.
+        """
+        delta_json = json.loads(json.dumps({DELTA_KEY: get_player_game_state_delta_as_json(previous, current)}))
+        self.assertTrue(is_state_delta(delta_json))
+        return apply_player_game_state_delta(received, delta_json[DELTA_KEY])
+
+    def assert_same_state(self, received: PlayerGameState, sent: PlayerGameState) -> None:
+        """
+        Checks that a state rebuilt from deltas is the state the client would get from the whole PlayerState.
+        """
+        expected = convert_from_json_to_player_game_state(sent.get_as_json())
+        received_unacquired, expected_unacquired = [set(game_state.game_info["unacquired_connections"])
+                                                     for game_state in [received, expected]]
+        self.assertEqual(received_unacquired, expected_unacquired)
+        self.assertEqual(replace(received, game_info=dict(received.game_info, unacquired_connections=None)),
+                         replace(expected, game_info=dict(expected.game_info, unacquired_connections=None)))
+
+    def test_requests_delta_state_updates(self):
+        self.assertFalse(requests_delta_state_updates(["Alice"]))
+        self.assertFalse(requests_delta_state_updates(["Alice", {STATE_UPDATES_KEY: FULL_STATE_UPDATES}]))
+        self.assertTrue(requests_delta_state_updates(["Alice", {STATE_UPDATES_KEY: DELTA_STATE_UPDATES}]))
+        self.assertTrue(requests_delta_state_updates(["Alice", {"framing": "newline",
+                                                                STATE_UPDATES_KEY: DELTA_STATE_UPDATES}]))
+
+    def test_is_state_delta(self):
+        self.assertTrue(is_state_delta({DELTA_KEY: {}}))
+        self.assertFalse(is_state_delta(self.rgs.get_player_game_state().get_as_json()))
+
+    def test_deltas_rebuild_full_states(self):
+        previous = snapshot_player_game_state(self.rgs.get_player_game_state())
+        received = convert_from_json_to_player_game_state(json.loads(json.dumps(previous.get_as_json())))
+
+        self.rgs.give_cards_to_active_player(self.rgs.get_cards_from_deck(2))
+        self.rgs.add_connection_to_active_player(self.connection2)
+        self.rgs.next_turn()
+        self.rgs.add_connection_to_active_player(self.connection5)
+        self.rgs.next_turn()
+        current = self.rgs.get_player_game_state()
+        received = self.send_and_receive(previous, current, received)
+        self.assert_same_state(received, current)
+
+        # Booting the opponent returns its connections to the unacquired connections.
+        previous = snapshot_player_game_state(current)
+        self.rgs.clear_player_connections(1)
+        current = self.rgs.get_player_game_state()
+        received = self.send_and_receive(previous, current, received)
+        self.assertIn(self.connection5, received.game_info["unacquired_connections"])
+        self.assert_same_state(received, current)
+
+    def test_delta_of_unchanged_state_has_no_connections(self):
+        previous = snapshot_player_game_state(self.rgs.get_player_game_state())
+        delta_json = get_player_game_state_delta_as_json(previous, self.rgs.get_player_game_state())
+        self.assertEqual(delta_json["this"]["acquired"], {"added": [], "removed": []})
+        self.assertEqual(delta_json["game_info"]["unacquired_connections"], {"added": [], "removed": []})
+
+    def test_no_delta_when_destinations_change(self):
+        previous = snapshot_player_game_state(self.rgs.get_player_game_state())
+        self.rgs.give_player_destinations(0, {self.dest3, self.dest2})
+        self.assertIsNone(get_player_game_state_delta_as_json(previous, self.rgs.get_player_game_state()))
+
+    def test_delta_with_wrong_number_of_opponents(self):
+        previous = snapshot_player_game_state(self.rgs.get_player_game_state())
+        delta_json = get_player_game_state_delta_as_json(previous, self.rgs.get_player_game_state())
+        delta_json["opponent_info"].pop()
+        with self.assertRaises(ValueError):
+            apply_player_game_state_delta(previous, delta_json)
+
+
+if __name__ == '__main__':
+    unittest.main()
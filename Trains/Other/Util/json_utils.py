@@ -4,6 +4,7 @@ from Trains.Other.Mocks.mock_given_map_player import MockGivenMapPlayer
 from Trains.Player.moves import PlayerMove, DrawCardMove, AcquireConnectionMove
 
 sys.path.append('../../')
+from Trains.Common.cards import Deck, Hand
 from Trains.Common.player_game_state import PlayerGameState
 from Trains.Common.map import Color, City, Connection, Map, Destination
 from Trains.Player.dynamic_player import DynamicPlayer
@@ -111,14 +112,15 @@ def convert_json_destinations_to_data(json_player_state: dict, game_map: Map):
         Returns:
             Set of Destinations from the given player game state
     """
-    possible_destinations = game_map.get_feasible_destinations(game_map.connections)
+    cities_by_name = {city.name: city for city in game_map.cities}
     player_destinations = set()
-    dest1_names = set(json_player_state["destination1"])
-    dest2_names = set(json_player_state["destination2"])
-    for destination in possible_destinations:
-        destination_name_set = {city.name for city in destination}
-        if dest1_names == destination_name_set or dest2_names == destination_name_set:
-            player_destinations.add(destination)
+    for destination_key in ["destination1", "destination2"]:
+        destination_names = set(json_player_state[destination_key])
+        if len(destination_names) != 2 or not destination_names.issubset(cities_by_name):
+            continue
+        city1, city2 = [cities_by_name[name] for name in destination_names]
+        if game_map.are_connected(city1, city2, game_map.connections):
+            player_destinations.add(Destination({city1, city2}))
     return player_destinations
 
 def convert_json_connection_to_data(json_connection, game_map: Map):
@@ -162,9 +164,7 @@ def convert_json_player_state_to_data(json_player_state: dict, game_map: Map):
     """
     destinations = convert_json_destinations_to_data(json_player_state["this"], game_map)
     rails = json_player_state["this"]["rails"]
-    colored_cards = {Color.RED: 0, Color.BLUE: 0, Color.GREEN: 0, Color.WHITE: 0}
-    for key, value in json_player_state["this"]["cards"].items():
-        colored_cards[COLORS[key]] = value
+    colored_cards = Hand({COLORS[key]: value for key, value in json_player_state["this"]["cards"].items()})
     connections = {convert_json_connection_to_data(json_connection, game_map) for json_connection in json_player_state["this"]["acquired"]}
     available_connections = game_map.get_all_connections() - connections
     for opponent in json_player_state["acquired"]:
@@ -182,9 +182,7 @@ def convert_from_json_to_player_game_state(json_player_game_state: dict):
 
     rails = json_player_game_state["this"]["rails"]
 
-    colored_cards = {Color.RED: 0, Color.BLUE: 0, Color.GREEN: 0, Color.WHITE: 0}
-    for key, value in json_player_game_state["this"]["cards"].items():
-        colored_cards[COLORS[key]] = value
+    colored_cards = Hand({COLORS[key]: value for key, value in json_player_game_state["this"]["cards"].items()})
 
     connections = set()
     for conn in json_player_game_state["this"]["acquired"]:
@@ -205,6 +203,8 @@ def convert_from_json_to_player_game_state(json_player_game_state: dict):
         for conn in opponent["connections"]:
             individual_opponent_connections.add(convert_from_json_to_connection(conn))
         individual_opponent_info["number_of_cards"] = opponent["number_of_cards"]
+        individual_opponent_info["connections"] = individual_opponent_connections
+        opponent_info.append(individual_opponent_info)
     return PlayerGameState(connections, colored_cards, rails, destinations, game_info, opponent_info)
 
 def convert_json_player_game_state_xlegal(json_player_state: dict, game_map: Map):
@@ -292,6 +292,13 @@ def convert_from_json_to_card_plus(json_card_plus: list) -> list:
         card_plus.append(COLORS[card])
     return card_plus
 
+def convert_from_json_to_deck(json_card_plus: list) -> Deck:
+    """Converts a json array of color cards, from the bottom of the deck to the top, to a Deck
+        Example: from: ["red", "blue", "green"]
+                 to: Deck([COLOR.RED, COLOR.BLUE, COLOR.GREEN])
+    """
+    return Deck(COLORS[card] for card in json_card_plus)
+
 def convert_from_card_plus_to_json(card_plus) -> list:
     """Converts a python list of Color objects to a json array of color cards
             Example: from: [COLOR.RED, COLOR.BLUE, COLOR.GREEN]
@@ -303,7 +310,7 @@ def convert_from_card_plus_to_json(card_plus) -> list:
     return json_card_plus
 
 def convert_card_star_to_json(card_star) -> dict:
-    """Convert a dictionary card* to a json object
+    """Convert a card* (a Hand or a dictionary of Color to count) to a json object
         Example: from: card_star = {
                                     COLOR.RED: 4,
                                     COLOR.GREEN: 0,
@@ -323,23 +330,23 @@ def convert_card_star_to_json(card_star) -> dict:
         json_card_star[color_name] = card_star[COLORS[color_name]]
     return json_card_star
 
-def convert_from_json_to_card_star(json_card_star) -> dict:
-    """Convert a json object to a dictionary card* to
+def convert_from_json_to_card_star(json_card_star) -> Hand:
+    """Convert a json object to a Hand card*
         Example: from: card_star = {
                                     "red": 4,
                                     "green": 0,
                                     "blue": 5,
                                     "white": 3
                                     }
-                 to: card_star = {
+                 to: card_star = Hand({
                                     COLOR.RED: 4,
                                     COLOR.GREEN: 0,
                                     COLOR.BLUE: 5,
                                     COLOR.WHITE: 3
-                                    }
+                                    })
 
         """
-    card_star = dict()
+    card_star = Hand()
     for color_name in COLORS.keys():
         card_star[COLORS[color_name]] = json_card_star[color_name]
     return card_star
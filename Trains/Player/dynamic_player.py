@@ -1,15 +1,114 @@
 from inspect import isclass
 import sys, os
 from importlib.util import spec_from_file_location, module_from_spec
+from typing import Dict, Optional, Tuple, Type
 
 sys.path.append('../../')
 from Trains.Player.player import AbstractPlayer
 from Trains.Player.strategy import AbstractPlayerStrategy
 
 
+def load_strategy_module(abs_path: str):
+    """
+    Loads the module at the given absolute file path.
+        Parameters:
+            abs_path (str): absolute file path of strategy to load
+        Returns:
+            The loaded module
+    """
+    # Get file name from absolute path
+    file_name = os.path.basename(abs_path)
+    # Format file name (remove .py)
+    if file_name[-3::] == ".py":
+        file_name = file_name[0:-3]
+    # Get module from file path
+    spec = spec_from_file_location(file_name, abs_path)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_strategy_class(module) -> Optional[Type[AbstractPlayerStrategy]]:
+    """
+    Finds the strategy class of a given module: the most derived implementation of AbstractPlayerStrategy
+    in it (including imported classes).
+        Parameters:
+            module: Module to dynamically load strategy from
+        Returns:
+            The strategy class found in the given module, or None if there is none
+    """
+    strategy_class = None
+    # Iterate through names of the given module's elements (includes imported classes)
+    # TODO: Do we need to verify python file for Strategy?
+    for class_name in dir(module):
+        if isclass(getattr(module, class_name)) and issubclass(getattr(module, class_name), AbstractPlayerStrategy) \
+            and class_name != AbstractPlayerStrategy.__name__:
+            check_class = getattr(module, class_name)
+            # Set it only if we have not seen a previous concrete implementation
+            # or the class subclasses that concrete implementation.
+            if strategy_class is None or issubclass(check_class, strategy_class):
+                strategy_class = check_class
+    return strategy_class
+
+
+class StrategyCache:
+    """
+    Caches the strategy class loaded from each strategy file, keyed by the file's absolute path and
+    modification time, so players that share a strategy file only execute it once. A file that has been
+    modified since it was loaded is loaded again. Counts cache hits and misses for profiling startup.
+    """
+
+    def __init__(self):
+        """
+        Constructor for an empty StrategyCache.
+        """
+        # Absolute path -> (modification time in nanoseconds, strategy class)
+        self.strategy_classes: Dict[str, Tuple[int, Optional[Type[AbstractPlayerStrategy]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_strategy_class(self, abs_path: str) -> Optional[Type[AbstractPlayerStrategy]]:
+        """
+        Gets the strategy class of the strategy file at the given absolute path, loading the file if it is
+        not cached or was modified since it was cached.
+            Parameters:
+                abs_path (str): absolute file path of strategy to load
+            Returns:
+                The strategy class found in the file, or None if there is none
+        """
+        modification_time = os.stat(abs_path).st_mtime_ns
+        cached = self.strategy_classes.get(abs_path)
+        if cached is not None and cached[0] == modification_time:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        strategy_class = get_strategy_class(load_strategy_module(abs_path))
+        self.strategy_classes[abs_path] = (modification_time, strategy_class)
+        return strategy_class
+
+    def get_stats(self) -> dict:
+        """
+        Returns the cache's statistics: {"hits": int, "misses": int, "entries": int}
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.strategy_classes)}
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets its statistics.
+        """
+        self.strategy_classes = {}
+        self.hits = 0
+        self.misses = 0
+
+
+# The strategy cache shared by every DynamicPlayer in this process.
+strategy_cache = StrategyCache()
+
+
 class DynamicPlayer(AbstractPlayer):
     """
-    A player that implements a dynamically loaded strategy.
+    A player that implements a dynamically loaded strategy. Strategy files are loaded once per process
+    (see StrategyCache), and each player gets its own instance of the strategy class.
     Sources:
         https://stackoverflow.com/questions/67631/how-to-import-a-module-given-the-full-path?rq=1
         https://stackoverflow.com/questions/1796180/how-can-i-get-a-list-of-all-classes-within-current-module-in-python
@@ -23,21 +122,40 @@ class DynamicPlayer(AbstractPlayer):
                 age (int): player age
                 path (str): file path of strategy to load
         """
-        # Get absolute file path
-        abs_path = os.path.abspath(path)
-        # Get file name from absolute path
-        file_name = os.path.basename(abs_path)
-        # Format file name (remove .py)
-        if file_name[-3::] == ".py":
-            file_name = file_name[0:-3]
-        # Get module from file path
-        spec = spec_from_file_location(file_name, abs_path)
-        module = module_from_spec(spec)
-        spec.loader.exec_module(module)
-
         super().__init__(name, age)
+        # Get absolute file path
+        self.path = os.path.abspath(path)
         # Initializes player with strategy from file path
-        self.strategy = self.get_strategy(module)
+        self.strategy = self.create_strategy()
+
+    def create_strategy(self) -> Optional[AbstractPlayerStrategy]:
+        """
+        Creates an instance of the strategy from this player's strategy file, whose class is loaded once
+        per file (see StrategyCache).
+            Returns:
+                An instance of the strategy, or None if the file has no strategy
+        """
+        strategy_class = strategy_cache.get_strategy_class(self.path)
+        if strategy_class is None:
+            return None
+        return strategy_class.__new__(strategy_class)
+
+    def __getstate__(self) -> dict:
+        """
+        Gets the state of this player for pickling (e.g., to play a game in another process). The
+        strategy's class only exists in a module loaded from a file path, so the strategy is left out
+        and reloaded from self.path when unpickled.
+        """
+        state = self.__dict__.copy()
+        state["strategy"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores a pickled player and reloads its strategy from its file path.
+        """
+        self.__dict__.update(state)
+        self.strategy = self.create_strategy()
 
     def get_strategy(self, module):
         """
@@ -47,18 +165,7 @@ class DynamicPlayer(AbstractPlayer):
             Returns:
                 An instance of a strategy object found in the given module
         """
-        strategy_class_instance = None
-        # Iterate through names of the given module's elements (includes imported classes)
-        # TODO: Do we need to verify python file for Strategy?
-        seen_implementations = []
-        for class_name in dir(module):
-            if isclass(getattr(module, class_name)) and issubclass(getattr(module, class_name), AbstractPlayerStrategy) \
-                and class_name != AbstractPlayerStrategy.__name__:
-                check_class = getattr(module, class_name)
-                check_class_instance = check_class.__new__(check_class)
-                # Set it only if we have not seen a previous concrete implementation
-                # or the class subclasses that concrete implementation.
-                if strategy_class_instance is None or issubclass(check_class_instance.__class__, strategy_class_instance.__class__):
-                    strategy_class_instance = check_class_instance
-                    seen_implementations.append(check_class_instance)
-        return strategy_class_instance
+        strategy_class = get_strategy_class(module)
+        if strategy_class is None:
+            return None
+        return strategy_class.__new__(strategy_class)
@@ -36,13 +36,7 @@ class Hold_10(AbstractPlayerStrategy):
             Returns:
                 Connection to acquire if possible, None otherwise
         """
-        unacquired_connections = game_state.game_info["unacquired_connections"]
-        sorted_connections = self.get_lexicographic_order_of_connections(list(unacquired_connections))
-
-        for connection in sorted_connections:
-            if self.can_acquire_connection(game_state, connection):
-                return connection
-        return None
+        return self.get_first_acquirable_connection(game_state)
 
     def get_player_move(self, game_state: PlayerGameState) -> PlayerMove:
         """
@@ -6,6 +6,7 @@ from Trains.Common.map import Color, Connection, Destination
 from Trains.Common.map import Map
 from Trains.Common.player_game_state import PlayerGameState
 from Trains.Player.moves import PlayerMove
+from Trains.Player.strategy import AbstractPlayerStrategy
 
 
 class PlayerInterface:
@@ -137,6 +138,10 @@ class AbstractPlayer(PlayerInterface):
         """
         self.map = map
         self.game_state = PlayerGameState(set(), cards, rails, set(), {}, [])
+        # The strategy orders the unacquired connections every turn, which are always some of the map's
+        # connections, so give it the map's presorted order.
+        if isinstance(self.strategy, AbstractPlayerStrategy):
+            self.strategy.use_connection_order(map.get_sorted_connections())
 
     def pick(self, destinations: set) -> Set[Destination]:
         """
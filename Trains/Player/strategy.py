@@ -1,7 +1,8 @@
-import functools
 import sys
+from typing import Iterable, List, Sequence
 sys.path.append('../../')
-from Trains.Common.map import Connection, Destination
+from Trains.Common.connection_index import AcquirableConnectionIndex
+from Trains.Common.map import Connection, Destination, get_connection_sort_key, get_destination_sort_key
 from Trains.Common.player_game_state import PlayerGameState
 from Trains.Player.moves import PlayerMove
 
@@ -44,7 +45,25 @@ class AbstractPlayerStrategy(PlayerStrategyInterface):
     # def __init__(self):
     #     pass
 
-    def get_lexicographic_order_of_destinations(self, destinations: list) -> list:
+    # Connections in lexicographic order (e.g. all the connections of the map being played on) and the
+    # same connections as a set. Sorting a subset of them filters this order instead of sorting again.
+    connection_order: Sequence[Connection] = ()
+    connection_order_set: frozenset = frozenset()
+    # The unacquired connections indexed by color and length (see get_first_acquirable_connection).
+    acquirable_connection_index: AcquirableConnectionIndex = None
+
+    def use_connection_order(self, sorted_connections: Sequence[Connection]) -> None:
+        """
+        Gives the strategy connections that are already in lexicographic order, such as Map.get_sorted_connections(),
+        so ordering any subset of them (e.g. the unacquired connections on each turn) takes linear time.
+            Parameters:
+                sorted_connections (sequence(Connection)): Connections in lexicographic order
+        """
+        self.connection_order = sorted_connections
+        self.connection_order_set = frozenset(sorted_connections)
+        self.acquirable_connection_index = AcquirableConnectionIndex(sorted_connections)
+
+    def get_lexicographic_order_of_destinations(self, destinations: Iterable[Destination]) -> List[Destination]:
         """
         Gets the lexicographic order of a given list of destinations.  Initially sorts by the first city in each destination, and resorts
         to the second city name in each destination if the first city names are equal.
@@ -53,24 +72,43 @@ class AbstractPlayerStrategy(PlayerStrategyInterface):
             Returns:
                 The lexicographically sorted list of given destinations
         """
-        # Uses the special method __lt__ (less than) written in the Destination dataclass to sort
-        destinations.sort(key=functools.cmp_to_key(Destination.__lt__))
-        return destinations
+        # Uses the sort key cached by each Destination, the same order as its special method __lt__ (less than)
+        return sorted(destinations, key=get_destination_sort_key)
 
-    def get_lexicographic_order_of_connections(self, connections: list) -> list:
+    def get_lexicographic_order_of_connections(self, connections: Iterable[Connection]) -> List[Connection]:
         """
         Gets the lexicographic order of a given list of connections.  Initially sorts by the first city in each connection, and resorts
         to the second city name in each connection if the first city names are equal.  If both pairs of city names are equal, then the order is 
         determined by ascending order of number of segments (length of the connections), and finally the lexicographic order of the string
         representations of the connection color ("red", "green", "white", and "blue") if a tie-breaker for number of segments is required.
+
+        If the connections are all in this strategy's connection order (see use_connection_order), that order is filtered
+        in linear time. Otherwise they are sorted by the sort key cached by each Connection, and become the connection order.
             Parameters:
-                connections (list(Connection)): The list of connections to sort in lexicographic order
+                connections (iterable(Connection)): The connections to sort in lexicographic order
             Returns:
                 The lexicographically sorted list of given connections
         """
-        # Uses the special method __lt__ (less than) written in the Connection dataclass to sort
-        connections.sort(key=functools.cmp_to_key(Connection.__lt__))
-        return connections
+        connection_set = connections if type(connections) in (set, frozenset) else set(connections)
+        if not connection_set <= self.connection_order_set:
+            self.use_connection_order(sorted(connection_set, key=get_connection_sort_key))
+        return [connection for connection in self.connection_order if connection in connection_set]
+
+    def get_first_acquirable_connection(self, resources: PlayerGameState) -> Connection or None:
+        """
+        Gets the first connection in the lexicographic order of the unacquired connections that the player has the
+        resources to acquire. The strategy's index of unacquired connections is synced with the game state, so only
+        the connections acquired or released since the last turn are moved, and at most one connection of each
+        color and length is checked.
+            Parameters:
+                resources (PlayerGameState): the resources the player implementing this strategy has
+            Returns:
+                Connection to acquire if possible, None otherwise
+        """
+        if self.acquirable_connection_index is None:
+            self.acquirable_connection_index = AcquirableConnectionIndex()
+        self.acquirable_connection_index.sync(resources.game_info["unacquired_connections"])
+        return self.acquirable_connection_index.get_first_acquirable_connection(resources.colored_cards, resources.rails)
 
     def can_acquire_connection(self, resources: PlayerGameState, unacquired_connection: Connection) -> bool:
         """
@@ -1,9 +1,12 @@
 from asyncio import StreamReader, StreamWriter
 import asyncio
-import json, sys
+import sys
+from typing import Any
 
 sys.path.append('../../')
-from Trains.Remote.networking_constants import MAX_MESSAGE_SIZE
+from Trains.Remote.message_framing import RAW_FRAMING, MessageReader, MessageTooLarge, encode_message
+from Trains.Remote.state_updates import DELTA_KEY, DELTA_STATE_UPDATES, FULL_STATE_UPDATES, \
+    get_player_game_state_delta_as_json, snapshot_player_game_state
 from Trains.Common.map import Map, Destination
 from Trains.Common.player_game_state import PlayerGameState
 from Trains.Other.Util.json_utils import convert_json_connection_to_data, convert_json_player_state_to_data, \
@@ -23,70 +26,134 @@ class RemotePlayerProxy(AbstractPlayer):
             Server calls RemotePlayerProxy.play(PlayerGameState pgs) -> PlayerMove
             RemotePlayerProxy converts pgs to json message
             RemotePlayerProxy sends json message over tcp connection via self.tcp_communicate(message) -> message
-            TCP_COMMUNICATE returns a json message, and this class converts the message to a PlayerMove
+            TCP_COMMUNICATE returns the decoded json message, and this class converts the message to a PlayerMove
             RemotePlayerProxy returns PlayerMove
+        Every player method also has a coroutine version (e.g. play_async) for use by the AsyncReferee and
+        AsyncManager, which run many games concurrently on one event loop.
+        Messages are written and read with the framing negotiated when the client signed up (see
+        Trains/Remote/message_framing.py). Clients that asked for delta state updates are sent the
+        whole PlayerGameState on their first play call of a game and only what changed on the rest
+        (see Trains/Remote/state_updates.py).
+        The connection is closed when the player loses a game or the tournament ends, unless the client
+        has a persistent session with a long-running server (see Trains/Remote/connection_pool.py).
     """
     TIMEOUT = 10.0
 
-    def __init__(self, name: str, age: int, reader: StreamReader, writer: StreamWriter):
+    def __init__(self, name: str, age: int, reader: StreamReader, writer: StreamWriter,
+                 framing: str = RAW_FRAMING, message_reader: MessageReader = None,
+                 state_updates: str = FULL_STATE_UPDATES, persistent: bool = False):
         """
         Constructs a RemotePlayerProxy with a name, an age, a reader, and a writer.
             name: str: = the name of this player
             age: int = the age of this player
             reader: StreamReader = an asyncio.StreamReader object used to read input
             writer: StreamWriter = an asyncio.StreamWriter object used to write output
+            framing: str = the message framing used with this client
+            message_reader: MessageReader = the MessageReader already reading from reader (e.g. the one
+                                            used at sign up, which may have buffered data), if any
+            state_updates: str = how PlayerGameStates are sent to this client on play (full or delta)
+            persistent: bool = whether to keep the connection open after win(False) and end, so the client
+                               can play the server's next tournament
         """
         self.reader = reader
         self.writer = writer
+        self.framing = framing
+        self.message_reader = message_reader if message_reader is not None else MessageReader(reader, framing)
+        self.state_updates = state_updates
+        self.persistent = persistent
+        # Copy of the last PlayerGameState sent to the client in the current game, for delta updates.
+        self.last_sent_game_state = None
         super().__init__(name, age)
 
-    def tcp_communicate(self, message: list, expecting_response: bool = True) -> str:
+    def tcp_communicate(self, message: list, expecting_response: bool = True) -> Any:
         """
         TCP_Communicate handles tcp communications with each client. Each player method converts the data to an
         array formatted as a method call [method, [argument]]. Tcp_communicate will dump that array to a json string
         and  write that json string to the socket where a client will read it and write back the appropriate response
-        as json. Tcp_communicate will return that json string.
+        as json. Tcp_communicate will return that response decoded to pythonic json.
+
+        Blocks on the event loop until the exchange is done. See tcp_communicate_async for use inside a
+        running event loop.
 
         Input: message : A method call of the format [str, [Argument, ..]]
                expecting_response: whether or not we should wait for a response in the reader
-        Output: the json string read from self.reader
+        Output: the pythonic json read from self.reader, or None if no response is expected
 
         Example: tcp_communicate(["play",[PlayerState]]) -> "more cards"
         """
-        event_loop = asyncio.get_event_loop()
-        message = json.dumps(message)
-        message_data = message.encode()
-        self.writer.write(message_data)
-        event_loop.run_until_complete(self.writer.drain())
-        player_response = ""
+        return self.run_until_complete(self.tcp_communicate_async(message, expecting_response))
+
+    async def tcp_communicate_async(self, message: list, expecting_response: bool = True) -> Any:
+        """
+        Coroutine version of tcp_communicate. Only this player's game waits on the exchange, which
+        must be done within self.TIMEOUT seconds: a client that stops reading (so the message cannot
+        be sent) is timed out just like a client that does not respond.
+
+        Input: message : A method call of the format [str, [Argument, ..]]
+               expecting_response: whether or not we should wait for a response in the reader
+        Output: the pythonic json read from self.reader, or None if no response is expected
+        Throws: asyncio.TimeoutError if the message is not sent or the client does not respond in time,
+                MessageStreamClosed if the client closes the connection,
+                MessageTooLarge if the client sends a message that is too large, after the connection is closed
+        """
+        try:
+            return await asyncio.wait_for(self.exchange_message(message, expecting_response), self.TIMEOUT)
+        except MessageTooLarge:
+            self.writer.close()
+            raise
+
+    async def exchange_message(self, message: list, expecting_response: bool) -> Any:
+        """
+        Sends a message to the client and reads its response, if one is expected, without a deadline.
+        """
+        self.writer.write(encode_message(message, self.framing))
+        await self.writer.drain()
+        player_response = None
         if expecting_response:
-            player_response_data = \
-                event_loop.run_until_complete(asyncio.wait_for(self.reader.read(MAX_MESSAGE_SIZE), self.TIMEOUT))
-            player_response = player_response_data.decode()
+            player_response = await self.message_reader.read_message()
         return player_response
 
+    def run_until_complete(self, coroutine):
+        """
+        Runs a coroutine of this proxy on the current event loop and returns its result. Used by the
+        blocking player methods, which must not be called while the event loop is already running.
+        """
+        event_loop = asyncio.get_event_loop()
+        return event_loop.run_until_complete(coroutine)
+
     def start(self) -> Map:
         """Notify the player the game has started, and return a suggested map."""
+        return self.run_until_complete(self.start_async())
+
+    async def start_async(self) -> Map:
+        """Coroutine version of start."""
         start_json_argument = []
         start_json_function_call = ["start", start_json_argument]
-        output_start_json = self.tcp_communicate(start_json_function_call)
-        output_start = json.loads(output_start_json)
+        output_start = await self.tcp_communicate_async(start_json_function_call)
         suggested_map = convert_json_map_to_data_map(output_start)
         return suggested_map
 
     def setup(self, map: Map, rails: int, cards: dict) -> None:
         """Set up the player with a map, number of rails, and hand of cards"""
+        self.run_until_complete(self.setup_async(map, rails, cards))
+
+    async def setup_async(self, map: Map, rails: int, cards: dict) -> None:
+        """Coroutine version of setup."""
+        self.last_sent_game_state = None
         setup_json_argument = [map.get_as_json(), rails, convert_card_star_to_json(cards)]
         setup_json_function_call = ["setup", setup_json_argument]
-        self.tcp_communicate(setup_json_function_call, False)
+        await self.tcp_communicate_async(setup_json_function_call, False)
 
     def pick(self, destinations: set) -> set:
         """pick two destinations from a set of five. Return the three unwanted destinations"""
+        return self.run_until_complete(self.pick_async(destinations))
+
+    async def pick_async(self, destinations: set) -> set:
+        """Coroutine version of pick."""
         pick_json_argument = \
             [[destination.get_as_json() for destination in destinations]]
         pick_json_function_call = ["pick", pick_json_argument]
-        pick_json_response = self.tcp_communicate(pick_json_function_call)
-        pick_pythonic_json = json.loads(pick_json_response)
+        pick_pythonic_json = await self.tcp_communicate_async(pick_json_function_call)
         output_destinations = set()
         for dest in pick_pythonic_json:
             output_destinations.add(convert_from_json_to_destination(dest))
@@ -94,16 +161,39 @@ class RemotePlayerProxy(AbstractPlayer):
 
     def play(self, active_game_state: PlayerGameState) -> PlayerMove:
         """Play a turn. Given a playergamestate, decide to request more cards or a new connection"""
-        play_json_argument = [active_game_state.get_as_json()]
+        return self.run_until_complete(self.play_async(active_game_state))
+
+    async def play_async(self, active_game_state: PlayerGameState) -> PlayerMove:
+        """Coroutine version of play."""
+        play_json_argument = [self.get_game_state_update_as_json(active_game_state)]
         play_json_function_call = ["play", play_json_argument]
-        play_json_response = self.tcp_communicate(play_json_function_call)
-        response_loaded_from_json = json.loads(play_json_response)
+        response_loaded_from_json = await self.tcp_communicate_async(play_json_function_call)
         return convert_from_json_to_playermove(response_loaded_from_json)
 
+    def get_game_state_update_as_json(self, active_game_state: PlayerGameState) -> dict:
+        """
+        Returns the argument to send the client on play: the whole PlayerState, or a PlayerStateDelta
+        from the last state sent if the client asked for delta updates.
+        """
+        game_state_json = None
+        if self.state_updates == DELTA_STATE_UPDATES and self.last_sent_game_state is not None:
+            delta_json = get_player_game_state_delta_as_json(self.last_sent_game_state, active_game_state)
+            if delta_json is not None:
+                game_state_json = {DELTA_KEY: delta_json}
+        if game_state_json is None:
+            game_state_json = active_game_state.get_as_json()
+        if self.state_updates == DELTA_STATE_UPDATES:
+            self.last_sent_game_state = snapshot_player_game_state(active_game_state)
+        return game_state_json
+
     def more(self, cards: list) -> None:
         # TODO this method, maybe convert card plus
         return super().more(cards)
 
+    async def more_async(self, cards: list) -> None:
+        """Coroutine version of more."""
+        return self.more(cards)
+
     def boot_player_from_game(self, reason_for_boot: str) -> None:
         self.writer.close()
 
@@ -117,16 +207,26 @@ class RemotePlayerProxy(AbstractPlayer):
 
     def win(self, winner: bool) -> None:
         """Notify the player whether or not they won the game"""
+        self.run_until_complete(self.win_async(winner))
+
+    async def win_async(self, winner: bool) -> None:
+        """Coroutine version of win."""
         win_method_call = ["win", [winner]]
-        self.tcp_communicate(win_method_call, False)
-        if not winner:
+        await self.tcp_communicate_async(win_method_call, False)
+        if not winner and not self.persistent:
             self.writer.close()
 
     def boot_player_from_tournament(self, reason_for_boot: str) -> None:
         self.writer.close()
 
     def end(self, winner: bool) -> None:
-        """Notify the player that the tournament is over. This will close off the writer."""
+        """Notify the player that the tournament is over. This will close off the writer, unless the
+        client has a persistent session."""
+        self.run_until_complete(self.end_async(winner))
+
+    async def end_async(self, winner: bool) -> None:
+        """Coroutine version of end."""
         end_method_call = ["end", [winner]]
-        self.tcp_communicate(end_method_call, False)
-        self.writer.close()
+        await self.tcp_communicate_async(end_method_call, False)
+        if not self.persistent:
+            self.writer.close()
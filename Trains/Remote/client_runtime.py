@@ -0,0 +1,68 @@
+import asyncio
+import sys
+from typing import List
+
+sys.path.append('../../')
+from Trains.Remote.server_proxy import GamePlayException, ServerProxy
+
+
+class ClientRuntime:
+    """
+    Runs many ServerProxy sessions as tasks on one event loop, so one process can host hundreds of clients
+    (e.g. bots generating load against a Server) without a thread and an event loop per client.
+
+    Sessions only share the event loop: a session that fails to connect or is disconnected ends with a
+    loss without affecting the others. Give the ServerProxys a shared thread or process pool (see
+    ServerProxy.executor) to keep CPU-heavy strategies from holding up the other sessions.
+    """
+
+    def __init__(self, server_proxies: List[ServerProxy], sign_up_interval: float = 0):
+        """
+        Constructor for a ClientRuntime.
+            Parameters:
+                server_proxies (list(ServerProxy)): The clients to run
+                sign_up_interval (float): Seconds between the sign ups of consecutive clients, so they sign up
+                    in order and a server's accept queue is not flooded (0 to connect all at once)
+        """
+        self.server_proxies = server_proxies
+        self.sign_up_interval = sign_up_interval
+        # Sessions that could not connect or were disconnected by an error.
+        self.failed_sessions = 0
+
+    def run(self) -> List[bool]:
+        """
+        Runs every session on a new event loop until they are all over.
+            Returns:
+                Whether each client won its (last) tournament, in the order of the clients
+        """
+        event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(event_loop)
+        try:
+            return event_loop.run_until_complete(self.run_async())
+        finally:
+            event_loop.close()
+            asyncio.set_event_loop(None)
+
+    async def run_async(self) -> List[bool]:
+        """
+        Coroutine version of run, which runs the sessions on the running event loop.
+        """
+        sessions = [self.run_session(server_proxy, index * self.sign_up_interval)
+                    for index, server_proxy in enumerate(self.server_proxies)]
+        return list(await asyncio.gather(*sessions))
+
+    async def run_session(self, server_proxy: ServerProxy, delay: float = 0) -> bool:
+        """
+        Runs one client's session after a delay.
+            Returns:
+                Whether the client won, or False if the session failed
+        """
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            return await server_proxy.play_game_async()
+        except (GamePlayException, OSError):
+            self.failed_sessions += 1
+            if server_proxy.writer is not None:
+                server_proxy.writer.close()
+            return False
@@ -0,0 +1,126 @@
+from collections import deque
+import sys
+from typing import Deque, List
+
+sys.path.append('../../')
+from Trains.Remote.Remote_Player_Proxy import RemotePlayerProxy
+
+# How long a client stays connected to a server.
+#   single: the connection is closed once the client loses a game or the tournament ends (the original protocol).
+#   persistent: the connection stays open across tournaments, so the client plays every tournament the server
+#               runs until the server or the client closes it. Clients are sent win and end as usual, and are
+#               then sent start when the next tournament begins (see RemotePlayerProxy.persistent).
+# A client asks for a persistent session by including {"session": "persistent"} in its sign up message.
+# Servers that do not keep connections ignore the request and close the connection as usual.
+SESSION_KEY = "session"
+SINGLE_SESSION = "single"
+PERSISTENT_SESSION = "persistent"
+
+# Maximum number of signed up clients waiting for a place in a full connection pool.
+MAX_WAITING_CLIENTS = 256
+
+
+def requests_persistent_session(sign_up_message: list) -> bool:
+    """
+    Determines if a client's sign up message asks for a persistent session.
+        Parameters:
+            sign_up_message (list): The sign up message, [name, option, ...]
+        Returns:
+            True if any option is {"session": "persistent"}, else False
+    """
+    return any(isinstance(option, dict) and option.get(SESSION_KEY) == PERSISTENT_SESSION
+               for option in sign_up_message[1:])
+
+
+def is_connected(player: RemotePlayerProxy) -> bool:
+    """
+    Passive health check of a client's connection: whether the server has not closed it (e.g. by booting
+    the player, or ending a single session) and the client has not closed it. Does not send anything, so
+    it is safe between tournaments, when clients are not expecting a message.
+    """
+    return not player.writer.is_closing() and not player.reader.at_eof()
+
+
+class PlayerConnectionPool:
+    """
+    The clients a long-running server keeps connected across tournaments (see Server.run_tournaments).
+
+    The pool holds at most capacity players, who play the next tournament. Clients that sign up while the
+    pool is full wait in a queue of at most max_waiting clients, and are promoted in order of sign up when
+    players are evicted. Before each tournament the pool evicts players whose connections were closed
+    (booted players, single session clients that finished, and clients that disconnected).
+    """
+
+    def __init__(self, players: List[RemotePlayerProxy], capacity: int, max_waiting: int = MAX_WAITING_CLIENTS):
+        """
+        Constructor for a PlayerConnectionPool.
+            Parameters:
+                players (list(RemotePlayerProxy)): The list of pooled players, shared with the server that
+                    signs them up. Updated in place.
+                capacity (int): Maximum number of pooled players
+                max_waiting (int): Maximum number of clients waiting for a place in the pool
+        """
+        self.players = players
+        self.capacity = capacity
+        self.max_waiting = max_waiting
+        self.waiting: Deque[RemotePlayerProxy] = deque()
+        self.evicted = 0
+        self.promoted = 0
+
+    def is_full(self) -> bool:
+        return len(self.players) >= self.capacity
+
+    def can_wait(self) -> bool:
+        """
+        Determines if a client can join the waiting queue.
+        """
+        return len(self.waiting) < self.max_waiting
+
+    def add_waiting(self, player: RemotePlayerProxy) -> None:
+        """
+        Adds a signed up client to the end of the waiting queue.
+        """
+        self.waiting.append(player)
+
+    def refresh(self) -> None:
+        """
+        Prepares the pool for a tournament: evicts pooled and waiting clients that are no longer connected
+        (see is_connected), then fills the pool from the waiting queue. Evicted connections are closed.
+        """
+        connected_players = []
+        for player in self.players:
+            if is_connected(player):
+                connected_players.append(player)
+            else:
+                self.evict(player)
+        self.players[:] = connected_players
+        while not self.is_full() and len(self.waiting) > 0:
+            player = self.waiting.popleft()
+            if is_connected(player):
+                self.players.append(player)
+                self.promoted += 1
+            else:
+                self.evict(player)
+
+    def evict(self, player: RemotePlayerProxy) -> None:
+        """
+        Closes the connection of a client that is no longer connected on the other end.
+        """
+        player.writer.close()
+        self.evicted += 1
+
+    def close(self) -> None:
+        """
+        Closes the connections of every pooled and waiting client.
+        """
+        for player in self.players + list(self.waiting):
+            player.writer.close()
+        self.waiting.clear()
+
+    def get_as_json(self) -> dict:
+        return {
+            "pooled": len(self.players),
+            "waiting": len(self.waiting),
+            "evicted": self.evicted,
+            "promoted": self.promoted
+        }
@@ -0,0 +1,310 @@
+import codecs, json, struct, sys
+from asyncio import StreamReader
+from json.decoder import WHITESPACE, JSONDecoder
+from typing import Any, List
+
+sys.path.append('../../')
+from Trains.Remote.networking_constants import MAX_MESSAGE_SIZE, READ_CHUNK_SIZE
+
+# Framings a message stream can use.
+#   raw: JSON values written back to back; a message ends where its JSON value ends. This is the
+#        original protocol and what a client that does not ask for a framing gets.
+#   newline: each message is compact JSON followed by a newline.
+#   length-prefixed: each message is an 8-byte big-endian payload length followed by that many
+#                    bytes of JSON.
+RAW_FRAMING = "raw"
+NEWLINE_FRAMING = "newline"
+LENGTH_PREFIXED_FRAMING = "length-prefixed"
+SUPPORTED_FRAMINGS = [RAW_FRAMING, NEWLINE_FRAMING, LENGTH_PREFIXED_FRAMING]
+
+# Framing negotiation: a client asks for a framing by adding {"framing": <framing>} to its sign up
+# message, and the server answers with {"framing": <framing>} (in raw framing) naming the framing
+# both sides use from then on. Servers that do not know about framings never answer, and clients
+# that do not ask are never sent an answer, so both keep using raw framing.
+FRAMING_KEY = "framing"
+
+MESSAGE_DELIMITER = b"\n"
+LENGTH_PREFIX = struct.Struct(">Q")
+JSON_LITERALS = ["true", "false", "null", "-"]
+UNICODE_ESCAPE_LENGTH = len("\\uXXXX")
+
+# Returned by MessageDecoder.next_message when no complete message is buffered. A sentinel is used
+# since null is a valid message.
+NO_MESSAGE = object()
+
+
+class MessageStreamClosed(Exception):
+    """
+    Exception raised when the other end of a message stream closes it before a whole message is read.
+    """
+    pass
+
+
+class MessageTooLarge(Exception):
+    """
+    Exception raised when the other end of a message stream sends (or announces, in length-prefixed framing)
+    a message of more than MAX_MESSAGE_SIZE bytes. The stream cannot be read any further.
+    """
+    pass
+
+
+def is_framing_message(message: Any) -> bool:
+    """
+    Determines if a message is a framing request/answer ({"framing": <framing>}).
+        Parameters:
+            message (Any): A decoded JSON message
+        Returns:
+            True if the message names a framing, else False
+    """
+    return isinstance(message, dict) and message.get(FRAMING_KEY) in SUPPORTED_FRAMINGS
+
+
+def encode_message(message: Any, framing: str = RAW_FRAMING) -> bytes:
+    """
+    Encodes a JSON message as bytes to be written to a stream with the given framing.
+        Parameters:
+            message (Any): Pythonic JSON to send
+            framing (str): The framing used by the stream
+        Returns:
+            The bytes to write
+    """
+    message_data = json.dumps(message).encode()
+    if framing == NEWLINE_FRAMING:
+        # json.dumps escapes newlines inside strings, so the delimiter only ends a message.
+        return message_data + MESSAGE_DELIMITER
+    if framing == LENGTH_PREFIXED_FRAMING:
+        return LENGTH_PREFIX.pack(len(message_data)) + message_data
+    return message_data
+
+
+class MessageDecoder:
+    """
+    Incrementally splits a stream of bytes into JSON messages. Received bytes are appended to one
+    reusable buffer and bytes are dropped from the front of it once their message is decoded. Messages
+    can be of any size and can arrive split across, or coalesced within, any number of reads.
+
+    In newline and length-prefixed framing, every byte is looked at once: the decoder remembers how
+    far it has searched for a delimiter, and a length prefix says exactly where a message ends. In raw
+    framing, received bytes are decoded to text once, as they arrive, and messages are parsed from an
+    offset into that text, which is trimmed once every buffered message has been parsed. Raw framing
+    has no way of knowing where a message ends, so an incomplete message is parsed again once more
+    bytes arrive.
+    """
+    def __init__(self, framing: str = RAW_FRAMING):
+        """
+        Constructor for a MessageDecoder.
+            Parameters:
+                framing (str): The framing of the stream being decoded
+        """
+        self.framing = framing
+        self.buffer = bytearray()
+        # Number of buffered bytes already searched for a message delimiter.
+        self.scanned = 0
+        self.json_decoder = JSONDecoder()
+        # Raw framing: the buffered bytes decoded to text, the offset in the text of the first character not
+        # yet parsed, and the number of buffered bytes before that offset.
+        self.text = ""
+        self.text_offset = 0
+        self.parsed_bytes = 0
+        # Keeps the bytes of a character split across reads until the rest of it arrives.
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        if framing == RAW_FRAMING:
+            self.decode_buffer()
+
+    def set_framing(self, framing: str) -> None:
+        """
+        Changes the framing used to decode the rest of the stream. Bytes already buffered after the
+        last decoded message are decoded with the new framing.
+            Parameters:
+                framing (str): The new framing
+        """
+        if self.framing == RAW_FRAMING:
+            self.trim_text()
+        self.framing = framing
+        self.scanned = 0
+        if framing == RAW_FRAMING:
+            self.decode_buffer()
+
+    def decode_buffer(self) -> None:
+        """
+        Decodes the whole buffer to text, to start decoding the stream with raw framing.
+        """
+        self.text_decoder.reset()
+        self.text = self.text_decoder.decode(bytes(self.buffer))
+        self.text_offset = 0
+        self.parsed_bytes = 0
+
+    def trim_text(self) -> None:
+        """
+        Drops the text and bytes of the messages parsed with raw framing from the front of the buffers.
+        """
+        self.text = self.text[self.text_offset:]
+        del self.buffer[:self.parsed_bytes]
+        self.text_offset = 0
+        self.parsed_bytes = 0
+
+    def feed(self, data: bytes) -> None:
+        """
+        Adds bytes received from the stream to the buffer.
+            Parameters:
+                data (bytes): Bytes received from the stream
+        """
+        self.buffer += data
+        if self.framing == RAW_FRAMING:
+            self.text += self.text_decoder.decode(data)
+
+    def next_message(self) -> Any:
+        """
+        Decodes the next complete message in the buffer and removes its bytes from the buffer.
+            Returns:
+                Pythonic JSON of the next message, or NO_MESSAGE if no complete message is buffered
+            Throws:
+                json.JSONDecodeError if a complete message is not valid JSON
+                MessageTooLarge if the next message is longer than MAX_MESSAGE_SIZE bytes
+        """
+        if self.framing == NEWLINE_FRAMING:
+            return self.next_delimited_message()
+        if self.framing == LENGTH_PREFIXED_FRAMING:
+            return self.next_length_prefixed_message()
+        return self.next_raw_message()
+
+    def next_messages(self) -> List[Any]:
+        """
+        Decodes every complete message in the buffer.
+            Returns:
+                List of pythonic JSON messages in the order they were received
+        """
+        messages = []
+        message = self.next_message()
+        while message is not NO_MESSAGE:
+            messages.append(message)
+            message = self.next_message()
+        return messages
+
+    def next_delimited_message(self) -> Any:
+        """
+        next_message for newline framing.
+        """
+        delimiter_index = self.buffer.find(MESSAGE_DELIMITER, self.scanned)
+        if delimiter_index == -1:
+            self.scanned = len(self.buffer)
+            self.check_message_size(len(self.buffer))
+            return NO_MESSAGE
+        self.check_message_size(delimiter_index)
+        message_data = bytes(self.buffer[:delimiter_index])
+        del self.buffer[:delimiter_index + len(MESSAGE_DELIMITER)]
+        self.scanned = 0
+        return json.loads(message_data)
+
+    def next_length_prefixed_message(self) -> Any:
+        """
+        next_message for length-prefixed framing.
+        """
+        prefix_size = LENGTH_PREFIX.size
+        if len(self.buffer) < prefix_size:
+            return NO_MESSAGE
+        message_size, = LENGTH_PREFIX.unpack_from(self.buffer)
+        self.check_message_size(message_size)
+        if len(self.buffer) < prefix_size + message_size:
+            return NO_MESSAGE
+        message_data = bytes(self.buffer[prefix_size:prefix_size + message_size])
+        del self.buffer[:prefix_size + message_size]
+        return json.loads(message_data)
+
+    def next_raw_message(self) -> Any:
+        """
+        next_message for raw framing. Messages are parsed from the text after the last parsed message,
+        and the buffers are only trimmed once no complete message is left.
+        """
+        text = self.text
+        message_start = WHITESPACE.match(text, self.text_offset).end()
+        if message_start == len(text):
+            # JSON whitespace is ASCII, so it takes a byte per character.
+            self.parsed_bytes += message_start - self.text_offset
+            self.text_offset = message_start
+            self.trim_text()
+            return NO_MESSAGE
+        try:
+            message, message_end = self.json_decoder.raw_decode(text, message_start)
+        except json.JSONDecodeError as error:
+            if self.is_incomplete_raw_message(text, error):
+                self.trim_text()
+                self.check_message_size(len(self.buffer))
+                return NO_MESSAGE
+            raise
+        message_size = len(text[self.text_offset:message_end].encode())
+        self.check_message_size(message_size)
+        self.parsed_bytes += message_size
+        self.text_offset = message_end
+        return message
+
+    @staticmethod
+    def check_message_size(message_size: int) -> None:
+        """
+        Rejects a message (or the part of one received so far) of more than MAX_MESSAGE_SIZE bytes.
+            Throws:
+                MessageTooLarge if the message is too large
+        """
+        if message_size > MAX_MESSAGE_SIZE:
+            raise MessageTooLarge(f"Message of {message_size} bytes exceeds {MAX_MESSAGE_SIZE} bytes.")
+
+    @staticmethod
+    def is_incomplete_raw_message(text: str, error: json.JSONDecodeError) -> bool:
+        """
+        Determines if a JSON decoding error in raw framing was caused by the message not having been
+        fully received yet, as opposed to the message being invalid JSON.
+            Parameters:
+                text (str): The buffered text being decoded
+                error (JSONDecodeError): The error from decoding the text
+            Returns:
+                True if more bytes could complete the message, else False
+        """
+        if error.pos >= len(text) or error.msg.startswith("Unterminated string"):
+            return True
+        # The message may end part way through a \uXXXX escape.
+        if error.msg.startswith("Invalid \\uXXXX escape") and error.pos + UNICODE_ESCAPE_LENGTH > len(text):
+            return True
+        # The message may end part way through a literal, e.g. "[tr" of "[true]".
+        remaining_text = text[error.pos:]
+        return any(literal.startswith(remaining_text) for literal in JSON_LITERALS)
+
+
+class MessageReader:
+    """
+    Reads framed JSON messages from an asyncio StreamReader, see MessageDecoder.
+    """
+    def __init__(self, reader: StreamReader, framing: str = RAW_FRAMING):
+        """
+        Constructor for a MessageReader.
+            Parameters:
+                reader (StreamReader): The stream to read messages from
+                framing (str): The framing of the stream
+        """
+        self.reader = reader
+        self.decoder = MessageDecoder(framing)
+
+    def set_framing(self, framing: str) -> None:
+        """
+        Changes the framing used to read the rest of the stream.
+            Parameters:
+                framing (str): The new framing
+        """
+        self.decoder.set_framing(framing)
+
+    async def read_message(self) -> Any:
+        """
+        Reads the next message from the stream, waiting for as many reads as it takes to receive it.
+            Returns:
+                Pythonic JSON of the message
+            Throws:
+                MessageStreamClosed if the stream ends before a whole message is read
+                MessageTooLarge if the message is longer than MAX_MESSAGE_SIZE bytes
+        """
+        message = self.decoder.next_message()
+        while message is NO_MESSAGE:
+            data = await self.reader.read(READ_CHUNK_SIZE)
+            if data == b"":
+                raise MessageStreamClosed("Stream closed while reading a message.")
+            self.decoder.feed(data)
+            message = self.decoder.next_message()
+        return message
@@ -93,9 +93,10 @@ THIS_PLAYER_SCHEMA = {
         "destination2": DESTINATION_SCHEMA,
         "rails": {"type": "number"},
         "cards": CARD_STAR_SCHEMA,
+        # Acquired connections are sent with their cities' positions, as in game_info.
         "acquired": {"type": "array",
                      "items":
-                         ACQUIRED_SCHEMA
+                         CONNECTION_SCHEMA
                      }
     }
 }
@@ -163,7 +164,7 @@ SETUP_SCHEMA = {"type": "array",
                 "prefixItems": [
                     MAP_SCHEMA,
                     {"type": "number"},
-                    CARD_PLUS_SCHEMA
+                    CARD_STAR_SCHEMA
                 ]}
 
 PICK_SCHEMA = {"type": "array",
@@ -0,0 +1,42 @@
+import sys
+from typing import Any, Dict, Tuple
+
+from jsonschema.validators import validator_for
+sys.path.append('../../../')
+
+# Validators built from the schemas in message_schemas.py, keyed by the id of their schema. Each entry
+# keeps its schema alive, so an id cannot be reused by another schema while it is cached.
+COMPILED_VALIDATORS: Dict[int, Tuple[dict, Any]] = {}
+
+
+def get_schema_validator(schema: dict) -> Any:
+    """
+    Returns a validator for a JSON schema. jsonschema.validate picks a validator class, checks the
+    schema against its metaschema and builds a validator on every call; this does it once per schema.
+        Parameters:
+            schema (dict): The JSON schema to validate against
+        Returns:
+            The jsonschema validator for the schema
+        Throws:
+            jsonschema.exceptions.SchemaError if the schema is invalid
+    """
+    cached = COMPILED_VALIDATORS.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+    COMPILED_VALIDATORS[id(schema)] = (schema, validator)
+    return validator
+
+
+def is_valid_json(instance: Any, schema: dict) -> bool:
+    """
+    Determines if pythonic JSON is valid under a JSON schema, using the cached validator for the schema.
+        Parameters:
+            instance (Any): The pythonic JSON to validate
+            schema (dict): The JSON schema to validate against
+        Returns:
+            True if the instance is valid, else False
+    """
+    return get_schema_validator(schema).is_valid(instance)
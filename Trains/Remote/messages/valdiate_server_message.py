@@ -1,12 +1,11 @@
-import jsonschema
 import sys
+from typing import Any
 
-from jsonschema.exceptions import ValidationError
-
+sys.path.append('../../../')
 from Trains.Remote.messages.message_schemas import END_SCHEMA, GAME_BOOT_SCHEMA, \
     METHOD_CALL_SCHEMA, MORE_SCHEMA, PICK_SCHEMA, PLAY_SCHEMA, SETUP_SCHEMA, \
         START_SCHEMA, TOURNAMENT_BOOT_SCHEMA, WIN_SCHEMA
-sys.path.append('../../../')
+from Trains.Remote.messages.schema_validators import get_schema_validator
 
 METHOD_CALL_VALIDATION_SCHEMAS = {
     "start": START_SCHEMA,
@@ -22,32 +21,147 @@ METHOD_CALL_VALIDATION_SCHEMAS = {
     "end": END_SCHEMA
 }
 
-def validate_server_message(server_message_json: list):
+# Validators are built once, when this module is imported.
+METHOD_CALL_VALIDATOR = get_schema_validator(METHOD_CALL_SCHEMA)
+METHOD_CALL_ARGS_VALIDATORS = {method_name: get_schema_validator(schema)
+                               for method_name, schema in METHOD_CALL_VALIDATION_SCHEMAS.items()}
+
+
+def is_json_number(value: Any) -> bool:
+    """Determines if a value is a JSON number (booleans are not)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_json_string(value: Any) -> bool:
+    """Determines if a value is a JSON string."""
+    return isinstance(value, str)
+
+
+def is_json_boolean(value: Any) -> bool:
+    """Determines if a value is a JSON boolean."""
+    return isinstance(value, bool)
+
+
+def is_valid_prefix(value: Any, item_checks: tuple) -> bool:
+    """
+    Determines if a value is a list whose first items pass the given checks, in order, like the
+    prefixItems of a schema. Lists shorter than the checks only have their items checked.
+    """
+    return isinstance(value, list) and all(check(item) for item, check in zip(value, item_checks))
+
+
+def is_valid_list_of(value: Any, item_check) -> bool:
+    """Determines if a value is a list whose items all pass a check, like the items of a schema."""
+    return isinstance(value, list) and all(item_check(item) for item in value)
+
+
+def is_valid_object(value: Any, property_checks: dict) -> bool:
+    """
+    Determines if a value is an object whose properties pass the checks for them, like the properties
+    of a schema. Missing and extra properties are valid.
+    """
+    return isinstance(value, dict) and all(check(value[name]) for name, check in property_checks.items()
+                                           if name in value)
+
+
+def is_valid_city(value: Any) -> bool:
+    """CITY_SCHEMA"""
+    return is_valid_prefix(value, CITY_CHECKS)
+
+
+def is_valid_connection(value: Any) -> bool:
+    """CONNECTION_SCHEMA"""
+    return is_valid_prefix(value, CONNECTION_CHECKS)
+
+
+def is_valid_destination(value: Any) -> bool:
+    """DESTINATION_SCHEMA"""
+    return is_valid_prefix(value, DESTINATION_CHECKS)
+
+
+def is_valid_opponent_info_entry(value: Any) -> bool:
+    """The items of OPPONENT_INFO_SCHEMA"""
+    return is_valid_object(value, OPPONENT_INFO_ENTRY_CHECKS)
+
+
+def is_valid_player_game_state(value: Any) -> bool:
+    """PLAYER_GAME_STATE_SCHEMA"""
+    return is_valid_object(value, PLAYER_GAME_STATE_CHECKS)
+
+
+# Checks mirroring the schemas in message_schemas.py that make up PLAY_SCHEMA.
+CITY_CHECKS = (is_json_string, lambda position: is_valid_list_of(position, is_json_number))
+CONNECTION_CHECKS = (is_valid_city, is_valid_city, is_json_string, is_json_number)
+DESTINATION_CHECKS = (is_valid_city, is_valid_city)
+CARD_STAR_CHECKS = {"red": is_json_number, "blue": is_json_number, "green": is_json_number, "white": is_json_number}
+THIS_PLAYER_CHECKS = {
+    "destination1": is_valid_destination,
+    "destination2": is_valid_destination,
+    "rails": is_json_number,
+    "cards": lambda cards: is_valid_object(cards, CARD_STAR_CHECKS),
+    "acquired": lambda acquired: is_valid_list_of(acquired, is_valid_connection)
+}
+GAME_INFO_CHECKS = {
+    "unacquired_connections": lambda connections: is_valid_list_of(connections, is_valid_connection),
+    "cards_in_deck": is_json_number,
+    "last_turn": is_json_boolean
+}
+OPPONENT_INFO_ENTRY_CHECKS = {
+    "connections": lambda connections: is_valid_list_of(connections, is_valid_connection),
+    "number_of_cards": is_json_number
+}
+PLAYER_GAME_STATE_CHECKS = {
+    "this": lambda this_player: is_valid_object(this_player, THIS_PLAYER_CHECKS),
+    "game_info": lambda game_info: is_valid_object(game_info, GAME_INFO_CHECKS),
+    "opponent_info": lambda opponent_info: is_valid_list_of(opponent_info, is_valid_opponent_info_entry)
+}
+PLAY_ARGS_CHECKS = (is_valid_player_game_state,)
+
+
+def is_valid_play_args(method_args: Any) -> bool:
+    """
+    Hand-written check of the arguments of play (and update_player_game_state) that accepts exactly
+    what PLAY_SCHEMA accepts. A play call carries the whole game state every turn, so this is the
+    message that is validated most, and the check is several times faster than the schema validator.
+        Parameters:
+            method_args (Any): Pythonic JSON of the arguments
+        Returns:
+            True if the arguments are valid under PLAY_SCHEMA, else False
+    """
+    return is_valid_prefix(method_args, PLAY_ARGS_CHECKS)
+
+
+METHOD_CALL_ARGS_FAST_VALIDATORS = {
+    "play": is_valid_play_args,
+    "update_player_game_state": is_valid_play_args
+}
+
+
+def validate_server_message(server_message_json: list, use_fast_path: bool = True) -> bool:
     """
     Given a python representation of a JSON containing a message from the server
-    (data for method call, or a [string, [args]]), return True if the JSON is 
+    (data for method call, or a [string, [args]]), return True if the JSON is
     well-formed and structurally valid, else false.
         Parameters:
             server_message_json (MethodCallJSON): Pythonic JSON containing a method name and
                 data for its arguments.
+            use_fast_path (bool): Whether to check the arguments of play with the hand-written
+                validator rather than the schema validator (both accept the same messages).
         Returns:
             True if it is valid/well-formed, else False.
     """
-    try:
-        jsonschema.validate(instance=server_message_json, schema=METHOD_CALL_SCHEMA)
-
-        # Method name variables.
-        method_name_index = 0
-        method_name = server_message_json[method_name_index]
-        possible_method_names = set(METHOD_CALL_VALIDATION_SCHEMAS.keys())
-
-        # Method args variables.
-        method_args_index = 1
-        method_args = server_message_json[method_args_index]
-        if method_name in possible_method_names:
-            jsonschema.validate(instance=method_args, schema=METHOD_CALL_VALIDATION_SCHEMAS[method_name])
-            return True
-        
-    except ValidationError:
+    if not METHOD_CALL_VALIDATOR.is_valid(server_message_json) or len(server_message_json) < 2:
         return False
-        
\ No newline at end of file
+
+    # Method name variables.
+    method_name_index = 0
+    method_name = server_message_json[method_name_index]
+    if method_name not in METHOD_CALL_ARGS_VALIDATORS:
+        return False
+
+    # Method args variables.
+    method_args_index = 1
+    method_args = server_message_json[method_args_index]
+    if use_fast_path and method_name in METHOD_CALL_ARGS_FAST_VALIDATORS:
+        return METHOD_CALL_ARGS_FAST_VALIDATORS[method_name](method_args)
+    return METHOD_CALL_ARGS_VALIDATORS[method_name].is_valid(method_args)
@@ -1,8 +1,11 @@
-import jsonschema
 import sys
 
-from jsonschema.exceptions import ValidationError
 sys.path.append('../../../')
+from Trains.Remote.messages.message_schemas import CONNECTION_SCHEMA
+from Trains.Remote.messages.schema_validators import get_schema_validator
+
+# An action that acquires a connection is sent as the connection's JSON (see AcquireConnectionMove).
+ACQUIRE_ACTION_VALIDATOR = get_schema_validator(CONNECTION_SCHEMA)
 
 
 def validate_action_message(formatted_json_action):
@@ -14,12 +17,6 @@ def validate_action_message(formatted_json_action):
         Returns:
             True if the json is well-formed and structurally valid, else false.
     """
-    try:
-        is_more_cards = type(formatted_json_action) == str \
-            and formatted_json_action == "more cards"
-
-        # Validation returns None assuming no exception thrown.
-        return is_more_cards or jsonschema.validate() is None
-    
-    except ValidationError:
-        return False
+    is_more_cards = type(formatted_json_action) == str \
+        and formatted_json_action == "more cards"
+    return is_more_cards or ACQUIRE_ACTION_VALIDATOR.is_valid(formatted_json_action)
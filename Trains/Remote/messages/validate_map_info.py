@@ -1,10 +1,11 @@
 import sys
-import jsonschema
-from jsonschema.exceptions import ValidationError
 
 sys.path.append('../../../')
-from Trains.Remote.messages.message_schemas import DESTINATION_PLUS_SCHEMA
-from message_schemas import MAP_SCHEMA
+from Trains.Remote.messages.message_schemas import DESTINATION_PLUS_SCHEMA, MAP_SCHEMA
+from Trains.Remote.messages.schema_validators import get_schema_validator
+
+MAP_VALIDATOR = get_schema_validator(MAP_SCHEMA)
+DESTINATION_PLUS_VALIDATOR = get_schema_validator(DESTINATION_PLUS_SCHEMA)
 
 def validate_map_json(formatted_json_map) -> bool:
     """
@@ -17,11 +18,7 @@ def validate_map_json(formatted_json_map) -> bool:
         Returns:
             True if the formatted json is valid, else False.
     """
-    try:
-        jsonschema.validate(instance=formatted_json_map, schema=MAP_SCHEMA)
-        return True
-    except ValidationError:
-        return False
+    return MAP_VALIDATOR.is_valid(formatted_json_map)
 
 def validate_destination_plus(formatted_json_destination_set):
     """
@@ -32,8 +29,4 @@ def validate_destination_plus(formatted_json_destination_set):
         Returns:
             True if the formatted json is valid, else False. 
     """
-    try:
-        jsonschema.validate(instance=formatted_json_destination_set, schema=DESTINATION_PLUS_SCHEMA)
-        return True
-    except:
-        return False
+    return DESTINATION_PLUS_VALIDATOR.is_valid(formatted_json_destination_set)
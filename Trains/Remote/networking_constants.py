@@ -1,3 +1,7 @@
-MAX_MESSAGE_SIZE = 20000 # Number of bytes we read on each reader.read() call.
-# reader.read() will read a specifed number of bytes, or until the end of file is reached.
-# The end of file is only reached when the writer is closed, so we read a finite amount of bytes
\ No newline at end of file
+READ_CHUNK_SIZE = 20000 # Maximum number of bytes we read on each reader.read() call.
+# reader.read() will read up to a specifed number of bytes, returning as soon as any bytes are available.
+# Messages are not limited to this size: a MessageReader keeps reading chunks until it has a whole message
+# (see Trains/Remote/message_framing.py).
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024 # Maximum number of bytes in one message.
+# A message announced or buffered past this size is rejected and its connection closed, so a peer cannot make
+# the other side buffer without bound. The largest game states on 500-city maps are well under 1 MB.
@@ -1,14 +1,20 @@
 from asyncio import events
-from collections import deque
-import json, time, sys
+from dataclasses import dataclass
+import time, sys
 from threading import Thread
-from typing import Deque, List
+from typing import List, Optional, Set
 sys.path.append('../../')
-from Trains.Remote.networking_constants import MAX_MESSAGE_SIZE
+from Trains.Remote.connection_pool import MAX_WAITING_CLIENTS, PlayerConnectionPool, requests_persistent_session
+from Trains.Remote.message_framing import FRAMING_KEY, RAW_FRAMING, MessageReader, encode_message, \
+    is_framing_message
 from Trains.Remote.Remote_Player_Proxy import RemotePlayerProxy
+from Trains.Remote.state_updates import DELTA_STATE_UPDATES, FULL_STATE_UPDATES, requests_delta_state_updates
 from Trains.Admin.manager import Manager
+from Trains.Admin.async_manager import AsyncManager
 from Trains.Admin.referee import NotEnoughDestinations
-from Trains.Common.map import Color
+from Trains.Admin.game_random import RandomSource
+from Trains.Admin.instrumentation import MetricsRegistry
+from Trains.Common.cards import Deck
 from Trains.Other.Types.trains_types import TournmentResult
 
 # ayncio imports
@@ -17,6 +23,62 @@ from asyncio.streams import StreamReader, StreamWriter
 
 MIN_NUMBER_OF_PLAYERS_FOR_GAME = 2
 NO_RESULT = [[], []]
+# Maximum number of connections the operating system queues for the server before they are accepted.
+SIGN_UP_BACKLOG = 1024
+# Maximum number of clients whose sign up messages are read at once. Clients beyond it wait for a slot
+# (back-pressure), within their handshake deadline.
+MAX_PENDING_HANDSHAKES = 256
+
+
+@dataclass
+class SignUpMetrics:
+    """
+    Admission metrics of a server's sign up phase.
+        connections (int): Connections accepted during sign up
+        admitted (int): Clients signed up as players
+        handshake_timeouts (int): Clients that did not finish signing up before their handshake deadline
+        handshake_errors (int): Clients that sent an invalid sign up message or closed the connection
+        rejected (int): Clients turned away because sign up was over or the server was full
+        peak_pending_handshakes (int): Most clients signing up at the same time
+        total_handshake_time (float): Seconds admitted clients took to sign up, in total
+        sign_up_time (float): Seconds the sign up phase lasted
+    """
+    connections: int = 0
+    admitted: int = 0
+    handshake_timeouts: int = 0
+    handshake_errors: int = 0
+    rejected: int = 0
+    peak_pending_handshakes: int = 0
+    total_handshake_time: float = 0.0
+    sign_up_time: float = 0.0
+
+    def get_admission_rate(self) -> float:
+        """
+        Returns the number of clients admitted per second of sign up.
+        """
+        return self.admitted / self.sign_up_time if self.sign_up_time > 0 else 0.0
+
+    def get_mean_handshake_time(self) -> float:
+        """
+        Returns the mean number of seconds an admitted client took to sign up.
+        """
+        return self.total_handshake_time / self.admitted if self.admitted > 0 else 0.0
+
+    def get_as_json(self) -> dict:
+        """
+        Returns the metrics as a JSON object, including the admission rate and mean handshake time.
+        """
+        return {
+            "connections": self.connections,
+            "admitted": self.admitted,
+            "handshake_timeouts": self.handshake_timeouts,
+            "handshake_errors": self.handshake_errors,
+            "rejected": self.rejected,
+            "peak_pending_handshakes": self.peak_pending_handshakes,
+            "sign_up_time": self.sign_up_time,
+            "admission_rate": self.get_admission_rate(),
+            "mean_handshake_time": self.get_mean_handshake_time()
+        }
 
 
 # NOTE: In the docstrings, client and player will be used interchangeably as they are, for 
@@ -27,17 +89,44 @@ class Server():
     Objects of this class represent a server capable of connecting to clients (players) in order to carry out a game of trains.
     When a client connects, we should create an instance of a Remote Proxy Player for them and add them to the list of 
     players who will be playing in a tournament.    
+
+    Sign up is a coroutine that the event loop runs until it is over, so the tournament starts on the same
+    event loop without stopping it. Clients sign up concurrently: each one has a deadline to send its sign up
+    message, at most max_pending_handshakes are read at once, and the operating system queues at most
+    accept_backlog connections that have not been accepted yet. Admission metrics are kept in
+    self.sign_up_metrics.
+
+    run_server signs players up for one tournament. run_tournaments is a long-running mode that signs players
+    up once and runs tournaments back to back over the same connections: clients that ask for a persistent
+    session stay in self.connection_pool between tournaments, dead connections are evicted before each
+    tournament, and clients that connect after sign up wait in the pool's bounded queue for a place.
     """
     PLAYER_NAME_INDEX = 0
     PLAYER_STRATEGY_INDEX = 1
     CLIENT_TIMEOUT = 10
 
     def __init__(self, hostname: str, port: int, min_players_accepted: int, max_players_accepted: int, \
-        waiting_time: int, deck: Deque(Color) = None) -> None:
+        waiting_time: int, deck: Deck = None, concurrent_games: bool = False, rng: RandomSource = None,
+        handshake_timeout: float = RemotePlayerProxy.TIMEOUT, max_pending_handshakes: int = MAX_PENDING_HANDSHAKES,
+        accept_backlog: int = SIGN_UP_BACKLOG, max_waiting_clients: int = MAX_WAITING_CLIENTS,
+        metrics: MetricsRegistry = None) -> None:
         """
         Constructs an instance of a server given a host and a port that it should run on/allow clients to 
         connect on. The server is also given a deck of cards such that it can pass this to the Manager for
         running games.
+
+        If concurrent_games is True, the tournament is run by an AsyncManager, which plays every game of a
+        tournament round concurrently on the event loop instead of one player call at a time.
+
+        rng (a seed or random.Random) is handed to the Manager to seed the tournament's games with.
+
+        handshake_timeout is the number of seconds a client has to finish signing up once it is being read from.
+        max_pending_handshakes and accept_backlog bound the clients signing up and waiting to be accepted.
+        max_waiting_clients bounds the clients waiting for a place in the connection pool of a long-running
+        server (see run_tournaments).
+
+        metrics is handed to the Manager of every tournament to record the latency of player calls (remote
+        round trips) and referee work in (see Trains/Admin/instrumentation.py).
         """
         self.players = []
         self.hostname = hostname
@@ -46,9 +135,25 @@ class Server():
         self.max_players_accepted = max_players_accepted
         self.min_players_accepted = min_players_accepted
         self.first_wait_phase = True
-        self.sign_up_handles = []
         self.deck = deck
+        self.concurrent_games = concurrent_games
+        self.rng = rng
+        self.metrics = metrics
         self.active_server = None
+        self.handshake_timeout = handshake_timeout
+        self.max_pending_handshakes = max_pending_handshakes
+        self.accept_backlog = accept_backlog
+        self.sign_up_metrics = SignUpMetrics()
+        # Whether connections are kept across tournaments (see run_tournaments), and the clients kept.
+        self.keep_connections = False
+        self.connection_pool = PlayerConnectionPool(self.players, max_players_accepted, max_waiting_clients)
+        # Whether clients are still being signed up, and the tasks of clients that are signing up.
+        self.sign_up_open = True
+        self.pending_handshakes: Set[asyncio.Task] = set()
+        # Created on the event loop when the server is created (see create_asyncio_server_async).
+        self.sign_up_complete: Optional[asyncio.Event] = None
+        self.handshake_slots: Optional[asyncio.Semaphore] = None
+        self.client_waiting: Optional[asyncio.Event] = None
 
     # TODO: Define type TournamentResult
     def run_server(self) -> list:
@@ -72,6 +177,62 @@ class Server():
 
         return result
 
+    def run_tournaments(self, tournament_count: Optional[int] = None) -> List[TournmentResult]:
+        """
+        Long-running version of run_server. Signs players up once (see sign_up_players), then runs tournaments
+        back to back with the players in the connection pool, without closing the server in between.
+
+        Clients that ask for a persistent session (see Trains/Remote/connection_pool.py) are kept connected
+        and play every tournament; other clients play one tournament and are evicted. Before each tournament,
+        players whose connections were closed are evicted and clients waiting for a place are promoted (see
+        prepare_next_tournament_async).
+            Parameters:
+                tournament_count (int): Number of tournaments to run, or None to run tournaments until too
+                    few players are connected
+            Returns:
+                The result of each tournament, in order
+        """
+        event_loop = asyncio.get_event_loop()
+        self.keep_connections = True
+        self.active_server = self.create_asyncio_server()
+        self.sign_up_players()
+
+        results = []
+        while tournament_count is None or len(results) < tournament_count:
+            if not event_loop.run_until_complete(self.prepare_next_tournament_async()):
+                break
+            results.append(self.get_tournament_result())
+
+        self.connection_pool.close()
+        self.active_server.close()
+        event_loop.run_until_complete(self.active_server.wait_closed())
+        event_loop.close()
+        return results
+
+    async def prepare_next_tournament_async(self) -> bool:
+        """
+        Refreshes the connection pool before a tournament of a long-running server (see
+        PlayerConnectionPool.refresh). If too few players are connected, waits up to self.waiting_time for
+        clients to join the waiting queue.
+            Returns:
+                True if enough players are connected for a tournament, else False.
+        """
+        # Lets the event loop see connections that clients closed since the last tournament.
+        await asyncio.sleep(0)
+        self.connection_pool.refresh()
+        deadline = time.perf_counter() + self.waiting_time
+        while not self.enough_players_joined():
+            self.client_waiting.clear()
+            remaining_time = deadline - time.perf_counter()
+            if remaining_time <= 0:
+                break
+            try:
+                await asyncio.wait_for(self.client_waiting.wait(), remaining_time)
+            except asyncio.TimeoutError:
+                break
+            self.connection_pool.refresh()
+        return self.enough_players_joined()
+
     # Server Creation
 
     def create_asyncio_server(self) -> asyncio.AbstractServer:
@@ -82,8 +243,18 @@ class Server():
                 asyncio.Server to be used for connecting clients/players to the game.
         """
         event_loop = asyncio.get_event_loop()
-        server_coro = asyncio.start_server(self.on_client_connection, self.hostname, self.port, loop=event_loop)
-        return event_loop.run_until_complete(server_coro)
+        return event_loop.run_until_complete(self.create_asyncio_server_async())
+
+    async def create_asyncio_server_async(self) -> asyncio.AbstractServer:
+        """
+        Coroutine version of create_asyncio_server. Also creates the event and semaphore sign up uses on the
+        running event loop, before any client can connect.
+        """
+        self.sign_up_complete = asyncio.Event()
+        self.handshake_slots = asyncio.Semaphore(self.max_pending_handshakes)
+        self.client_waiting = asyncio.Event()
+        return await asyncio.start_server(self.on_client_connection, self.hostname, self.port,
+                                          backlog=self.accept_backlog)
 
     async def on_client_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
         """
@@ -91,29 +262,91 @@ class Server():
 
         Given the reader and the writer from connecting a client to the server, 
         create a RemoteProxyPlayer for them and append it to the list of players 
-        contained in this server (self.players).
+        contained in this server (self.players). At most self.max_pending_handshakes clients sign up
+        at once, and each must finish signing up within self.handshake_timeout seconds of getting a
+        handshake slot (see admit_client).
 
-        If the server should no longer be accepting client connections (see method 
-        Server.capacity_reached), then simply close the connection without creating a player.
+        If the server should no longer be accepting client connections (see method Server.can_admit_client),
+        then simply close the connection without creating a player.
 
         SIDE EFFECT: If player successfully signs up, RemoteProxyPlayer created/added to the 
-        self.players list.
+        self.players list, or to the connection pool's waiting queue once sign up is over or the
+        server is full. Updates self.sign_up_metrics.
         """
+        metrics = self.sign_up_metrics
+        metrics.connections += 1
+        if not self.can_admit_client():
+            metrics.rejected += 1
+            writer.close()
+            return
+
+        handshake = asyncio.current_task()
+        self.pending_handshakes.add(handshake)
+        metrics.peak_pending_handshakes = max(metrics.peak_pending_handshakes, len(self.pending_handshakes))
+        handshake_start = time.perf_counter()
         try:
-            connected_player = await self.create_player(reader, writer)
-            self.players.append(connected_player)
+            connected_player = await self.admit_client(reader, writer)
         except asyncio.TimeoutError:
             # Player should not be added if they cannot be successfully created.
+            metrics.handshake_timeouts += 1
+            writer.close()
+            return
+        except asyncio.CancelledError:
+            # Sign up ended while the client was signing up.
+            metrics.rejected += 1
+            writer.close()
+            return
+        except Exception:
+            metrics.handshake_errors += 1
             writer.close()
-            return 
+            return
+        finally:
+            self.pending_handshakes.discard(handshake)
+
+        if not self.can_admit_client():
+            metrics.rejected += 1
+            writer.close()
+            return
+        # The oldest player is the first admitted and the youngest the last. Ages are given here, in order of
+        # admission, as clients sign up concurrently.
+        connected_player.age = self.max_players_accepted - metrics.admitted
+        if self.sign_up_open and not self.capacity_reached():
+            self.players.append(connected_player)
+        else:
+            self.connection_pool.add_waiting(connected_player)
+            self.client_waiting.set()
+        metrics.admitted += 1
+        metrics.total_handshake_time += time.perf_counter() - handshake_start
         if self.capacity_reached():
-            self.end_sign_up_phase()
+            self.sign_up_complete.set()
+
+    def can_admit_client(self) -> bool:
+        """
+        Determines if a client can be signed up: as a player while sign up is open and the server is not full,
+        or, for a long-running server (see run_tournaments), into the connection pool's waiting queue if it
+        has room.
+            Returns:
+                True if the client can be signed up, else False.
+        """
+        if self.sign_up_open and not self.capacity_reached():
+            return True
+        return self.keep_connections and self.connection_pool.can_wait()
+
+    async def admit_client(self, reader: StreamReader, writer: StreamWriter) -> RemotePlayerProxy:
+        """
+        Waits for a handshake slot, then creates a player for a client (see create_player), which must
+        finish within self.handshake_timeout seconds. Bounds how many clients are read from at once, so a
+        burst of connections is admitted at a steady rate; clients waiting for a slot are disconnected if
+        sign up ends first.
+        """
+        async with self.handshake_slots:
+            return await asyncio.wait_for(self.create_player(reader, writer), self.handshake_timeout)
 
     async def create_player(self, reader: StreamReader, writer: StreamWriter) -> RemotePlayerProxy:
         """
         Given a a network I/O StreamReader and StreamWriter, create an instance of a RemotePlayerProxy
         from the data received from the StreamReader and instantiate an instance of  RemotePlayerProxy
-        containing the name and age received from the StreamReader and the StreamWriter.
+        containing the name received from the StreamReader and the StreamWriter.
             Parameters:
                 reader (StreamReader): The network input stream that receives data from the client (and 
                     will receive player information from the client on).
@@ -122,35 +355,83 @@ class Server():
                 A RemotePlayerProxy containing the player name and strategy information received over
                 the network, as well as the StreamReader and StreamWriter for the RemoteProxyPlayer
                 to receive method returns and send method calls over, respectively.
+        The client's sign up message may also ask for a message framing, for delta state updates and, if this
+        server keeps connections, for a persistent session.
         """
-        data = await asyncio.wait_for(reader.read(MAX_MESSAGE_SIZE), RemotePlayerProxy.TIMEOUT)
-        player_information_json = data.decode()
-        player_information = json.loads(player_information_json)
+        message_reader = MessageReader(reader)
+        player_information = await asyncio.wait_for(message_reader.read_message(), RemotePlayerProxy.TIMEOUT)
 
         player_name = player_information[self.PLAYER_NAME_INDEX]
-        # The oldest player should be the first to join and the youngest player
-        # should be the last to join. Thus, we just take the maximum number of 
-        # possibly players and subtract the current number of players from that.
-        player_age = self.max_players_accepted - len(self.players)
-
-        return RemotePlayerProxy(player_name, player_age, reader, writer)
+        framing = await self.negotiate_framing(player_information, message_reader, writer)
+        state_updates = DELTA_STATE_UPDATES if requests_delta_state_updates(player_information) else FULL_STATE_UPDATES
+        persistent = self.keep_connections and requests_persistent_session(player_information)
+        # Clients sign up concurrently, so the player is given its age once it is admitted (see on_client_connection).
+        return RemotePlayerProxy(player_name, 0, reader, writer, framing, message_reader, state_updates, persistent)
+
+    async def negotiate_framing(self, player_information: list, message_reader: MessageReader,
+                                writer: StreamWriter) -> str:
+        """
+        Determines the message framing to use with a client from its sign up message. A client asks
+        for a framing by including {"framing": <framing>} in its sign up message; the server answers
+        with the same message (in raw framing) and both sides use that framing from then on. Clients
+        that do not ask are not answered and keep using raw framing.
+            Parameters:
+                player_information (list): The sign up message received from the client
+                message_reader (MessageReader): The MessageReader reading from the client
+                writer (StreamWriter): The network output stream to the client
+            Returns:
+                The framing to use with the client
+        """
+        framing_requests = [info for info in player_information[self.PLAYER_NAME_INDEX + 1:] if is_framing_message(info)]
+        if len(framing_requests) == 0:
+            return RAW_FRAMING
+        framing = framing_requests[0][FRAMING_KEY]
+        writer.write(encode_message({FRAMING_KEY: framing}, RAW_FRAMING))
+        await writer.drain()
+        message_reader.set_framing(framing)
+        return framing
 
     # Sign Up Methods
 
     def sign_up_players(self) -> None:
         """
-        Attempts to sign up players to run a game of Trains. This sign up process occurs in two phases.
+        Attempts to sign up players to run a game of Trains (see sign_up_players_async). Runs the event loop
+        until sign up is over.
+        """
+        event_loop = asyncio.get_event_loop()
+        event_loop.run_until_complete(self.sign_up_players_async())
+
+    async def sign_up_players_async(self) -> None:
+        """
+        Signs up players to run a game of Trains. This sign up process occurs in two phases.
 
         The first phase waits for either the maximum number of players to join (self.max_players_accepted)
-        or, at the end of the time specified with self.waiting_time
+        or, at the end of the time specified with self.waiting_time, ends sign up if enough players
+        (self.min_players_accepted) have joined. Otherwise, the second phase lowers the minimum to the fewest
+        players possible for a game and waits another self.waiting_time (or until the maximum joins).
+
+        SIDE EFFECT: Sets self.first_wait_phase to False and self.min_players_accepted to the lowest
+        possible to run a game if the second phase is needed.
         """
-        event_loop = asyncio.get_event_loop()
-        first_waiting_phase_handle = \
-            event_loop.call_later(self.waiting_time, self.end_loop_upon_players_or_end_of_second_phase)
-        second_waiting_phase_handle = \
-            event_loop.call_later(self.waiting_time * 2, self.end_loop_upon_players_or_end_of_second_phase)
-        self.sign_up_handles = [first_waiting_phase_handle, second_waiting_phase_handle]
-        event_loop.run_forever()
+        sign_up_start = time.perf_counter()
+        if not await self.wait_for_capacity(self.waiting_time) and not self.enough_players_joined():
+            self.first_wait_phase = False
+            self.min_players_accepted = MIN_NUMBER_OF_PLAYERS_FOR_GAME
+            await self.wait_for_capacity(self.waiting_time)
+        await self.end_sign_up_phase()
+        self.sign_up_metrics.sign_up_time = time.perf_counter() - sign_up_start
+
+    async def wait_for_capacity(self, waiting_time: float) -> bool:
+        """
+        Waits up to waiting_time seconds for the maximum number of players to join.
+            Returns:
+                True if capacity was reached, else False.
+        """
+        try:
+            await asyncio.wait_for(self.sign_up_complete.wait(), waiting_time)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     def enough_players_joined(self) -> bool:
         """
@@ -180,36 +461,21 @@ class Server():
         """
         return len(self.players) == self.max_players_accepted
 
-    def end_loop_upon_players_or_end_of_second_phase(self) -> None:
-        """
-        Kills the event loop (from asyncio.get_event_loop()) if enough players 
-        have joined or if the server is in the second waiting period for 
-        sign up.
-
-        SIDE EFFECTS:
-            - Sets self.first_wait_phase to False if that phase has come to an end.
-            - Sets the minimum number of players accepted to the lowest possible to 
-            run a game.
-        """
-        if not self.first_wait_phase or self.enough_players_joined():
-            self.end_sign_up_phase()
-        else:
-            self.first_wait_phase = False
-            self.min_players_accepted = MIN_NUMBER_OF_PLAYERS_FOR_GAME
-
-    def end_sign_up_phase(self) -> None:
+    async def end_sign_up_phase(self) -> None:
         """
-        Ends the sign up phase for the server by stopping the running event loop
-        that allows for client/server callbacks and cancelling any tasks
-        that checked the number of players who joined after either the first or
-        second waiting period.
+        Ends the sign up phase for the server: clients that connect from now on are turned away, and clients
+        that are still signing up are disconnected. A long-running server instead lets them finish signing up
+        and adds them to the connection pool's waiting queue.
 
-        SIDE EFFECT: Any tasks with handles in the self.sign_up_handles list will be canceled.
+        SIDE EFFECT: Sets self.sign_up_open to False and cancels the tasks in self.pending_handshakes.
         """
-        for handle in self.sign_up_handles:
-            handle.cancel()
-        event_loop = asyncio.get_event_loop()
-        event_loop.stop()
+        self.sign_up_open = False
+        if self.keep_connections:
+            return
+        pending_handshakes = list(self.pending_handshakes)
+        for handshake in pending_handshakes:
+            handshake.cancel()
+        await asyncio.gather(*pending_handshakes, return_exceptions=True)
 
     # Running the Tournament
   
@@ -236,10 +502,15 @@ class Server():
     def start_tournament(self) -> TournmentResult:
         """
         Creates a new Manager with the list of RemotePlayerProxy (self.players) from clients who have connected.
-        Runs the tournament with the RemotePlayerProxy's and returns the result from doing so.
+        Runs the tournament with the RemotePlayerProxy's and returns the result from doing so. The Manager
+        eliminates players from its own copy of the list, so self.players still holds every client afterwards.
             Returns: [List[Player], List[Player]], a list containing two elements:
                     - The List of Winners
                     - The List of Cheaters
         """
-        manager = Manager(self.players, self.deck)
+        if self.concurrent_games:
+            manager = AsyncManager(list(self.players), self.deck, rng=self.rng, metrics=self.metrics)
+            event_loop = asyncio.get_event_loop()
+            return event_loop.run_until_complete(manager.run_tournament_async())
+        manager = Manager(list(self.players), self.deck, rng=self.rng, metrics=self.metrics)
         return manager.run_tournament()
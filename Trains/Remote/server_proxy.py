@@ -1,11 +1,15 @@
 import asyncio
-import json, sys
-from json.decoder import JSONDecoder
-from typing import Any
+from concurrent.futures import Executor
+import sys
+from typing import Any, List, Optional
 
 sys.path.append('../../')
 
-from Trains.Remote.networking_constants import MAX_MESSAGE_SIZE
+from Trains.Remote.connection_pool import PERSISTENT_SESSION, SESSION_KEY
+from Trains.Remote.message_framing import FRAMING_KEY, RAW_FRAMING, MessageReader, MessageStreamClosed, \
+    MessageTooLarge, encode_message, is_framing_message
+from Trains.Remote.state_updates import DELTA_KEY, DELTA_STATE_UPDATES, FULL_STATE_UPDATES, STATE_UPDATES_KEY, \
+    apply_player_game_state_delta, is_state_delta
 from Trains.Common.map import Map
 from Trains.Other.Mocks.mock_given_map_player import MockGivenMapPlayer
 from Trains.Other.Util.json_utils import convert_json_map_to_data_map, convert_json_player_state_to_data, \
@@ -16,6 +20,15 @@ from Trains.Remote.messages.valdiate_server_message import validate_server_messa
 
 METHOD_CALL_NAME_INDEX = 0
 METHOD_CALL_ARGS_INDEX = 1
+# Player methods a ServerProxy with an executor runs in the executor (see ServerProxy.call_player_method).
+OFFLOADED_PLAYER_METHODS = {"play"}
+
+
+def call_player_method(player: Any, method_name: str, *args) -> Any:
+    """
+    Calls a player method by name. Module level, so a process pool can run it on a pickled copy of the player.
+    """
+    return getattr(player, method_name)(*args)
 
 
 class ServerProxy:
@@ -31,11 +44,28 @@ class ServerProxy:
     name. The age will be set to 0 since the **actual** server (and admin components) 
     is the only component that cares about its age (defined based on when they joined; i.e,
     "how old it is"). 
+
+    The ServerProxy may ask the server to use a message framing other than the original raw framing
+    (see Trains/Remote/message_framing.py). If the server does not support framings, raw framing is used.
+    It may also ask for delta state updates, in which case it keeps the last PlayerGameState it received
+    and rebuilds each new one from the changes the server sends (see Trains/Remote/state_updates.py).
+
+    A persistent ServerProxy asks a long-running server to keep its connection across tournaments (see
+    Trains/Remote/connection_pool.py). It keeps playing after losing a game or the end of a tournament, waits
+    for the next tournament without a deadline, and stops when the server closes the connection.
+
+    Every ServerProxy session is a coroutine (play_game_async), so many of them can run as tasks on one event
+    loop (see Trains/Remote/client_runtime.py). A ServerProxy given an executor runs its player's play calls,
+    where strategies spend their time, in the executor so they do not hold up the other sessions on the loop.
+    With a thread pool, play runs on the player itself; with a process pool, it runs on a pickled copy of the
+    player, so changes play makes to the player are not kept.
     """
     TIMEOUT = 20.0
 
     # TODO: Maybe pass in a player instead of instantiating them in the class?
-    def __init__(self, hostname: str, port: int, player_name: str, strategy_name: str, map: Map) -> None:
+    def __init__(self, hostname: str, port: int, player_name: str, strategy_name: str, map: Map,
+                 framing: str = RAW_FRAMING, state_updates: str = FULL_STATE_UPDATES, persistent: bool = False,
+                 executor: Executor = None) -> None:
         """
         Initializes an instance of a ServerProxy with a given hostname and port to connect
         to an actual server with, as well as the name and strategy of a player.
@@ -44,6 +74,11 @@ class ServerProxy:
                 port (int): The port number the proxy is connecting to.
                 player_name(str): Name of the player.
                 strategy_name(str): Name of the player's strategy.
+                framing (str): The message framing to ask the server for.
+                state_updates (str): How to ask the server to send game states on play (full or delta).
+                persistent (bool): Whether to ask the server for a persistent session.
+                executor (Executor): Thread or process pool to run the player's play calls in, or None to run
+                    them on the event loop.
         """
         self.hostname = hostname
         self.port = port
@@ -53,6 +88,18 @@ class ServerProxy:
         self.player = MockGivenMapPlayer(player_name, 0, strategy_path, map)
         self.game_active, self.did_win = False, False
         self.reader, self.writer = None, None
+        self.requested_framing = framing
+        self.framing = RAW_FRAMING
+        self.message_reader = None
+        self.state_updates = state_updates
+        # The last PlayerGameState received on play, which delta state updates are applied to.
+        self.player_game_state = None
+        self.persistent = persistent
+        # Whether the player is in the current tournament (from start until it loses a game or the
+        # tournament ends), and whether it won each tournament it finished.
+        self.in_tournament = False
+        self.tournament_results: List[bool] = []
+        self.executor = executor
 
     def play_game(self) -> bool:
         """
@@ -66,35 +113,53 @@ class ServerProxy:
         win and end to determine if it won the tournnament or not. If it wins, the method will
         return True.
 
-            Returns: True if the client/player wins the tournament, else False. 
+            Returns: True if the client/player wins the tournament, else False. A persistent
+                ServerProxy returns whether it won the last tournament it finished.
         """
-        self.game_active = True
         event_loop = asyncio.new_event_loop()
         asyncio.set_event_loop(event_loop)
-        event_loop.run_until_complete(self.sign_up_for_game())
+        result = event_loop.run_until_complete(self.play_game_async())
+        event_loop.close()
+        return result
+
+    async def play_game_async(self) -> bool:
+        """
+        Coroutine version of play_game, which runs on the running event loop.
+        """
+        self.game_active = True
+        await self.sign_up_for_game()
 
         try:
-            result = event_loop.run_until_complete(self.execute_gameplay())
+            result = await self.execute_gameplay()
         except GamePlayException:
             result = False
-        
+
         self.writer.close()
-        event_loop.close()
-        
         return result
     
     async def sign_up_for_game(self) -> None:
         """
         Connects to a Trains.com server to sign up for a tournament. Opens a connection
-        with the server and sends the server our player information (name).
+        with the server and sends the server our player information (name), along with the
+        framing we would like to use if it is not raw framing and whether we would like
+        delta state updates.
 
         SIDE EFFECT: Sets the self.reader and self.writer fields with StreamReader
         and StreamWriter objects that are used to communicate over TCP.
         """
         self.reader, self.writer = await asyncio.open_connection(self.hostname, self.port)
+        self.message_reader = MessageReader(self.reader)
         sign_up_info = [self.player.name]
-        sign_up_info_msg = json.dumps(sign_up_info)
-        self.writer.write(sign_up_info_msg.encode())
+        sign_up_options = {}
+        if self.requested_framing != RAW_FRAMING:
+            sign_up_options[FRAMING_KEY] = self.requested_framing
+        if self.state_updates == DELTA_STATE_UPDATES:
+            sign_up_options[STATE_UPDATES_KEY] = DELTA_STATE_UPDATES
+        if self.persistent:
+            sign_up_options[SESSION_KEY] = PERSISTENT_SESSION
+        if len(sign_up_options) > 0:
+            sign_up_info.append(sign_up_options)
+        self.writer.write(encode_message(sign_up_info))
         await self.writer.drain()
 
     # TODO: Close connection if nothing back from the Server.
@@ -106,52 +171,53 @@ class ServerProxy:
         Once win(False) or end(True|False) is called on the player, return the boolean provided
         as the game result.
 
+        A persistent ServerProxy plays until the server closes the connection between tournaments.
+
             Returns: True if the player wins the tournament, else False.
         """
         while self.game_active:
-            server_data = await self.read_method_calls()
-            method_calls = self.process_method_calls_from_server(server_data)
-            for method_call_json in method_calls:
-                await self.execute_method_call(method_call_json)
+            try:
+                server_message = await self.read_method_call()
+            except GamePlayException:
+                if self.persistent and not self.in_tournament and len(self.tournament_results) > 0:
+                    break
+                raise
+            if is_framing_message(server_message):
+                self.use_framing(server_message[FRAMING_KEY])
+            else:
+                await self.execute_method_call(server_message)
         self.writer.close()
         return self.did_win
 
-    async def read_method_calls(self) -> str:  # or return list if loads
+    async def read_method_call(self) -> Any:
         """
-        Waits until a nonempty result is returned from Reader.read().
+        Waits until a whole message is read from the server.
         This method allows us to use wait for on a method that will timeout.
-        Returns the non-empty results of Reader.read()
+        Method calls that arrive together (e.g. "["win", [True]] ["end", [True]]") or that are split
+        across several reads are separated by self.message_reader.
+        A persistent ServerProxy that is not in a game waits for the next tournament without a deadline.
+            Returns: The pythonic json of the message
         """
+        timeout: Optional[float] = self.TIMEOUT
+        if self.persistent and not self.in_tournament:
+            timeout = None
         try:
-            method_call_message_data = await asyncio.wait_for(self.reader.read(MAX_MESSAGE_SIZE), self.TIMEOUT)
-
+            return await asyncio.wait_for(self.message_reader.read_message(), timeout)
         except asyncio.TimeoutError:
             raise GamePlayException("Timeout reading from server")
-        method_call_json = method_call_message_data.decode()
-        if method_call_json == "":
+        except MessageStreamClosed:
             raise GamePlayException("server has closed our writer.")
-        return method_call_json
+        except MessageTooLarge as error:
+            raise GamePlayException(f"server sent a message that is too large: {error}")
 
-    def process_method_calls_from_server(self, server_data: str) -> list:
+    def use_framing(self, framing: str) -> None:
         """
-            Split one json string into a list of pythonic jsons using raw_decode.
-
-            When Reading from server, its possible to get two method calls at once:
-            For Example: "["win", [True]] ["end", [True]]"
-                can be read at once. This method will split this string into two method calls
+        Switches to the framing the server answered our sign up with for the rest of the connection.
+            Parameters:
+                framing (str): The framing chosen by the server
         """
-        method_call_decoder = JSONDecoder()
-        data_length = len(server_data)
-
-        server_method_calls = []
-
-        current_index = 0
-        while current_index != data_length:
-            method_call, ending_ind = method_call_decoder.raw_decode(server_data[current_index:])
-            server_method_calls.append(method_call)
-            current_index += ending_ind
-        
-        return server_method_calls
+        self.framing = framing
+        self.message_reader.set_framing(framing)
 
     async def execute_method_call(self, method_call_json: list) -> None:
         """
@@ -159,37 +225,74 @@ class ServerProxy:
             Calls the method call with the given name and arguments and writes the output to server
 
             SIDE EFFECTS:
-                self.game_active is set to False when win(False) or end(True|False) is called
+                self.game_active is set to False when win(False) or end(True|False) is called, unless
+                this ServerProxy is persistent
 
             Example: ["play", [PlayerGameState]] -> self.writer.write(self.player.play(PlayerGameState))
         """
         method_call_name = method_call_json[METHOD_CALL_NAME_INDEX]
-        if not validate_server_message(method_call_json):
-            raise GamePlayException("Client received an invalid JSON.")
-        output = self.call_player_method_from_json(method_call_json)
+        if self.is_play_with_state_delta(method_call_json):
+            output = await self.call_player_play_with_state_delta(method_call_json[METHOD_CALL_ARGS_INDEX][0][DELTA_KEY])
+        else:
+            if not validate_server_message(method_call_json):
+                raise GamePlayException("Client received an invalid JSON.")
+            output = await self.call_player_method_from_json(method_call_json)
 
         if output is not None:
             if method_call_name == 'pick': # Destination_Plus is not a data object with .get_as_json()
                 output_pythonic_json = [destination.get_as_json() for destination in output]
             else:
                 output_pythonic_json = output.get_as_json()
-            output_json = json.dumps(output_pythonic_json)
-            self.writer.write(output_json.encode())
+            self.writer.write(encode_message(output_pythonic_json, self.framing))
             await self.writer.drain()
 
+        if method_call_name == "start":
+            self.in_tournament = True
+
         if method_call_name == "end":
             result_index = 0
             result = method_call_json[METHOD_CALL_ARGS_INDEX][result_index]
-            self.game_active = False
+            self.game_active = self.persistent
             self.did_win = result
+            self.in_tournament = False
+            self.tournament_results.append(result)
 
         if method_call_name == "win":
             result_index = 0
             result = method_call_json[METHOD_CALL_ARGS_INDEX][result_index]
             if not result:
-                self.game_active, self.did_win = False, False
+                self.game_active, self.did_win = self.persistent, False
+                self.in_tournament = False
+                self.tournament_results.append(False)
+
+    def is_play_with_state_delta(self, method_call_json: list) -> bool:
+        """
+        Determines if a method call is a play call whose argument is a PlayerStateDelta.
+        """
+        return self.state_updates == DELTA_STATE_UPDATES and isinstance(method_call_json, list) \
+            and len(method_call_json) == 2 and method_call_json[METHOD_CALL_NAME_INDEX] == "play" \
+            and isinstance(method_call_json[METHOD_CALL_ARGS_INDEX], list) \
+            and len(method_call_json[METHOD_CALL_ARGS_INDEX]) == 1 \
+            and is_state_delta(method_call_json[METHOD_CALL_ARGS_INDEX][0])
+
+    async def call_player_play_with_state_delta(self, delta_json: dict) -> Any:
+        """
+        Rebuilds the player's game state from the last one received and a PlayerStateDelta, and calls
+        the player's play method with it.
+            Parameters:
+                delta_json (dict): The PlayerStateDelta received from the server
+            Returns:
+                The player's move
+        """
+        if self.player_game_state is None:
+            raise GamePlayException("Client received a state delta before a full state.")
+        try:
+            self.player_game_state = apply_player_game_state_delta(self.player_game_state, delta_json)
+        except (KeyError, TypeError, ValueError, IndexError, AttributeError):
+            raise GamePlayException("Client received an invalid JSON.")
+        return await self.call_player_method("play", self.player_game_state)
 
-    def call_player_method_from_json(self, player_method_json: list) -> Any:
+    async def call_player_method_from_json(self, player_method_json: list) -> Any:
         """
         Given a json with information about which player method to call and what arguments
         (see ProxyServer docstring for more information), call the proper player method with
@@ -202,8 +305,22 @@ class ServerProxy:
         method_name = player_method_json[METHOD_CALL_NAME_INDEX]
         method_args_json = player_method_json[METHOD_CALL_ARGS_INDEX]
         method_args = self.convert_method_args_to_objects(method_name, method_args_json)
-        player_api_method = getattr(self.player, method_name)
-        return player_api_method(*method_args)
+        return await self.call_player_method(method_name, *method_args)
+
+    async def call_player_method(self, method_name: str, *args) -> Any:
+        """
+        Calls a method of the player, in this ServerProxy's executor if it has one and the method is
+        offloaded (see OFFLOADED_PLAYER_METHODS).
+            Parameters:
+                method_name (str): Name of the player method
+                *args: The arguments for the method
+            Returns:
+                The result of the method
+        """
+        if self.executor is not None and method_name in OFFLOADED_PLAYER_METHODS:
+            event_loop = asyncio.get_running_loop()
+            return await event_loop.run_in_executor(self.executor, call_player_method, self.player, method_name, *args)
+        return call_player_method(self.player, method_name, *args)
 
     def convert_method_args_to_objects(self, method_name: str, method_args_json: list) -> list:
         """
@@ -242,6 +359,8 @@ class ServerProxy:
             game_state_index = 0
             game_state_json = method_args_json[game_state_index]
             game_state = convert_from_json_to_player_game_state(game_state_json)
+            if method_name == "play":
+                self.player_game_state = game_state
             args = [game_state]
         elif method_name == "more":
             card_plus_index = 0
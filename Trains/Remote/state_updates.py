@@ -0,0 +1,168 @@
+import sys
+from typing import Any, Optional, Set
+
+sys.path.append('../../')
+from Trains.Common.cards import Hand
+from Trains.Common.map import Connection
+from Trains.Common.player_game_state import PlayerGameState
+from Trains.Other.Util.json_utils import COLORS, convert_from_json_to_connection
+
+# How a RemotePlayerProxy sends the PlayerGameState argument of play.
+#   full: every play call carries the whole PlayerState (the original protocol).
+#   delta: the first play call of each game carries the whole PlayerState, and every later one only
+#          carries what changed since the previous play call (a PlayerStateDelta, see below).
+# A client asks for delta updates by including {"state_updates": "delta"} in its sign up message.
+# Servers that do not support delta updates ignore the request and keep sending full states.
+STATE_UPDATES_KEY = "state_updates"
+FULL_STATE_UPDATES = "full"
+DELTA_STATE_UPDATES = "delta"
+
+# A play call carrying a delta is ["play", [{"delta": PlayerStateDelta}]] where PlayerStateDelta is
+#   {"this": {"cards": Card*, "rails": Natural, "acquired": SetDelta},
+#    "game_info": {"cards_in_deck": Natural, "last_turn": Boolean, "unacquired_connections": SetDelta},
+#    "opponent_info": [{"number_of_cards": Natural, "connections": SetDelta}, ...]}
+# and SetDelta is {"added": [Connection, ...], "removed": [Connection, ...]}.
+DELTA_KEY = "delta"
+ADDED_KEY = "added"
+REMOVED_KEY = "removed"
+
+
+def requests_delta_state_updates(sign_up_message: list) -> bool:
+    """
+    Determines if a client's sign up message asks for delta state updates.
+        Parameters:
+            sign_up_message (list): The sign up message, [name, option, ...]
+        Returns:
+            True if any option is {"state_updates": "delta"}, else False
+    """
+    return any(isinstance(option, dict) and option.get(STATE_UPDATES_KEY) == DELTA_STATE_UPDATES
+               for option in sign_up_message[1:])
+
+
+def is_state_delta(play_argument: Any) -> bool:
+    """
+    Determines if the argument of a play call is a PlayerStateDelta rather than a PlayerState.
+        Parameters:
+            play_argument (Any): Pythonic JSON of the argument
+        Returns:
+            True if the argument is {"delta": PlayerStateDelta}, else False
+    """
+    return isinstance(play_argument, dict) and DELTA_KEY in play_argument
+
+
+def snapshot_player_game_state(game_state: PlayerGameState) -> PlayerGameState:
+    """
+    Copies the parts of a PlayerGameState that a delta is computed from. The referee keeps changing
+    the sets in the states it hands out, so the state sent to a player must be copied to be compared
+    with the next one.
+        Parameters:
+            game_state (PlayerGameState): The state sent to a player
+        Returns:
+            (PlayerGameState) A copy of the state that shares no mutable sets or dictionaries with it
+    """
+    game_info = dict(game_state.game_info)
+    game_info["unacquired_connections"] = frozenset(game_state.game_info["unacquired_connections"])
+    opponent_info = [{"number_of_cards": entry["number_of_cards"], "connections": frozenset(entry["connections"])}
+                     for entry in game_state.opponent_info]
+    return PlayerGameState(set(game_state.connections), game_state.colored_cards.copy(), game_state.rails,
+                           set(game_state.destinations), game_info, opponent_info)
+
+
+def get_set_delta_as_json(previous: Set[Connection], current: Set[Connection]) -> dict:
+    """
+    Returns the SetDelta that turns one set of connections into another.
+        Parameters:
+            previous (set(Connection)): The connections before
+            current (set(Connection)): The connections after
+        Returns:
+            (dict) The SetDelta of the added and removed connections
+    """
+    return {
+        ADDED_KEY: [connection.get_as_json() for connection in current - previous],
+        REMOVED_KEY: [connection.get_as_json() for connection in previous - current]
+    }
+
+
+def get_player_game_state_delta_as_json(previous: PlayerGameState, current: PlayerGameState) -> Optional[dict]:
+    """
+    Returns the PlayerStateDelta that turns the previous state sent to a player into the current one.
+    Only connections that changed hands are serialized.
+        Parameters:
+            previous (PlayerGameState): The last state sent to the player (see snapshot_player_game_state)
+            current (PlayerGameState): The state to send to the player
+        Returns:
+            (dict) The PlayerStateDelta, or None if the change cannot be sent as a delta (the player's
+            destinations or the number of opponents changed) and the full state must be sent
+    """
+    if previous.destinations != current.destinations or len(previous.opponent_info) != len(current.opponent_info):
+        return None
+    this_player = {
+        "cards": current.colored_cards.get_as_json(),
+        "rails": current.rails,
+        "acquired": get_set_delta_as_json(previous.connections, current.connections)
+    }
+    game_info = {
+        "cards_in_deck": current.game_info["cards_in_deck"],
+        "last_turn": current.game_info["last_turn"],
+        "unacquired_connections": get_set_delta_as_json(previous.game_info["unacquired_connections"],
+                                                        current.game_info["unacquired_connections"])
+    }
+    opponent_info = []
+    for previous_entry, current_entry in zip(previous.opponent_info, current.opponent_info):
+        opponent_info.append({
+            "number_of_cards": current_entry["number_of_cards"],
+            "connections": get_set_delta_as_json(previous_entry["connections"], current_entry["connections"])
+        })
+    return {"this": this_player, "game_info": game_info, "opponent_info": opponent_info}
+
+
+def apply_set_delta(connections: Set[Connection], set_delta_json: dict) -> Set[Connection]:
+    """
+    Applies a SetDelta to a set of connections.
+        Parameters:
+            connections (set(Connection)): The connections before
+            set_delta_json (dict): The SetDelta to apply
+        Returns:
+            (set(Connection)) A new set of the connections after
+    """
+    removed = {convert_from_json_to_connection(connection) for connection in set_delta_json[REMOVED_KEY]}
+    added = {convert_from_json_to_connection(connection) for connection in set_delta_json[ADDED_KEY]}
+    return (set(connections) - removed) | added
+
+
+def apply_player_game_state_delta(game_state: PlayerGameState, delta_json: dict) -> PlayerGameState:
+    """
+    Reconstructs the state a RemotePlayerProxy sent as a PlayerStateDelta.
+        Parameters:
+            game_state (PlayerGameState): The previous state received
+            delta_json (dict): The PlayerStateDelta received
+        Returns:
+            (PlayerGameState) The new state
+        Throws:
+            KeyError, TypeError, ValueError or IndexError if the delta is malformed
+    """
+    this_player = delta_json["this"]
+    colored_cards = Hand({COLORS[color]: count for color, count in this_player["cards"].items()})
+    connections = apply_set_delta(game_state.connections, this_player["acquired"])
+
+    game_info_delta = delta_json["game_info"]
+    # A list, like the unacquired connections of a PlayerState converted from JSON.
+    game_info = {
+        "unacquired_connections": list(apply_set_delta(game_state.game_info["unacquired_connections"],
+                                                       game_info_delta["unacquired_connections"])),
+        "cards_in_deck": game_info_delta["cards_in_deck"],
+        "last_turn": game_info_delta["last_turn"]
+    }
+
+    opponent_deltas = delta_json["opponent_info"]
+    if len(opponent_deltas) != len(game_state.opponent_info):
+        raise ValueError("PlayerStateDelta has the wrong number of opponents")
+    opponent_info = []
+    for entry, entry_delta in zip(game_state.opponent_info, opponent_deltas):
+        opponent_info.append({
+            "number_of_cards": entry_delta["number_of_cards"],
+            "connections": apply_set_delta(entry["connections"], entry_delta["connections"])
+        })
+
+    return PlayerGameState(connections, colored_cards, this_player["rails"], set(game_state.destinations),
+                           game_info, opponent_info)